@@ -1,5 +1,5 @@
-from collections.abc import Generator
 import uuid
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 import jwt
@@ -8,10 +8,12 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, engine
+from app.core.metrics import DB_SESSION_DURATION
 from app.models import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -20,11 +22,18 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    with DB_SESSION_DURATION.labels("api").time(), Session(engine) as session:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    with DB_SESSION_DURATION.labels("api_async").time():
+        async with AsyncSession(async_engine) as session:
+            yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
@@ -1,26 +1,110 @@
+import math
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import select, func
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import col, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncSessionDep, CurrentUser, SessionDep
+from app.models.market import DevigMethod, MatchEdge, SlateEdges
 from app.models.tennis import Match
-from app.worker import run_tennis_simulation
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+
+def _simulated(x: float) -> float | None:
+    """NaN (not simulated yet) -> None"""
+    return None if math.isnan(x) else x
+
+
 @router.get("/", response_model=list[Match])
-def read_matches(
-    session: SessionDep,
+async def read_matches(
+    session: AsyncSessionDep,
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """
     Retrieve matches.
     """
-    statement = select(Match).offset(skip).limit(limit).order_by(Match.start_time)
-    return session.exec(statement).all()
+    statement = select(Match).offset(skip).limit(limit).order_by(col(Match.start_time))
+    return (await session.exec(statement)).all()
+
+
+@router.get("/edges", response_model=SlateEdges)
+async def read_slate_edges(
+    session: AsyncSessionDep,
+    method: DevigMethod = "multiplicative",
+    kelly_multiplier: float = Query(0.25, gt=0, le=1),
+) -> Any:
+    """
+    Price the active slate in one pass: vig-free probabilities, edge and EV
+    of the simulated win probability against the market, and Kelly stakes.
+    """
+    # NumPy and the pricing code load on the first request, not at API startup
+    import numpy as np
+
+    from app.services.odds_api import active_window
+    from app.services.pricing import slate_edges
+
+    start, end = active_window(datetime.now())
+    statement = (
+        select(Match)
+        .where(Match.start_time >= start, Match.start_time <= end)
+        .order_by(col(Match.start_time))
+    )
+    matches = (await session.exec(statement)).all()
+
+    edges = slate_edges(
+        np.array([m.p1_odds for m in matches], dtype=np.float64),
+        np.array([m.p2_odds for m in matches], dtype=np.float64),
+        np.array(
+            [
+                m.sim_win_prob_p1 if m.sim_win_prob_p1 is not None else np.nan
+                for m in matches
+            ]
+        ),
+        method=method,
+        kelly_multiplier=kelly_multiplier,
+    )
+    columns = {k: v.tolist() for k, v in edges.items()}
+
+    data = [
+        MatchEdge(
+            match_id=m.id,
+            player1_name=m.player1_name,
+            player2_name=m.player2_name,
+            start_time=m.start_time,
+            p1_odds=m.p1_odds,
+            p2_odds=m.p2_odds,
+            sim_win_prob_p1=m.sim_win_prob_p1,
+            vig=columns["vig"][i],
+            p1_fair_prob=columns["p1_fair_prob"][i],
+            p2_fair_prob=columns["p2_fair_prob"][i],
+            p1_edge=_simulated(columns["p1_edge"][i]),
+            p2_edge=_simulated(columns["p2_edge"][i]),
+            p1_ev=_simulated(columns["p1_ev"][i]),
+            p2_ev=_simulated(columns["p2_ev"][i]),
+            p1_kelly=_simulated(columns["p1_kelly"][i]),
+            p2_kelly=_simulated(columns["p2_kelly"][i]),
+        )
+        for i, m in enumerate(matches)
+    ]
+    return SlateEdges(
+        method=method, kelly_multiplier=kelly_multiplier, data=data, count=len(data)
+    )
+
+
+@router.get("/{match_id}", response_model=Match)
+async def read_match(session: AsyncSessionDep, match_id: UUID) -> Any:
+    """
+    Get a match and its latest simulation results (what clients poll after a trigger).
+    """
+    match = await session.get(Match, match_id)
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return match
+
 
 @router.post("/{match_id}/simulate", response_model=Any)
 def trigger_simulation(
@@ -35,8 +119,11 @@ def trigger_simulation(
     match = session.get(Match, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
-    
+
     # Trigger Celery Task
+    # The Celery app is configured on the first trigger, not at API startup
+    from app.worker import run_tennis_simulation
+
     task = run_tennis_simulation.delay(str(match_id))
-    
+
     return {"message": "Simulation triggered", "task_id": str(task.id)}
@@ -1,88 +1,449 @@
-from fastapi import APIRouter, HTTPException
-from app.models.simulation import SimulationRequest, SimulationResponse
-from app.services.data import PLAYERS_DB
-from app.services.sim_engine import TennisMatchSimulator, PlayerProfile
-from app.services.fantasy_scoring import calculate_fantasy_points
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.deps import SessionDep
+from app.core.metrics import AD_HOC_DURATION, SIMULATED_MATCHES, n_sims_bucket
+from app.models.simulation import (
+    ContestLineupOut,
+    ContestRequest,
+    ContestResponse,
+    LineupOut,
+    LineupRequest,
+    LineupResponse,
+    LiveWinProbResponse,
+    SimulationRequest,
+    SimulationResponse,
+    SlateMatch,
+    TournamentPlayerOdds,
+    TournamentRequest,
+    TournamentResponse,
+)
+from app.services.sim_types import ScoreState
+
+# The simulation services (and NumPy) load on the first request that needs
+# them, not at API startup
+if TYPE_CHECKING:
+    import numpy as np
 
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
+
 @router.post("/ad-hoc", response_model=SimulationResponse)
-def run_ad_hoc_simulation(request: SimulationRequest):
+def run_ad_hoc_simulation(request: SimulationRequest) -> SimulationResponse:
     """
     Run an ad-hoc simulation between two players without saving to DB.
     """
-    # 1. Fetch Request Data
-    p1_profile = PLAYERS_DB.get(request.player1_name)
-    p2_profile = PLAYERS_DB.get(request.player2_name)
-    
-    if not p1_profile:
-        raise HTTPException(status_code=404, detail=f"Player {request.player1_name} not found in DB")
-    if not p2_profile:
-        raise HTTPException(status_code=404, detail=f"Player {request.player2_name} not found in DB")
-        
-    # 2. Setup Profiles
-    p1_stats = p1_profile["stats"].get(request.surface, p1_profile["stats"]["hard"])
-    p2_stats = p2_profile["stats"].get(request.surface, p2_profile["stats"]["hard"])
-    
-    p1_obj = PlayerProfile(
-        name=p1_profile["name"],
-        serve_1_in_pct=p1_stats["serve_1_in"],
-        serve_1_won_pct=p1_stats["serve_1_won"],
-        serve_2_won_pct=p1_stats["serve_2_won"],
-        ace_pct=p1_stats["ace_rate"],
-        df_pct=p1_stats["df_rate"],
-        return_won_pct=p1_stats["return_won"]
-    )
-    
-    p2_obj = PlayerProfile(
-        name=p2_profile["name"],
-        serve_1_in_pct=p2_stats["serve_1_in"],
-        serve_1_won_pct=p2_stats["serve_1_won"],
-        serve_2_won_pct=p2_stats["serve_2_won"],
-        ace_pct=p2_stats["ace_rate"],
-        df_pct=p2_stats["df_rate"],
-        return_won_pct=p2_stats["return_won"]
+    with AD_HOC_DURATION.labels(n_sims_bucket(request.n_sims)).time():
+        return _run_ad_hoc_simulation(request)
+
+
+def _run_ad_hoc_simulation(request: SimulationRequest) -> SimulationResponse:
+    import numpy as np
+
+    from app.services.fantasy_scoring import calculate_fantasy_points
+    from app.services.outcomes import (
+        get_outcome_store,
+        matchup_key,
+        outcome_matrix,
+        points_correlation,
     )
-    
-    # 3. Run Simulation
+    from app.services.profiles import load_player_profile
+    from app.services.sim_engine import TennisMatchSimulator
+
+    # 1. Load Player Profiles
+    p1_obj = load_player_profile(request.player1_name, request.surface)
+    p2_obj = load_player_profile(request.player2_name, request.surface)
+
+    if not p1_obj:
+        raise HTTPException(
+            status_code=404, detail=f"Player {request.player1_name} not found in DB"
+        )
+    if not p2_obj:
+        raise HTTPException(
+            status_code=404, detail=f"Player {request.player2_name} not found in DB"
+        )
+
+    # 2. Run Simulation, resuming a match in progress from start_state
+    # (an invalid score is a ValueError)
     sim = TennisMatchSimulator(p1_obj, p2_obj, sets_to_win=request.sets_to_win)
-    results = sim.run(n_sims=request.n_sims)
-    
-    # 4. Aggregation & Scoring
-    p1_wins = 0
-    p1_fp_list = []
-    p2_fp_list = []
-    p1_aces = 0
-    p1_dfs = 0
-    p2_aces = 0
-    p2_dfs = 0
-    
-    for res in results:
-        if res.winner == p1_obj.name:
-            p1_wins += 1
-            
-        fp1 = calculate_fantasy_points(res.p1_stats, request.ruleset)
-        fp2 = calculate_fantasy_points(res.p2_stats, request.ruleset)
-        
-        p1_fp_list.append(fp1)
-        p2_fp_list.append(fp2)
-        
-        p1_aces += res.p1_stats["aces"]
-        p1_dfs += res.p1_stats["dfs"]
-        p2_aces += res.p2_stats["aces"]
-        p2_dfs += res.p2_stats["dfs"]
-        
-    n = request.n_sims
+    try:
+        tally = sim.run_batch(n_sims=request.n_sims, start_state=request.start_state)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    SIMULATED_MATCHES.labels("ad_hoc").inc(request.n_sims)
+
+    # 3. Aggregation & Scoring, one array per player over all sims
+    p1_stats = sim.fantasy_stats(tally, 0)
+    p2_stats = sim.fantasy_stats(tally, 1)
+    p1_fp = calculate_fantasy_points(p1_stats, request.ruleset)
+    p2_fp = calculate_fantasy_points(p2_stats, request.ruleset)
+    matrix = outcome_matrix(tally, (p1_fp, p2_fp))
+
+    # 4. Optionally keep the joint outcomes for lineups, contests and reports
+    outcomes_key = None
+    if request.persist_outcomes:
+        store = get_outcome_store()
+        if store is None:
+            raise HTTPException(
+                status_code=400, detail="Outcome persistence is not configured"
+            )
+        variant = repr(request.start_state) if request.start_state else ""
+        outcomes_key = matchup_key(
+            p1_obj.name, p2_obj.name, request.surface, request.sets_to_win, variant
+        )
+        store.save(outcomes_key, matrix)
+
     return SimulationResponse(
         p1_name=p1_obj.name,
         p2_name=p2_obj.name,
         surface=request.surface,
-        simulations=n,
-        p1_win_pct=p1_wins / n,
-        p1_avg_fantasy_points=sum(p1_fp_list) / n,
-        p1_avg_aces=p1_aces / n,
-        p1_avg_dfs=p1_dfs / n,
-        p2_avg_fantasy_points=sum(p2_fp_list) / n,
-        p2_avg_aces=p2_aces / n,
-        p2_avg_dfs=p2_dfs / n
+        simulations=request.n_sims,
+        p1_win_pct=float(np.mean(p1_stats["match_win"])),
+        p1_avg_fantasy_points=float(p1_fp.mean()),
+        p1_avg_aces=float(p1_stats["aces"].mean()),
+        p1_avg_dfs=float(p1_stats["dfs"].mean()),
+        p2_avg_fantasy_points=float(p2_fp.mean()),
+        p2_avg_aces=float(p2_stats["aces"].mean()),
+        p2_avg_dfs=float(p2_stats["dfs"].mean()),
+        fantasy_points_correlation=points_correlation(matrix),
+        outcomes_key=outcomes_key,
+    )
+
+
+@router.get("/live-win-prob", response_model=LiveWinProbResponse)
+def read_live_win_prob(
+    player1_name: str,
+    player2_name: str,
+    surface: str = "hard",
+    sets_to_win: int = Query(2, ge=2, le=3),
+    p1_sets: int = 0,
+    p2_sets: int = 0,
+    p1_games: int = 0,
+    p2_games: int = 0,
+    p1_points: int = 0,
+    p2_points: int = 0,
+    server: int = Query(
+        0, ge=0, le=1, description="0 if player 1 is serving, 1 if player 2"
+    ),
+) -> LiveWinProbResponse:
+    """
+    P(win | score) from the precomputed state table for this matchup.
+    Points are raw counts (0-3, tiebreak points inside a 6-6 tiebreak).
+    """
+    from app.services.profiles import load_player_profile
+    from app.services.win_prob import live_table_for
+
+    p1_obj = load_player_profile(player1_name, surface)
+    p2_obj = load_player_profile(player2_name, surface)
+    if not p1_obj:
+        raise HTTPException(
+            status_code=404, detail=f"Player {player1_name} not found in DB"
+        )
+    if not p2_obj:
+        raise HTTPException(
+            status_code=404, detail=f"Player {player2_name} not found in DB"
+        )
+
+    table = live_table_for(p1_obj, p2_obj, sets_to_win)
+    state = ScoreState(
+        p1_sets, p2_sets, p1_games, p2_games, p1_points, p2_points, server
+    )
+    try:
+        p1_win_prob = table.win_prob(state)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return LiveWinProbResponse(
+        p1_name=p1_obj.name,
+        p2_name=p2_obj.name,
+        surface=surface,
+        sets_to_win=sets_to_win,
+        p1_serve_point_prob=table.p1_serve,
+        p2_serve_point_prob=table.p2_serve,
+        p1_win_prob=p1_win_prob,
+        p2_win_prob=1.0 - p1_win_prob,
+    )
+
+
+TOURNAMENT_DRAW_SIZES = (32, 64, 128)
+
+
+@router.post("/tournament", response_model=TournamentResponse)
+def run_tournament_simulation(
+    session: SessionDep, request: TournamentRequest
+) -> TournamentResponse:
+    """
+    Monte Carlo a single-elimination draw: per player, P(reaching each round)
+    and expected DK points over the tournament.
+    """
+    from app.services.elo import EloBlend
+    from app.services.profiles import load_player_profiles
+    from app.services.sim_core import PointModel, adjusted_rally
+    from app.services.tournament import simulate_tournament
+
+    draw_size = len(request.player_ids)
+    if draw_size not in TOURNAMENT_DRAW_SIZES:
+        raise HTTPException(
+            status_code=400, detail=f"Draw size must be one of {TOURNAMENT_DRAW_SIZES}"
+        )
+
+    # 1. Load Player Profiles
+    ids = [pid for pid in request.player_ids if pid is not None]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=400, detail="A player appears twice in the draw"
+        )
+    profiles = load_player_profiles(session, ids, request.surface)
+    missing = [str(pid) for pid in ids if pid not in profiles]
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"No stats for players: {', '.join(missing)}"
+        )
+
+    # 2. Run Simulation
+    point_model: PointModel = adjusted_rally
+    if request.elo_weight > 0:
+        point_model = EloBlend(request.elo_weight)
+    result = simulate_tournament(
+        [profiles[pid] if pid is not None else None for pid in request.player_ids],
+        n_sims=request.n_sims,
+        sets_to_win=request.sets_to_win,
+        point_model=point_model,
+    )
+
+    # 3. Aggregation
+    players = [
+        TournamentPlayerOdds(
+            player_id=pid,
+            name=profiles[pid].name,
+            reach=dict(
+                zip(result.rounds, map(float, result.reach[slot]), strict=False)
+            ),
+            expected_fantasy_points=float(result.expected_points[slot]),
+        )
+        for slot, pid in enumerate(request.player_ids)
+        if pid is not None
+    ]
+    return TournamentResponse(
+        surface=request.surface,
+        draw_size=draw_size,
+        simulations=result.n_sims,
+        rounds=result.rounds,
+        players=players,
+    )
+
+
+def _slate_points(
+    matches: list[SlateMatch], n_sims: int, sets_to_win: int
+) -> "np.ndarray":
+    """
+    DK points per sim for every player of a slate, one column per player in
+    request order. Stored joint outcomes are reused; the rest are simulated
+    (and stored when an outcome store is configured).
+    """
+    from app.services.fantasy_scoring import calculate_fantasy_points
+    from app.services.lineups import slate_points
+    from app.services.outcomes import (
+        get_outcome_store,
+        matchup_key,
+        outcome_matrix,
+        tally_from_outcomes,
+    )
+    from app.services.profiles import load_player_profile
+    from app.services.sim_engine import TennisMatchSimulator
+
+    # 1. Load Player Profiles
+    profiles = []
+    for match in matches:
+        pair = []
+        for player in (match.player1, match.player2):
+            profile = load_player_profile(player.name, match.surface)
+            if not profile:
+                raise HTTPException(
+                    status_code=404, detail=f"Player {player.name} not found in DB"
+                )
+            pair.append(profile)
+        profiles.append(pair)
+
+    # 2. Joint outcomes per match: reuse stored ones, simulate (and store) the rest
+    store = get_outcome_store()
+    tallies = []
+    for (p1_obj, p2_obj), match in zip(profiles, matches, strict=False):
+        key = matchup_key(p1_obj.name, p2_obj.name, match.surface, sets_to_win)
+        stored = store.load_sims(key, n_sims) if store else None
+        if stored is not None:
+            tallies.append(tally_from_outcomes(stored))
+            continue
+        sim = TennisMatchSimulator(p1_obj, p2_obj, sets_to_win=sets_to_win)
+        tally = sim.run_batch(n_sims=n_sims)
+        SIMULATED_MATCHES.labels("slate").inc(n_sims)
+        if store:
+            points = [
+                calculate_fantasy_points(sim.fantasy_stats(tally, i)) for i in (0, 1)
+            ]
+            store.save(key, outcome_matrix(tally, points))
+        tallies.append(tally)
+
+    # One DK points column per player, opponents from the same matches
+    return slate_points(tallies, sets_to_win=sets_to_win)
+
+
+@router.post("/lineups", response_model=LineupResponse)
+def optimize_dk_lineups(request: LineupRequest) -> LineupResponse:
+    """
+    Simulate a DK slate and return the top lineups under the salary cap,
+    by mean, ceiling or win probability against a random field.
+    """
+    from app.services.lineups import optimize_lineups
+
+    # 1. Simulate the slate
+    points = _slate_points(request.matches, request.n_sims, request.sets_to_win)
+    names = [p.name for m in request.matches for p in (m.player1, m.player2)]
+    salaries = [p.salary for m in request.matches for p in (m.player1, m.player2)]
+
+    # 2. Optimize
+    try:
+        lineups = optimize_lineups(
+            points,
+            salaries,
+            objective=request.objective,
+            top_k=request.top_k,
+            salary_cap=request.salary_cap,
+            lineup_size=request.lineup_size,
+            field_size=request.field_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    data = [
+        LineupOut(
+            players=[names[i] for i in lineup.players],
+            salary=lineup.salary,
+            score=lineup.score,
+            mean=lineup.mean,
+            ceiling=lineup.ceiling,
+            win_prob=lineup.win_prob,
+        )
+        for lineup in lineups
+    ]
+    return LineupResponse(
+        objective=request.objective,
+        simulations=request.n_sims,
+        data=data,
+        count=len(data),
+    )
+
+
+CONTEST_FINISH_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+@router.post("/contest", response_model=ContestResponse)
+def simulate_dk_contest(request: ContestRequest) -> ContestResponse:
+    """
+    Enter our lineups into a simulated GPP against an ownership-weighted
+    random field: per lineup, finishing place distribution, cash rate and
+    expected ROI over every simulated world.
+    """
+    import numpy as np
+
+    from app.services.contest import payout_table, simulate_contest
+    from app.services.lineups import random_field
+
+    players = [p for m in request.matches for p in (m.player1, m.player2)]
+    column = {p.name: i for i, p in enumerate(players)}
+    if len(column) != len(players):
+        raise HTTPException(
+            status_code=400, detail="A player appears in more than one slate match"
+        )
+    salaries = np.array([p.salary for p in players])
+
+    # 1. Our entries as column indices
+    sizes = {len(lineup) for lineup in request.lineups}
+    if len(sizes) != 1:
+        raise HTTPException(
+            status_code=400, detail="All lineups must have the same number of players"
+        )
+    for lineup in request.lineups:
+        unknown = [name for name in lineup if name not in column]
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Not on the slate: {', '.join(unknown)}"
+            )
+        if len(set(lineup)) != len(lineup):
+            raise HTTPException(
+                status_code=400, detail="A player appears twice in a lineup"
+            )
+    lineups = np.array(
+        [[column[name] for name in lineup] for lineup in request.lineups]
+    )
+    # Held to the same cap as the field they are ranked against
+    over_cap = [
+        i
+        for i, total in enumerate(salaries[lineups].sum(axis=1))
+        if total > request.salary_cap
+    ]
+    if over_cap:
+        raise HTTPException(
+            status_code=400, detail=f"Lineups over the salary cap: {over_cap}"
+        )
+
+    shares = [p.ownership for p in players]
+    ownership: np.ndarray | None = None
+    if any(share is not None for share in shares):
+        if any(share is None for share in shares):
+            raise HTTPException(
+                status_code=400, detail="Give ownership for every player or for none"
+            )
+        ownership = np.array(shares, dtype=np.float64)
+
+    # 2. Simulate the slate
+    points = _slate_points(request.matches, request.n_sims, request.sets_to_win)
+
+    # 3. Field and contest
+    try:
+        field = random_field(
+            points,
+            salaries,
+            request.field_size,
+            request.salary_cap,
+            sizes.pop(),
+            ownership=ownership,
+        )
+        prizes = payout_table(
+            [
+                (tier.first_place, tier.last_place, tier.prize)
+                for tier in request.payouts
+            ],
+            len(lineups) + request.field_size,
+        )
+        result = simulate_contest(points, lineups, field, prizes, request.entry_fee)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 4. Aggregation
+    finish = result.finish_quantiles([q / 100 for q in CONTEST_FINISH_PERCENTILES])
+    means = points.mean(axis=0)
+    data = [
+        ContestLineupOut(
+            players=names,
+            salary=int(salaries[lineups[i]].sum()),
+            mean=float(means[lineups[i]].sum()),
+            expected_payout=float(result.expected_payout[i]),
+            roi=float(result.roi[i]) if request.entry_fee > 0 else None,
+            cash_rate=float(result.cash_rate[i]),
+            win_rate=float(result.win_rate[i]),
+            finish={
+                f"p{q}": float(finish[j, i])
+                for j, q in enumerate(CONTEST_FINISH_PERCENTILES)
+            },
+        )
+        for i, names in enumerate(request.lineups)
+    ]
+    return ContestResponse(
+        simulations=request.n_sims,
+        entries=result.n_entries,
+        entry_fee=request.entry_fee,
+        data=data,
+        count=len(data),
     )
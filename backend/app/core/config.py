@@ -36,10 +36,32 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
-    
+
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://redis:6379/0"
 
+    # Joint per-sim match outcomes kept for reuse (lineups, contests, reports)
+    OUTCOME_STORE: Literal["none", "file", "redis"] = "none"
+    OUTCOME_DIR: str = "./sim_outcomes"
+    OUTCOME_REDIS_URL: str = "redis://redis:6379/1"
+    OUTCOME_TTL_SECONDS: int = 60 * 60 * 24
+
+    # Pub/sub for the "stats version" that invalidates the workers' warm caches
+    STATS_VERSION_REDIS_URL: str = "redis://redis:6379/0"
+
+    # Where tasks run with profile="cprofile" / "sample" write their profiles
+    PROFILE_DIR: str = "./profiles"
+
+    # Port of the Celery worker's Prometheus exposition (0 = off)
+    WORKER_METRICS_PORT: int = 9540
+
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
+    # Hot-path logging: level check before any processor, sampled events,
+    # rendering and I/O on a background thread
+    LOG_HOT_PATH: bool = False
+    # Fraction of these events kept in hot-path mode (others are all kept)
+    LOG_SAMPLE_RATES: dict[str, float] = {"Phase complete": 0.01, "Sim Complete": 0.1}
+
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
     ] = []
@@ -77,6 +99,31 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def ASYNC_SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn | str:
+        # psycopg 3 serves both engines; SQLite needs aiosqlite
+        if self.USE_SQLITE:
+            return "sqlite+aiosqlite:///./sql_app.db"
+        return self.SQLALCHEMY_DATABASE_URI
+
+    # Connection pools, per process (Postgres only). Sync engine: Celery
+    # tasks and the threadpool routes; one worker process runs one task at
+    # a time, so the defaults mostly serve the API's threadpool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Both engines: replace connections older than this (seconds, -1 = never)
+    # and test each one on checkout, so a Postgres restart costs a reconnect
+    # instead of a failed request or task
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Async engine (read routes): requests wait on a connection, not a
+    # threadpool thread, so the pool bounds concurrent queries per process
+    ASYNC_DB_POOL_SIZE: int = 20
+    ASYNC_DB_MAX_OVERFLOW: int = 10
+    ASYNC_DB_POOL_TIMEOUT: float = 10.0
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
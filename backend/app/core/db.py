@@ -1,10 +1,45 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def pool_options(size: int, overflow: int, timeout: float) -> dict[str, Any]:
+    """create_engine pool arguments; SQLite (a local file) keeps SQLAlchemy's defaults"""
+    if settings.USE_SQLITE:
+        return {}
+    return {
+        "pool_size": size,
+        "max_overflow": overflow,
+        "pool_timeout": timeout,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# Sync engine: Celery tasks, scripts and the write routes. Celery worker
+# processes dispose of the pool they inherit when forked (app.worker).
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    **pool_options(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT
+    ),
+)
+
+# Async engine: read-heavy routes (match lists, slate edges, polling), which
+# then wait on the event loop instead of holding a threadpool thread
+async_engine = create_async_engine(
+    str(settings.ASYNC_SQLALCHEMY_DATABASE_URI),
+    **pool_options(
+        settings.ASYNC_DB_POOL_SIZE,
+        settings.ASYNC_DB_MAX_OVERFLOW,
+        settings.ASYNC_DB_POOL_TIMEOUT,
+    ),
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -1,14 +1,90 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+from collections.abc import Mapping
+from typing import Any
+
 import structlog
+from structlog.typing import EventDict, Processor
+
 from app.core.config import settings
 
-def setup_logging():
+# The handler setup_logging installed on the root logger, replaced on a second call
+_handler: logging.Handler | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+class SampleEvents:
+    """
+    Processor that keeps only a fraction of the named events (others pass
+    through untouched). Kept events carry sample_rate, so counts can be scaled back.
+    """
+
+    def __init__(self, rates: Mapping[str, float], rng: random.Random | None = None):
+        self.rates = dict(rates)
+        self.random = (rng or random.Random()).random
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        rate = self.rates.get(event_dict.get("event", ""))
+        if rate is None:
+            return event_dict
+        if self.random() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener as-is: formatting happens on its thread, not the caller's"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _renderer() -> Any:
+    return (
+        structlog.dev.ConsoleRenderer()
+        if settings.ENVIRONMENT == "local"
+        else structlog.processors.JSONRenderer()
+    )
+
+
+def _start_listener(stream_handler: logging.Handler) -> logging.handlers.QueueListener:
+    global _listener
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, stream_handler)
+    _listener.start()
+    return _listener
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        # Drains the queue first
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(hot_path: bool | None = None) -> None:
     """
     Configure structlog for JSON output in production and colored console output in development.
+
+    In hot-path mode (settings.LOG_HOT_PATH), a disabled level returns before
+    any processor runs, events in settings.LOG_SAMPLE_RATES are sampled, and
+    rendering and writing happen on a background QueueListener thread, so a
+    simulation burst only pays for building the event dict and a queue put.
     """
-    
-    shared_processors = [
+    global _handler
+    hot_path = settings.LOG_HOT_PATH if hot_path is None else hot_path
+    level = logging.getLevelName(settings.LOG_LEVEL)
+
+    shared_processors: list[Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
@@ -18,7 +94,16 @@ def setup_logging():
         structlog.processors.TimeStamper(fmt="iso"),
     ]
 
-    if settings.ENVIRONMENT == "local":
+    if hot_path:
+        # Rendering moves to the formatter, on the listener thread
+        processors = (
+            [SampleEvents(settings.LOG_SAMPLE_RATES)]
+            + shared_processors
+            + [
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ]
+        )
+    elif settings.ENVIRONMENT == "local":
         # Pretty printing for local development
         processors = shared_processors + [
             structlog.dev.ConsoleRenderer(),
@@ -32,7 +117,10 @@ def setup_logging():
     structlog.configure(
         processors=processors,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # The filtering logger's disabled levels are no-ops: nothing is processed
+        wrapper_class=structlog.make_filtering_bound_logger(level)
+        if hot_path
+        else structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
 
@@ -43,18 +131,38 @@ def setup_logging():
         # These run on ALL entries
         processors=[
             structlog.stdlib.ProcessorFormatter.remove_processors_meta,
-            structlog.dev.ConsoleRenderer() if settings.ENVIRONMENT == "local" else structlog.processors.JSONRenderer(),
+            _renderer(),
         ],
     )
 
-    handler = logging.StreamHandler(sys.stdout)
+    handler: logging.Handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(formatter)
-    
+
+    # Called at import time by both main.py and worker.py: replace, don't stack
     root_logger = logging.getLogger()
+    if _handler is not None:
+        root_logger.removeHandler(_handler)
+    _stop_listener()
+
+    if hot_path:
+        listener = _start_listener(handler)
+        handler = _EnqueueHandler(listener.queue)
+    _handler = handler
     root_logger.addHandler(handler)
-    root_logger.setLevel(logging.INFO)
+    root_logger.setLevel(level)
 
     # Silence noisy libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
 
+
+def _restart_listener_in_child() -> None:
+    # The listener thread does not survive fork (Celery prefork, uvicorn
+    # workers): without a new one, the child's records would never be written
+    if _listener is not None:
+        _start_listener(_listener.handlers[0])
+        _handler.queue = _listener.queue  # type: ignore[union-attr]
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+atexit.register(_stop_listener)
@@ -0,0 +1,186 @@
+"""
+Prometheus metrics for the API and the Celery worker.
+
+Updates are per batch, never per point: a simulation run adds its whole
+n_sims to sim_matches_total once, and a request or task observes one
+latency. Everything that is a count of something already kept elsewhere
+(cache hits, queue depth) is read at scrape time by a collector instead.
+
+The API serves /metrics; the worker serves the same exposition on
+settings.WORKER_METRICS_PORT. With PROMETHEUS_MULTIPROC_DIR set (several
+worker or API processes), counters and histograms are aggregated across
+processes; cache stats then describe the process that serves the scrape.
+
+The Celery worker needs multiprocess mode: its tasks run in prefork child
+processes while the port is served by the parent, which runs none. The
+parent clears the directory on startup (clear_multiprocess_dir) and marks
+each child dead when it exits. Cache stats on the worker port come from
+the parent, so they are meaningless there; read them per process from logs
+or the API.
+"""
+
+import os
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+from wsgiref.simple_server import WSGIServer
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from app.core.config import settings
+
+SIMULATED_MATCHES = Counter(
+    "sim_matches",
+    "Matches simulated, by caller; rate() gives sims per second",
+    ["source"],
+)
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task wall time",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+AD_HOC_DURATION = Histogram(
+    "ad_hoc_request_duration_seconds",
+    "Ad-hoc simulation request latency, by n_sims bucket",
+    ["n_sims"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_SESSION_DURATION = Histogram(
+    "db_session_duration_seconds",
+    "Time a database session is held open",
+    ["source"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+# Upper bounds of the n_sims label of AD_HOC_DURATION
+_N_SIMS_BUCKETS = (1000, 10000, 100000)
+
+
+def n_sims_bucket(n_sims: int) -> str:
+    """Label for a request size: "1000", "10000", "100000" or "+Inf" (upper bounds)"""
+    for bound in _N_SIMS_BUCKETS:
+        if n_sims <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+# ==================== SCRAPE-TIME COLLECTORS ====================
+
+CacheStats = Callable[[], tuple[int, int]]  # -> (hits, misses)
+_caches: dict[str, CacheStats] = {}
+
+
+def register_cache(name: str, stats: CacheStats) -> None:
+    """Report a cache's (hits, misses) on every scrape"""
+    _caches[name] = stats
+
+
+def register_lru_cache(name: str, cached: Any) -> None:
+    """Report a functools.lru_cache'd function"""
+    register_cache(name, lambda: (cached.cache_info().hits, cached.cache_info().misses))
+
+
+class CacheCollector(Collector):
+    def collect(self) -> Iterator[Metric]:
+        hits = CounterMetricFamily("sim_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily(
+            "sim_cache_misses", "Cache misses", labels=["cache"]
+        )
+        ratio = GaugeMetricFamily(
+            "sim_cache_hit_ratio", "Hits over lookups so far", labels=["cache"]
+        )
+        for name, stats in sorted(_caches.items()):
+            n_hits, n_misses = stats()
+            hits.add_metric([name], n_hits)
+            misses.add_metric([name], n_misses)
+            if n_hits + n_misses:
+                ratio.add_metric([name], n_hits / (n_hits + n_misses))
+        yield from (hits, misses, ratio)
+
+
+class QueueDepthCollector(Collector):
+    """Messages waiting in the Celery queues, read from a Redis broker"""
+
+    def __init__(self, queues: tuple[str, ...] = ("celery",)):
+        self.queues = queues
+        self._client: Any = None
+
+    def collect(self) -> Iterator[Metric]:
+        depth = GaugeMetricFamily(
+            "celery_queue_depth", "Messages waiting in a Celery queue", labels=["queue"]
+        )
+        if settings.USE_SQLITE or not settings.CELERY_BROKER_URL.startswith("redis"):
+            return
+        try:
+            if self._client is None:
+                import redis
+
+                self._client = redis.Redis.from_url(
+                    settings.CELERY_BROKER_URL, socket_timeout=0.5
+                )
+            for queue in self.queues:
+                depth.add_metric([queue], self._client.llen(queue))
+        except Exception:
+            # A broker outage must not break the scrape; the series just goes missing
+            return
+        yield depth
+
+
+_COLLECTORS = (CacheCollector(), QueueDepthCollector())
+for _collector in _COLLECTORS:
+    REGISTRY.register(_collector)
+
+
+def clear_multiprocess_dir() -> None:
+    """Drop the values of earlier runs (call once, before any child starts)"""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+def mark_process_dead(pid: int) -> None:
+    """Forget an exited child's live gauges; its counters keep counting in the total"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)  # type: ignore[no-untyped-call]
+
+
+def registry() -> CollectorRegistry:
+    """The registry to expose: this process's, or every process's in multiprocess mode"""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    combined = CollectorRegistry()
+    multiprocess.MultiProcessCollector(combined)  # type: ignore[no-untyped-call]
+    for collector in _COLLECTORS:
+        combined.register(collector)
+    return combined
+
+
+def render() -> tuple[bytes, str]:
+    """Text exposition of every metric, and its content type"""
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+def serve(port: int | None = None) -> tuple[WSGIServer, threading.Thread]:
+    """Expose the metrics over HTTP on their own port (the worker has no web server)"""
+    return start_http_server(
+        settings.WORKER_METRICS_PORT if port is None else port, registry=registry()
+    )
@@ -0,0 +1,109 @@
+"""
+Per-phase timings and opt-in profiles for tasks.
+
+PhaseTimer wraps each phase of a task in a span: the span is logged through
+structlog (with whatever context is bound, e.g. match_id) and its duration
+collected, so the task's completion event can carry every phase at once.
+
+profiled() captures a profile of one block when asked to, and is a
+nullcontext otherwise:
+- "cprofile": deterministic, saved as .prof (pstats, snakeviz, ...)
+- "sample":   pyinstrument's sampling profiler, saved as .html; falls back
+              to cProfile when pyinstrument is not installed
+
+Profiles are written to settings.PROFILE_DIR and their path is logged.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+ProfileMode = Literal["cprofile", "sample"]
+
+
+class PhaseTimer:
+    """Wall time of the named phases of one task, in milliseconds"""
+
+    def __init__(self) -> None:
+        self.timings_ms: dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            # A phase entered twice adds up
+            self.timings_ms[name] = round(
+                self.timings_ms.get(name, 0.0) + duration_ms, 3
+            )
+            logger.debug(
+                "Phase complete", phase=name, duration_ms=round(duration_ms, 3)
+            )
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self._start) * 1000, 3)
+
+
+def profiled(mode: ProfileMode | None, label: str) -> AbstractContextManager[None]:
+    """Profile the block when mode is set; label names the output file"""
+    if mode is None:
+        return nullcontext()
+    if mode == "sample":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            logger.warning(
+                "pyinstrument not installed, profiling with cProfile", label=label
+            )
+            mode = "cprofile"
+    return _sampling_profile(label) if mode == "sample" else _cprofile(label)
+
+
+def _profile_path(label: str, suffix: str) -> Path:
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    return directory / f"{label}-{stamp}{suffix}"
+
+
+@contextmanager
+def _cprofile(label: str) -> Iterator[None]:
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = _profile_path(label, ".prof")
+        profiler.dump_stats(path)
+        logger.info("Profile saved", mode="cprofile", path=str(path))
+
+
+@contextmanager
+def _sampling_profile(label: str) -> Iterator[None]:
+    from pyinstrument import Profiler
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        path = _profile_path(label, ".html")
+        path.write_text(profiler.output_html())
+        logger.info("Profile saved", mode="sample", path=str(path))
@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+# How pricing.devig removes the bookmaker margin
+DevigMethod = Literal["multiplicative", "additive", "power"]
+
+
+class MatchEdge(BaseModel):
+    match_id: uuid.UUID
+    player1_name: str
+    player2_name: str
+    start_time: datetime
+    p1_odds: int
+    p2_odds: int
+
+    # Market
+    vig: float
+    p1_fair_prob: float
+    p2_fair_prob: float
+
+    # Simulator vs market (None until the match has been simulated)
+    sim_win_prob_p1: float | None = None
+    p1_edge: float | None = None
+    p2_edge: float | None = None
+    p1_ev: float | None = None
+    p2_ev: float | None = None
+    p1_kelly: float | None = None
+    p2_kelly: float | None = None
+
+
+class SlateEdges(BaseModel):
+    method: str
+    kelly_multiplier: float
+    data: list[MatchEdge]
+    count: int
@@ -1,5 +1,9 @@
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+import uuid
+
+from pydantic import BaseModel, Field
+
+from app.services.sim_types import MatchState, Objective
+
 
 class SimulationRequest(BaseModel):
     player1_name: str
@@ -8,18 +12,145 @@ class SimulationRequest(BaseModel):
     n_sims: int = 1000
     sets_to_win: int = 2
     ruleset: str = "best_of_3"
+    # Simulate only the remainder of a match in progress
+    start_state: MatchState | None = None
+    # Keep the joint per-sim outcomes in the outcome store
+    persist_outcomes: bool = False
+
 
 class SimulationResponse(BaseModel):
     p1_name: str
     p2_name: str
     surface: str
     simulations: int
-    
+
     p1_win_pct: float
     p1_avg_fantasy_points: float
     p1_avg_aces: float
     p1_avg_dfs: float
-    
+
     p2_avg_fantasy_points: float
     p2_avg_aces: float
     p2_avg_dfs: float
+
+    # Opponents' points move against each other; averages alone hide it
+    fantasy_points_correlation: float
+    outcomes_key: str | None = None
+
+
+class LiveWinProbResponse(BaseModel):
+    p1_name: str
+    p2_name: str
+    surface: str
+    sets_to_win: int
+
+    p1_serve_point_prob: float
+    p2_serve_point_prob: float
+    p1_win_prob: float
+    p2_win_prob: float
+
+
+class TournamentRequest(BaseModel):
+    # Bracket order: slot 0 plays slot 1, ...; null is a bye
+    player_ids: list[uuid.UUID | None]
+    surface: str = "Hard"
+    n_sims: int = Field(20000, ge=1, le=200000)
+    sets_to_win: int = Field(2, ge=2, le=3)
+    # Pull match odds towards surface Elo (0 = serve/return stats only)
+    elo_weight: float = Field(0.0, ge=0, le=1)
+
+
+class TournamentPlayerOdds(BaseModel):
+    player_id: uuid.UUID
+    name: str
+    # P(reaching each round), keyed by round label (R64, ..., QF, SF, F, W)
+    reach: dict[str, float]
+    expected_fantasy_points: float
+
+
+class TournamentResponse(BaseModel):
+    surface: str
+    draw_size: int
+    simulations: int
+    rounds: list[str]
+    players: list[TournamentPlayerOdds]
+
+
+class SlatePlayer(BaseModel):
+    name: str
+    salary: int = Field(ge=0)
+    # Projected share of the field rostering this player, for contest fields
+    ownership: float | None = Field(None, ge=0, le=1)
+
+
+class SlateMatch(BaseModel):
+    player1: SlatePlayer
+    player2: SlatePlayer
+    surface: str = "Hard"
+
+
+class LineupRequest(BaseModel):
+    matches: list[SlateMatch]
+    n_sims: int = Field(5000, ge=100, le=50000)
+    sets_to_win: int = Field(2, ge=2, le=3)
+    objective: Objective = "mean"
+    top_k: int = Field(10, ge=1, le=150)
+    salary_cap: int = 50000
+    lineup_size: int = Field(6, ge=1)
+    # Random opponents for the "win_prob" objective
+    field_size: int = Field(1000, ge=1, le=10000)
+
+
+class LineupOut(BaseModel):
+    players: list[str]
+    salary: int
+    score: float
+    mean: float
+    ceiling: float
+    win_prob: float | None = None
+
+
+class LineupResponse(BaseModel):
+    objective: str
+    simulations: int
+    data: list[LineupOut]
+    count: int
+
+
+class PayoutTier(BaseModel):
+    first_place: int = Field(ge=1)
+    last_place: int = Field(ge=1)
+    prize: float = Field(ge=0)
+
+
+class ContestRequest(BaseModel):
+    matches: list[SlateMatch]
+    # Our entries, as player names
+    lineups: list[list[str]] = Field(min_length=1, max_length=150)
+    n_sims: int = Field(10000, ge=100, le=50000)
+    sets_to_win: int = Field(2, ge=2, le=3)
+    salary_cap: int = 50000
+    # Opposing entries, drawn by ownership (or mean points when none is given)
+    field_size: int = Field(10000, ge=1, le=100000)
+    entry_fee: float = Field(ge=0)
+    payouts: list[PayoutTier]
+
+
+class ContestLineupOut(BaseModel):
+    players: list[str]
+    salary: int
+    mean: float
+    expected_payout: float
+    roi: float | None = None
+    cash_rate: float
+    win_rate: float
+    # Finishing place percentiles, e.g. {"p50": 812.0}
+    finish: dict[str, float]
+
+
+class ContestResponse(BaseModel):
+    simulations: int
+    entries: int
+    entry_fee: float
+    data: list[ContestLineupOut]
+    count: int
@@ -1,61 +1,65 @@
-from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List
-from datetime import datetime
 import uuid
+from datetime import datetime
+
+from sqlmodel import Field, Relationship, SQLModel
 
 # --- Models ---
 
+
 class Player(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(index=True, unique=True)
-    slug: Optional[str] = None # For URL matching if needed
-    
+    slug: str | None = None  # For URL matching if needed
+
     # Bio / Current Rank
-    rank: Optional[int] = None
-    age: Optional[float] = None
-    country: Optional[str] = None
-    
+    rank: int | None = None
+    age: float | None = None
+    country: str | None = None
+
     # Elo Ratings (Current) - Extracted from Elo Tables
-    elo_overall: Optional[int] = None
-    elo_hard: Optional[int] = None
-    elo_clay: Optional[int] = None
-    elo_grass: Optional[int] = None
-    
+    elo_overall: int | None = None
+    elo_hard: int | None = None
+    elo_clay: int | None = None
+    elo_grass: int | None = None
+
     # Relationships
-    stats: List["PlayerStats"] = Relationship(back_populates="player")
+    stats: list["PlayerStats"] = Relationship(back_populates="player")
 
 
 class PlayerStats(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     player_id: uuid.UUID = Field(foreign_key="player.id", ondelete="CASCADE")
-    
-    surface: str = Field(index=True) # All, Hard, Clay, Grass
-    
+
+    surface: str = Field(index=True)  # All, Hard, Clay, Grass
+
     # Serve Stats
     serve_1_in_pct: float = 0.0
     serve_1_won_pct: float = 0.0
     serve_2_won_pct: float = 0.0
     ace_pct: float = 0.0
     df_pct: float = 0.0
-    
+
     # Return Stats
     return_won_pct: float = 0.0
-    
+
     player: Player = Relationship(back_populates="stats")
 
 
 class Match(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    provider_event_id: str | None = Field(
+        default=None, index=True
+    )  # Odds feed event key
     player1_name: str
     player2_name: str
-    start_time: datetime
+    start_time: datetime = Field(index=True)
     surface: str = "Hard"
-    
+
     # Betting Market Data (Live Updates)
-    p1_odds: int = -110 # American Odds
+    p1_odds: int = -110  # American Odds
     p2_odds: int = -110
-    market_vig: float = 0.045 # Calculated House Edge
-    
+    market_vig: float = 0.045  # Calculated House Edge
+
     # Simulator Link
-    last_simulated_at: Optional[datetime] = None
-    sim_win_prob_p1: Optional[float] = None
+    last_simulated_at: datetime | None = None
+    sim_win_prob_p1: float | None = None
@@ -0,0 +1,167 @@
+"""
+Elo-blended point model.
+
+Serve and return percentages say how often each player wins a point on
+serve; surface Elo says how often a player wins the match. EloBlend keeps
+the serve/return model's shape (ace and double fault rates, first and
+second serve split) and shifts the rally win rates so that the match win
+probability becomes a blend of the two, weighted in log-odds.
+
+Shifting one player's serve point probability up and the other's down by
+the same amount keeps their sum fixed, so the calibration is a 1-D
+inversion along the difference. MatchWinGrid holds the exact match win
+probability (matchups.solve_matchups, both serve orders averaged) on a
+grid of (sum, difference); it is built once per match format and cached,
+after which both the forward lookup and the inversion are interpolation.
+"""
+
+from functools import cache
+from typing import Any
+
+import numpy as np
+
+from app.services.matchups import solve_matchups
+from app.services.sim_core import PointModel, ServeProbs, adjusted_rally
+
+# Grid of serve point probabilities: s = p1 + p2 (rows), d = p1 - p2 (columns)
+_SUMS = np.linspace(0.9, 1.6, 15)
+_DIFFS = np.linspace(-0.3, 0.3, 121)
+
+# Log-odds are clipped here so the grid rows stay strictly increasing
+_MAX_LOGIT = 20.0
+
+
+def elo_win_prob(elo: float, opponent_elo: float) -> float:
+    """Elo expected score: P(win) on a 400-point logistic scale"""
+    return 1.0 / (1.0 + 10 ** ((opponent_elo - elo) / 400))
+
+
+def _logit(p: Any) -> Any:
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return np.clip(np.log(p / (1 - p)), -_MAX_LOGIT, _MAX_LOGIT)
+
+
+def _expit(x: Any) -> Any:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class MatchWinGrid:
+    """
+    P(p1 wins the match) as a function of both players' serve point
+    probabilities, for one match format, with its inverse along p1 - p2.
+    """
+
+    def __init__(self, sets_to_win: int = 2):
+        self.sets_to_win = sets_to_win
+        s, d = np.meshgrid(_SUMS, _DIFFS, indexing="ij")
+        p1 = _point_only((s + d).ravel() / 2)
+        p2 = _point_only((s - d).ravel() / 2)
+        # Coin toss for the first server
+        win = 0.5 * (
+            solve_matchups(p1, p2, sets_to_win).p1_win
+            + 1.0
+            - solve_matchups(p2, p1, sets_to_win).p1_win
+        )
+        self.logits = _logit(win).reshape(s.shape)
+
+    def _rows(self, s: float) -> tuple[int, float]:
+        """Grid row below s and the interpolation weight of the row above"""
+        pos = float(np.interp(s, _SUMS, np.arange(len(_SUMS))))
+        row = min(int(pos), len(_SUMS) - 2)
+        return row, pos - row
+
+    def win_prob(self, p1_serve: float, p2_serve: float) -> float:
+        """P(p1 wins), p1 and p2 serve point probabilities"""
+        row, t = self._rows(p1_serve + p2_serve)
+        d = p1_serve - p2_serve
+        logit = (1 - t) * np.interp(d, _DIFFS, self.logits[row]) + t * np.interp(
+            d, _DIFFS, self.logits[row + 1]
+        )
+        return float(_expit(logit))
+
+    def calibrate(
+        self, p1_serve: float, p2_serve: float, target: float
+    ) -> tuple[float, float]:
+        """
+        Serve point probabilities with the same sum whose match win
+        probability is target. Differences beyond the grid are clipped.
+        """
+        s = p1_serve + p2_serve
+        row, t = self._rows(s)
+        goal = _logit(target)
+        d = (1 - t) * np.interp(goal, self.logits[row], _DIFFS) + t * np.interp(
+            goal, self.logits[row + 1], _DIFFS
+        )
+        return (s + d) / 2, (s - d) / 2
+
+
+@cache
+def match_win_grid(sets_to_win: int = 2) -> MatchWinGrid:
+    """One grid per match format, built on first use"""
+    return MatchWinGrid(sets_to_win)
+
+
+def _point_only(p: np.ndarray) -> ServeProbs:
+    """Serve probabilities that win a point with probability p (no aces or faults)"""
+    ones, zeros = np.ones_like(p), np.zeros_like(p)
+    return ServeProbs._make((ones, zeros, p, zeros, p))
+
+
+def shift_point_win(probs: ServeProbs, delta: float) -> ServeProbs:
+    """
+    The same serve with P(server wins the point) moved by delta, through
+    the rally components only; ace and double fault rates are kept.
+    """
+    rally = probs.first_in * (1.0 - probs.ace) + (1.0 - probs.first_in) * (
+        1.0 - probs.df
+    )
+    if rally <= 0:
+        return probs
+    step = delta / rally
+    return probs._replace(
+        won_1st=min(1.0, max(0.0, probs.won_1st + step)),
+        won_2nd=min(1.0, max(0.0, probs.won_2nd + step)),
+    )
+
+
+class EloBlend:
+    """
+    Point model: the base model, calibrated so that
+
+        logit P(server's player wins) = weight * logit P_elo + (1 - weight) * logit P_stats
+
+    where P_stats is the base model's own match win probability. Players
+    without an Elo rating (profile.elo is None) get the base model as-is.
+
+    Elo ratings come mostly from best-of-3 matches, so the calibration is
+    done on the sets_to_win grid (best of 3 by default); in a best-of-5
+    match the same point edges then give the larger favourite edge they
+    should.
+    """
+
+    def __init__(
+        self,
+        weight: float = 0.5,
+        base: PointModel = adjusted_rally,
+        sets_to_win: int = 2,
+    ):
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError(f"Elo weight must be within [0, 1], got {weight}")
+        self.weight = weight
+        self.base = base
+        self.sets_to_win = sets_to_win
+
+    def __call__(self, server: Any, returner: Any) -> ServeProbs:
+        probs = self.base(server, returner)
+        server_elo = getattr(server, "elo", None)
+        returner_elo = getattr(returner, "elo", None)
+        if self.weight == 0 or server_elo is None or returner_elo is None:
+            return probs
+
+        grid = match_win_grid(self.sets_to_win)
+        p_serve, p_return = probs.point_win, self.base(returner, server).point_win
+        stats_logit = _logit(grid.win_prob(p_serve, p_return))
+        elo_logit = _logit(elo_win_prob(server_elo, returner_elo))
+        target = _expit(self.weight * elo_logit + (1 - self.weight) * stats_logit)
+        calibrated, _ = grid.calibrate(p_serve, p_return, float(target))
+        return shift_point_win(probs, calibrated - p_serve)
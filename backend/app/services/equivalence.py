@@ -0,0 +1,301 @@
+"""
+Statistical equivalence of simulation engines.
+
+A faster engine (vectorized, analytic, sharded, variance-reduced, ...) is
+accepted when, on every matchup of a grid of synthetic profiles, its output
+cannot be told apart from the reference TennisMatchSimulator:
+
+- P(p1 wins) and each player's mean counting stats and DK points: the
+  confidence interval of candidate - reference must lie inside a margin
+  (an equivalence test, so a bigger sample makes passing easier, not
+  harder);
+- each player's DK points distribution: a two-sample Kolmogorov-Smirnov
+  test must not reject, at alpha split over every test run (Bonferroni).
+
+An Engine is any callable (p1, p2, n_sims, sets_to_win, rng) -> batched
+MatchTally, so both sides are scored by the same code.
+"""
+
+import math
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from itertools import combinations, product
+from statistics import NormalDist
+
+import numpy as np
+
+from app.services.sim_core import MatchTally
+from app.services.sim_engine import PlayerProfile, TennisMatchSimulator
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+
+Engine = Callable[
+    [PlayerProfile, PlayerProfile, int, int, np.random.Generator], MatchTally
+]
+
+# Largest accepted |candidate - reference| per metric (per player for stats)
+DEFAULT_MARGINS: dict[str, float] = {
+    "win_prob": 0.02,
+    "aces": 0.3,
+    "double_faults": 0.2,
+    "breaks": 0.2,
+    "games_won": 0.4,
+    "sets_won": 0.05,
+    "dk_points": 1.0,
+}
+
+_STATS = ("aces", "double_faults", "breaks", "games_won", "sets_won")
+
+
+# ==================== ENGINES ====================
+
+
+def reference_engine(
+    p1: PlayerProfile,
+    p2: PlayerProfile,
+    n_sims: int,
+    sets_to_win: int,
+    rng: np.random.Generator,
+) -> MatchTally:
+    """TennisMatchSimulator, one match at a time (seeded from rng)"""
+    random.seed(int(rng.integers(2**32)))
+    return TennisMatchSimulator(p1, p2, sets_to_win=sets_to_win).run_tally(n_sims)
+
+
+def batch_engine(
+    p1: PlayerProfile,
+    p2: PlayerProfile,
+    n_sims: int,
+    sets_to_win: int,
+    rng: np.random.Generator,
+) -> MatchTally:
+    """TennisMatchSimulator.run_batch, all matches in lockstep"""
+    return TennisMatchSimulator(p1, p2, sets_to_win=sets_to_win).run_batch(n_sims, rng)
+
+
+ENGINES: dict[str, Engine] = {
+    "reference": reference_engine,
+    "batch": batch_engine,
+}
+
+
+def profile_grid() -> list[tuple[PlayerProfile, PlayerProfile]]:
+    """
+    Every pairing of six synthetic players: weak, average and big servers,
+    each either clean or ace-heavy and error-prone.
+    """
+    servers = {
+        "weak": {
+            "serve_1_in_pct": 0.58,
+            "serve_1_won_pct": 0.64,
+            "serve_2_won_pct": 0.46,
+            "return_won_pct": 0.42,
+        },
+        "average": {
+            "serve_1_in_pct": 0.63,
+            "serve_1_won_pct": 0.72,
+            "serve_2_won_pct": 0.52,
+            "return_won_pct": 0.38,
+        },
+        "big": {
+            "serve_1_in_pct": 0.62,
+            "serve_1_won_pct": 0.80,
+            "serve_2_won_pct": 0.55,
+            "return_won_pct": 0.32,
+        },
+    }
+    styles = {
+        "clean": {"ace_pct": 0.04, "df_pct": 0.02},
+        "aces": {"ace_pct": 0.16, "df_pct": 0.05},
+    }
+    players = [
+        PlayerProfile(name=f"{server}/{style}", **servers[server], **styles[style])
+        for server, style in product(servers, styles)
+    ]
+    return list(combinations(players, 2))
+
+
+# ==================== STATISTICS ====================
+
+
+def ks_2samp(a: np.ndarray, b: np.ndarray) -> tuple[float, float]:
+    """
+    Two-sample Kolmogorov-Smirnov statistic and asymptotic p-value. Ties
+    (DK points are discrete) make the p-value conservative.
+    """
+    a, b = np.sort(a), np.sort(b)
+    values = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, values, side="right") / len(a)
+    cdf_b = np.searchsorted(b, values, side="right") / len(b)
+    d = float(np.max(np.abs(cdf_a - cdf_b)))
+
+    en = math.sqrt(len(a) * len(b) / (len(a) + len(b)))
+    lam = (en + 0.12 + 0.11 / en) * d
+    if lam < 0.2:
+        return d, 1.0
+    p = 2 * sum(
+        (-1) ** (j - 1) * math.exp(-2 * j * j * lam * lam) for j in range(1, 101)
+    )
+    return d, min(1.0, max(0.0, p))
+
+
+@dataclass
+class MetricComparison:
+    """candidate - reference for one metric, with its confidence interval"""
+
+    name: str
+    reference: float
+    candidate: float
+    ci_low: float
+    ci_high: float
+    margin: float
+
+    @property
+    def diff(self) -> float:
+        return self.candidate - self.reference
+
+    @property
+    def equivalent(self) -> bool:
+        return -self.margin <= self.ci_low and self.ci_high <= self.margin
+
+
+def _compare_means(
+    name: str, ref: np.ndarray, cand: np.ndarray, z: float, margin: float
+) -> MetricComparison:
+    se = math.sqrt(ref.var(ddof=1) / len(ref) + cand.var(ddof=1) / len(cand))
+    diff = float(cand.mean() - ref.mean())
+    return MetricComparison(
+        name,
+        float(ref.mean()),
+        float(cand.mean()),
+        diff - z * se,
+        diff + z * se,
+        margin,
+    )
+
+
+@dataclass
+class MatchupReport:
+    p1: str
+    p2: str
+    metrics: list[MetricComparison]
+    # Per player: (KS statistic, p-value) on DK points
+    ks: list[tuple[float, float]]
+
+
+@dataclass
+class EquivalenceReport:
+    matchups: list[MatchupReport]
+    n_sims: int
+    confidence: float
+    ks_alpha: float
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    def summary(self) -> str:
+        lines = [
+            f"{len(self.matchups)} matchups x {self.n_sims} sims, {self.confidence:.0%} CIs, "
+            f"KS alpha {self.ks_alpha} (Bonferroni)"
+        ]
+        for report in self.matchups:
+            worst = max(
+                report.metrics,
+                key=lambda m: max(abs(m.ci_low), abs(m.ci_high)) / m.margin,
+            )
+            min_p = min(p for _, p in report.ks)
+            lines.append(
+                f"  {report.p1:>14} v {report.p2:<14} worst {worst.name} "
+                f"{worst.diff:+.4f} [{worst.ci_low:+.4f}, {worst.ci_high:+.4f}] (margin {worst.margin}), "
+                f"min KS p {min_p:.3f}"
+            )
+        lines.extend(f"FAIL {failure}" for failure in self.failures)
+        lines.append("PASS" if self.passed else "FAIL")
+        return "\n".join(lines)
+
+
+def compare_engines(
+    candidate: Engine,
+    reference: Engine = reference_engine,
+    matchups: Sequence[tuple[PlayerProfile, PlayerProfile]] | None = None,
+    n_sims: int = 20000,
+    sets_to_win: int = 2,
+    confidence: float = 0.99,
+    ks_alpha: float = 0.01,
+    margins: dict[str, float] | None = None,
+    seed: int = 0,
+) -> EquivalenceReport:
+    """Run both engines on every matchup (profile_grid by default) and test equivalence"""
+    matchups = profile_grid() if matchups is None else matchups
+    margins = {**DEFAULT_MARGINS, **(margins or {})}
+    calc = DKScoringCalculator("BEST_OF_3" if sets_to_win == 2 else "BEST_OF_5")
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rng = np.random.default_rng(seed)
+    # Two KS tests (one per player) per matchup share alpha
+    ks_level = ks_alpha / (2 * len(matchups))
+
+    reports: list[MatchupReport] = []
+    failures: list[str] = []
+    for p1, p2 in matchups:
+        ref = reference(p1, p2, n_sims, sets_to_win, rng)
+        cand = candidate(p1, p2, n_sims, sets_to_win, rng)
+
+        # 1. Win probability and mean stats per player
+        metrics = [
+            _compare_means(
+                "win_prob",
+                (np.asarray(ref.winner) == 0).astype(float),
+                (np.asarray(cand.winner) == 0).astype(float),
+                z,
+                margins["win_prob"],
+            )
+        ]
+        for idx in (0, 1):
+            ref_stats, cand_stats = ref.player_stats(idx), cand.player_stats(idx)
+            for name in _STATS:
+                metrics.append(
+                    _compare_means(
+                        f"p{idx + 1}_{name}",
+                        np.asarray(ref_stats[name], dtype=float),
+                        np.asarray(cand_stats[name], dtype=float),
+                        z,
+                        margins[name],
+                    )
+                )
+
+        # 2. DK points: means and whole distributions
+        ks = []
+        for idx, (ref_points, cand_points) in enumerate(
+            zip(
+                ref.fantasy_points(calc.score),
+                cand.fantasy_points(calc.score),
+                strict=False,
+            )
+        ):
+            metrics.append(
+                _compare_means(
+                    f"p{idx + 1}_dk_points",
+                    ref_points,
+                    cand_points,
+                    z,
+                    margins["dk_points"],
+                )
+            )
+            ks.append(ks_2samp(ref_points, cand_points))
+
+        label = f"{p1.name} v {p2.name}"
+        failures.extend(
+            f"{label}: {m.name} {m.diff:+.4f} [{m.ci_low:+.4f}, {m.ci_high:+.4f}] outside +/-{m.margin}"
+            for m in metrics
+            if not m.equivalent
+        )
+        failures.extend(
+            f"{label}: p{idx + 1} DK points KS D={d:.4f} p={p:.2e}"
+            for idx, (d, p) in enumerate(ks)
+            if p < ks_level
+        )
+        reports.append(MatchupReport(p1.name, p2.name, metrics, ks))
+
+    return EquivalenceReport(reports, n_sims, confidence, ks_alpha, failures)
@@ -1,9 +1,10 @@
-from typing import Dict, Any
+from typing import Any
 
-def calculate_fantasy_points(stats: Dict[str, Any], ruleset: str = "best_of_3") -> float:
+
+def calculate_fantasy_points(stats: dict[str, Any], ruleset: str = "best_of_3") -> Any:
     """
     Calculates DraftKings fantasy points based on match stats.
-    
+
     stats input format:
     {
         "match_win": 0/1,
@@ -24,29 +25,24 @@ def calculate_fantasy_points(stats: Dict[str, Any], ruleset: str = "best_of_3")
             "ace": 0.4,
             "double_fault": -1.0,
             "bonus_no_df": 2.5,
-            "bonus_10_aces": 2.0
+            "bonus_10_aces": 2.0,
         },
         # Simplified for now, can expand later
     }
-    
+
     rules = SCORING.get(ruleset, SCORING["best_of_3"])
-    
+
+    # Plain arithmetic, so MatchTally arrays (one entry per sim) score too
     fp = 0.0
     fp += rules["match_played"]
-    
-    if stats["match_win"]:
-        fp += rules["match_won"]
-        
+    fp += stats["match_win"] * rules["match_won"]
     fp += stats["sets"] * rules["set_won"]
     fp += stats["games"] * rules["game_won"]
     fp += stats["aces"] * rules["ace"]
     fp += stats["dfs"] * rules["double_fault"]
-    
+
     # Bonuses
-    if stats["dfs"] == 0:
-        fp += rules["bonus_no_df"]
-    
-    if stats["aces"] >= 10:
-        fp += rules["bonus_10_aces"]
-        
+    fp += (stats["dfs"] == 0) * rules["bonus_no_df"]
+    fp += (stats["aces"] >= 10) * rules["bonus_10_aces"]
+
     return fp
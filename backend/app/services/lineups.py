@@ -0,0 +1,440 @@
+"""
+DraftKings lineup optimizer over simulated fantasy points.
+
+The input is a points matrix of shape (n_sims, n_players): column j holds
+player j's DK points in every simulated world. Both players of a match come
+from the same simulated match, so opponents are correlated, and a lineup is
+always scored world by world, never from per-player averages.
+
+optimize_lineups returns the top-K salary-feasible lineups by
+- "mean":      expected total
+- "ceiling":   high quantile of the total (90th percentile by default)
+- "win_prob":  P(total beats every lineup of a field)
+
+The mean is linear in the players, so its top K come from an exact
+depth-first branch and bound: players are visited best-first and a branch
+is cut as soon as its salary cannot fit or its best possible total cannot
+beat the K-th best lineup found so far. The same search, run on a single
+simulated world, gives that world's optimal lineup.
+
+Ceiling and win probability depend on how players' outcomes combine, and
+per-player bounds on them are too loose to prune. They are optimized over
+a candidate pool instead: the best lineups by mean plus the optimal
+lineups of a sample of worlds (the lineups that win tournaments), scored
+across all worlds at once, with the leaders then improved by single
+player swaps.
+"""
+
+import heapq
+import itertools
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.sim_core import MatchTally, PointModel, adjusted_rally, simulate_batch
+from app.services.sim_engine import PlayerProfile
+from app.services.sim_types import Objective
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+
+DK_SALARY_CAP = 50000
+DK_LINEUP_SIZE = 6
+
+
+@dataclass
+class Lineup:
+    players: tuple[int, ...]  # Column indices into the points matrix
+    salary: int
+    score: float  # Value of the objective it was optimized for
+    mean: float
+    ceiling: float
+    win_prob: float | None = None  # Only when scored against a field
+
+
+def build_slate_points(
+    matches: Sequence[tuple[PlayerProfile, PlayerProfile]],
+    n_sims: int = 10000,
+    sets_to_win: int = 2,
+    rng: np.random.Generator | None = None,
+    point_model: PointModel = adjusted_rally,
+) -> np.ndarray:
+    """Simulate every match of a slate once and score it (see slate_points)"""
+    rng = rng or np.random.default_rng()
+    tallies = [
+        simulate_batch(
+            point_model(p1, p2), point_model(p2, p1), n_sims, sets_to_win, rng
+        )
+        for p1, p2 in matches
+    ]
+    return slate_points(tallies, sets_to_win)
+
+
+def slate_points(tallies: Sequence[MatchTally], sets_to_win: int = 2) -> np.ndarray:
+    """
+    DK points for a slate, shape (n_sims, 2 * len(tallies)), from batched
+    tallies of equal length (fresh, or read back from an outcome store).
+    Columns 2m and 2m + 1 are match m's players, scored from the same
+    simulated matches.
+    """
+    calc = DKScoringCalculator("BEST_OF_3" if sets_to_win == 2 else "BEST_OF_5")
+    n_sims = len(tallies[0].winner) if tallies else 0
+    points = np.empty((n_sims, 2 * len(tallies)))
+    for m, tally in enumerate(tallies):
+        points[:, 2 * m], points[:, 2 * m + 1] = tally.fantasy_points(calc.score)
+    return points
+
+
+def random_field(
+    points: np.ndarray,
+    salaries: np.ndarray,
+    n_lineups: int,
+    salary_cap: int = DK_SALARY_CAP,
+    lineup_size: int = DK_LINEUP_SIZE,
+    rng: np.random.Generator | None = None,
+    ownership: Sequence[float] | np.ndarray | None = None,
+    max_rounds: int = 100,
+) -> np.ndarray:
+    """
+    A field of salary-feasible lineups, shape (n_lineups, lineup_size).
+    Players are drawn with probability proportional to their projected
+    ownership, or to their mean points (a rough chalk model) without one,
+    without replacement within a lineup. Unowned players are never drawn.
+
+    Each round draws 2 * n_lineups lineups and keeps those under the cap;
+    ValueError after max_rounds rounds, when the cap leaves too few
+    lineups to be drawn at random.
+    """
+    rng = rng or np.random.default_rng()
+    costs = np.asarray(salaries)
+    if ownership is None:
+        weights = np.log(np.clip(points.mean(axis=0), 1e-9, None))
+    else:
+        shares = np.asarray(ownership, dtype=np.float64)
+        if len(shares) != len(costs) or np.any(shares < 0):
+            raise ValueError("Ownership must be one non-negative share per player")
+        if np.count_nonzero(shares) < lineup_size:
+            raise ValueError(f"Fewer than {lineup_size} players have any ownership")
+        with np.errstate(divide="ignore"):
+            weights = np.log(shares)
+        # Only owned players can fill a field lineup
+        costs = np.where(shares > 0, costs, salary_cap + 1)
+    if np.sort(costs)[:lineup_size].sum() > salary_cap:
+        raise ValueError("No lineup fits under the salary cap")
+
+    field: list[np.ndarray] = []
+    n_found = rounds = 0
+    while n_found < n_lineups:
+        if rounds == max_rounds:
+            raise ValueError(
+                f"Salary cap too tight for a random field: {n_found} of {n_lineups} lineups "
+                f"fit in {rounds * 2 * n_lineups} draws"
+            )
+        rounds += 1
+        # Gumbel top-k: weighted sampling without replacement, many lineups at once
+        keys = weights + rng.gumbel(size=(2 * n_lineups, len(weights)))
+        drawn = np.argpartition(-keys, lineup_size - 1, axis=1)[:, :lineup_size]
+        drawn = drawn[costs[drawn].sum(axis=1) <= salary_cap]
+        field.append(drawn)
+        n_found += len(drawn)
+    return np.concatenate(field)[:n_lineups]
+
+
+def optimize_lineups(
+    points: np.ndarray,
+    salaries: Sequence[int],
+    objective: Objective = "mean",
+    top_k: int = 10,
+    salary_cap: int = DK_SALARY_CAP,
+    lineup_size: int = DK_LINEUP_SIZE,
+    ceiling_quantile: float = 0.9,
+    field: np.ndarray | None = None,
+    field_size: int = 1000,
+    pool_size: int = 500,
+    n_worlds: int = 200,
+    rng: np.random.Generator | None = None,
+) -> list[Lineup]:
+    """
+    Top-K lineups for the objective, best first.
+
+    points:     (n_sims, n_players) simulated DK points
+    salaries:   one per column of points
+    field:      opposing lineups for "win_prob", as column indices of shape
+                (n_lineups, lineup_size); a random_field of field_size
+                lineups is drawn when omitted
+    pool_size, n_worlds: candidate pool for "ceiling" and "win_prob"
+    """
+    points = np.asarray(points, dtype=np.float64)
+    costs = np.asarray(salaries, dtype=np.int64)
+    if points.ndim != 2 or points.shape[1] != len(costs):
+        raise ValueError(
+            "points must be (n_sims, n_players) with one salary per player"
+        )
+    if objective not in ("mean", "ceiling", "win_prob"):
+        raise ValueError(f"Unknown objective: {objective}")
+    if not 0 < lineup_size <= len(costs):
+        raise ValueError(f"Cannot pick {lineup_size} of {len(costs)} players")
+    rng = rng or np.random.default_rng()
+
+    if objective == "win_prob" and field is None:
+        field = random_field(points, costs, field_size, salary_cap, lineup_size, rng)
+    scorer = _LineupScorer(points, costs, salary_cap, ceiling_quantile, field)
+    means = points.mean(axis=0)
+
+    if objective == "mean":
+        found = _LineupSearch(means, costs, top_k, salary_cap, lineup_size).run()
+        return scorer.describe([picks for _, picks in found], objective)
+
+    # 1. Candidate pool: the best lineups by mean, plus each sampled world's optimum
+    pool = {
+        picks
+        for _, picks in _LineupSearch(
+            means, costs, pool_size, salary_cap, lineup_size
+        ).run()
+    }
+    for world in rng.choice(
+        points.shape[0], min(n_worlds, points.shape[0]), replace=False
+    ):
+        pool.update(
+            picks
+            for _, picks in _LineupSearch(
+                points[world], costs, 1, salary_cap, lineup_size
+            ).run()
+        )
+    if not pool:
+        return []
+
+    # 2. Score the whole pool across all worlds, then polish the leaders
+    candidates = sorted(pool)
+    scores = scorer.score(np.array(candidates), objective)
+    leaders = [candidates[i] for i in np.argsort(-scores, kind="stable")[:top_k]]
+    improved = {scorer.improve(picks, objective) for picks in leaders}
+    ranked = sorted(
+        improved | set(leaders),
+        key=lambda picks: -scorer.score(np.array([picks]), objective)[0],
+    )
+    return scorer.describe(ranked[:top_k], objective)
+
+
+def _tail_size(n_sims: int, quantile: float) -> int:
+    """Worlds in the upper tail: the ceiling is the m-th largest total"""
+    return max(1, int(round((1 - quantile) * n_sims)))
+
+
+class _LineupSearch:
+    """
+    Exact top-N lineups by a per-player linear score (mean points, or the
+    points of one world), by depth-first branch and bound.
+    """
+
+    def __init__(
+        self,
+        key: np.ndarray,
+        salaries: np.ndarray,
+        top_n: int,
+        salary_cap: int,
+        lineup_size: int,
+    ):
+        self.top_n = top_n
+        self.salary_cap = salary_cap
+        self.size = lineup_size
+
+        # 1. Visit order: best players first, so good lineups set the bar early
+        self.order = np.argsort(-key, kind="stable")
+        self.key = key[self.order]
+        self.salaries = salaries[self.order]
+        self.n = len(key)
+
+        # 2. Suffix tables, indexed [k][r]: the best r picks among players k..n-1.
+        # The search loop runs in pure Python, so it reads plain lists.
+        self.best_key = self._suffix_top(self.key).tolist()
+        self.min_salary = (
+            -self._suffix_top(-self.salaries.astype(np.float64))
+        ).tolist()
+        self._keys = self.key.tolist()
+        self._salaries = self.salaries.tolist()
+        self._heap: list[tuple[float, int, tuple[int, ...]]] = []
+        self._counter = itertools.count()
+        self._bar = -np.inf  # Score a branch must beat to enter the top N
+
+    def _suffix_top(self, values: np.ndarray) -> np.ndarray:
+        """(n + 1, size + 1): sum of the r largest of values[k:], -inf if fewer than r remain"""
+        out = np.full((self.n + 1, self.size + 1), -np.inf)
+        out[:, 0] = 0.0
+        top: list[float] = []  # The size largest values seen so far, descending
+        for k in range(self.n - 1, -1, -1):
+            top = sorted(top + [float(values[k])], reverse=True)[: self.size]
+            out[k, 1 : len(top) + 1] = np.cumsum(top)
+        return out
+
+    def run(self) -> list[tuple[float, tuple[int, ...]]]:
+        self._search(0, [], 0, 0.0)
+        # Best first; on equal scores the lineup found first
+        ranked = sorted(self._heap, key=lambda item: (-item[0], -item[1]))
+        return [
+            (score, tuple(sorted(int(self.order[j]) for j in picks)))
+            for score, _, picks in ranked
+        ]
+
+    def _search(
+        self, start: int, picks: list[int], salary: int, partial: float
+    ) -> None:
+        r = self.size - len(picks)
+        if r == 0:
+            self._offer(partial, picks)
+            return
+
+        min_salary, best_key = self.min_salary, self.best_key
+        for k in range(start, self.n - r + 1):
+            # Both tables only get worse as k grows, so a failed check ends the loop
+            if salary + min_salary[k][r] > self.salary_cap:
+                break
+            if partial + best_key[k][r] <= self._bar:
+                break
+            new_salary = salary + self._salaries[k]
+            if new_salary + min_salary[k + 1][r - 1] > self.salary_cap:
+                continue
+            picks.append(k)
+            self._search(k + 1, picks, new_salary, partial + self._keys[k])
+            picks.pop()
+
+    def _offer(self, score: float, picks: list[int]) -> None:
+        # Negated counter: on equal scores the lineup found later is dropped first
+        item = (score, -next(self._counter), tuple(picks))
+        if len(self._heap) < self.top_n:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+        if len(self._heap) == self.top_n:
+            self._bar = self._heap[0][0]
+
+
+class _LineupScorer:
+    """Lineup objectives, vectorized over sim worlds and over lineups."""
+
+    # Lineups per scoring chunk: bounds the (n_sims, chunk) totals array
+    _CHUNK = 256
+    # Worlds used to screen swaps before checking the best one on all of them
+    _SCREEN_WORLDS = 2000
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        salaries: np.ndarray,
+        salary_cap: int,
+        ceiling_quantile: float,
+        field: np.ndarray | None,
+    ):
+        self.points = points
+        self.salaries = salaries
+        self.salary_cap = salary_cap
+        self.ceiling_quantile = ceiling_quantile
+        self.tail = _tail_size(points.shape[0], ceiling_quantile)
+        # Per world, the score to beat to finish ahead of the whole field
+        self.field_best = None
+        if field is not None:
+            self.field_best = np.full(points.shape[0], -np.inf)
+            for start in range(0, len(field), self._CHUNK):
+                chunk_best = (
+                    points[:, field[start : start + self._CHUNK]]
+                    .sum(axis=2)
+                    .max(axis=1)
+                )
+                np.maximum(self.field_best, chunk_best, out=self.field_best)
+
+    def _objective(
+        self, totals: np.ndarray, objective: Objective, n_worlds: int | None = None
+    ) -> np.ndarray:
+        """totals (n_worlds, ...) for the first n_worlds worlds -> objective per lineup"""
+        n = totals.shape[0]
+        if objective == "mean":
+            return np.asarray(totals.mean(axis=0))
+        if objective == "ceiling":
+            tail = (
+                self.tail if n_worlds is None else _tail_size(n, self.ceiling_quantile)
+            )
+            return np.asarray(np.partition(totals, n - tail, axis=0)[n - tail])
+        if self.field_best is None:
+            raise ValueError("win_prob needs a field")
+        field_best = self.field_best[:n].reshape((-1,) + (1,) * (totals.ndim - 1))
+        return np.asarray((totals > field_best).mean(axis=0))
+
+    def score(self, lineups: np.ndarray, objective: Objective) -> np.ndarray:
+        """lineups (m, size) of column indices -> (m,) objective values"""
+        out = np.empty(len(lineups))
+        for start in range(0, len(lineups), self._CHUNK):
+            chunk = lineups[start : start + self._CHUNK]
+            out[start : start + len(chunk)] = self._objective(
+                self.points[:, chunk].sum(axis=2), objective
+            )
+        return out
+
+    def improve(
+        self, picks: tuple[int, ...], objective: Objective, max_rounds: int = 10
+    ) -> tuple[int, ...]:
+        """
+        Hill-climb by single swaps. Every (player out, player in) pair is
+        screened at once on the first _SCREEN_WORLDS worlds; the best one is
+        kept if it also improves the objective over all worlds.
+        """
+        screen = min(self.points.shape[0], self._SCREEN_WORLDS)
+        lineup = np.array(picks)
+        best = self.score(lineup[None, :], objective)[0]
+        for _ in range(max_rounds):
+            # Only players who fit in place of someone, and are not already in
+            salary = self.salaries[lineup]
+            fits = self.salaries <= self.salary_cap - salary.sum() + salary.max()
+            fits[lineup] = False
+            incoming = np.flatnonzero(fits)
+            if not len(incoming):
+                break
+
+            # (screen, size, n_incoming): drop lineup[i], add incoming[j]
+            points = self.points[:screen]
+            totals = points[:, lineup].sum(axis=1)
+            swapped = (totals[:, None] - points[:, lineup])[:, :, None] + points[
+                :, None, incoming
+            ]
+            scores = self._objective(swapped, objective, screen)
+            scores[
+                salary.sum() - salary[:, None] + self.salaries[incoming][None, :]
+                > self.salary_cap
+            ] = -np.inf
+
+            i, j = np.unravel_index(np.argmax(scores), scores.shape)
+            if not np.isfinite(scores[i, j]):
+                break
+            candidate = lineup.copy()
+            candidate[i] = incoming[j]
+            score = self.score(candidate[None, :], objective)[0]
+            if score <= best:
+                break
+            best, lineup = score, candidate
+        return tuple(sorted(int(p) for p in lineup))
+
+    def describe(
+        self, lineups: list[tuple[int, ...]], objective: Objective
+    ) -> list[Lineup]:
+        """Every objective for the chosen lineups, in one pass"""
+        if not lineups:
+            return []
+        totals = self.points[:, np.array(lineups)].sum(axis=2)  # (n_sims, K)
+        ceilings = self._objective(totals, "ceiling")
+        win_probs = (
+            self._objective(totals, "win_prob") if self.field_best is not None else None
+        )
+        values = {
+            "mean": totals.mean(axis=0),
+            "ceiling": ceilings,
+            "win_prob": win_probs,
+        }[objective]
+        return [
+            Lineup(
+                players=picks,
+                salary=int(self.salaries[list(picks)].sum()),
+                score=float(values[i]),
+                mean=float(totals[:, i].mean()),
+                ceiling=float(ceilings[i]),
+                win_prob=float(win_probs[i]) if win_probs is not None else None,
+            )
+            for i, picks in enumerate(lineups)
+        ]
@@ -0,0 +1,381 @@
+"""
+Exact head-to-head outcomes for many matchups at once.
+
+solve_matchups runs the Markov chain behind win_prob.LiveWinProbTable
+(points -> games and tiebreaks -> sets -> match) with every probability a
+NumPy array over matchups, and carries the DK counting stats along with the
+win probability: for each matchup it returns P(p1 wins) and the expected
+games, breaks, aces, double faults, sets and clean sets of both players,
+conditional on who wins. A 128-player draw solves all of its ~16k ordered
+pairs in one pass instead of simulating each of them.
+
+Serve rotation follows sim_core.MatchCore; p1 serves first.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.metrics import register_cache
+from app.services.sim_core import ServeProbs, tiebreak_server
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+
+# Stat rows of a (..., 6, 2) stats array; columns are [p1, p2]
+GAMES_WON, BREAKS, ACES, DOUBLE_FAULTS, SETS_WON, CLEAN_SETS = range(6)
+_N_STATS = 6
+
+# Deuce rallies beyond this many points each are negligible
+_MAX_RACE_POINTS = 30
+
+# (P(p1 wins), E[events * 1{p1 wins}], E[events]) from one game or tiebreak score
+_RaceValue = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# Set outcomes are indexed 2 * winner + server of the next set's first game
+_N_SET_OUTCOMES = 4
+
+
+@dataclass
+class MatchupSolution:
+    """
+    Exact outcome of n matchups (p1 serving first).
+
+    p1_win:            P(p1 wins), shape (n,)
+    stats_if_p1_wins:  expected stats given p1 wins, shape (n, 6, 2)
+    stats_if_p2_wins:  same, given p2 wins
+    straight_sets:     P(player wins without dropping a set | player wins),
+                       shape (n, 2)
+    """
+
+    p1_win: np.ndarray
+    stats_if_p1_wins: np.ndarray
+    stats_if_p2_wins: np.ndarray
+    straight_sets: np.ndarray
+
+    def player_stats(self, idx: int, won: bool) -> dict[str, np.ndarray]:
+        """
+        Expected MatchTally.player_stats for one side, given it wins (won=True)
+        or loses. Feeds DKScoringCalculator.expected_score.
+        """
+        p1_won = won == (idx == 0)
+        stats = self.stats_if_p1_wins if p1_won else self.stats_if_p2_wins
+        opp = 1 - idx
+        n = len(self.p1_win)
+        return {
+            "aces": stats[:, ACES, idx],
+            "double_faults": stats[:, DOUBLE_FAULTS, idx],
+            "breaks": stats[:, BREAKS, idx],
+            "games_won": stats[:, GAMES_WON, idx],
+            "games_lost": stats[:, GAMES_WON, opp],
+            "sets_won": stats[:, SETS_WON, idx],
+            "sets_lost": stats[:, SETS_WON, opp],
+            "clean_sets": stats[:, CLEAN_SETS, idx],
+            "match_won": np.full(n, float(won)),
+            "straight_sets_win": self.straight_sets[:, idx] if won else np.zeros(n),
+        }
+
+
+def stack_serve_probs(probs: Sequence[ServeProbs]) -> ServeProbs:
+    """n ServeProbs -> one ServeProbs of (n,) arrays"""
+    return ServeProbs(
+        *np.array(probs, dtype=np.float64).reshape(-1, len(ServeProbs._fields)).T
+    )
+
+
+def solve_matchups(
+    p1: ServeProbs, p2: ServeProbs, sets_to_win: int = 2
+) -> MatchupSolution:
+    """
+    p1, p2: ServeProbs of (n,) arrays, one entry per matchup
+    (see stack_serve_probs).
+    """
+    return _MatchupSolver(p1, p2, sets_to_win).solve()
+
+
+class _MatchupSolver:
+    """One vectorized solve; every memo is keyed by score only."""
+
+    def __init__(self, p1: ServeProbs, p2: ServeProbs, sets_to_win: int):
+        self.sets_to_win = sets_to_win
+        self.n = len(np.atleast_1d(p1.first_in))
+        # (3, 2, n): [P(ace), P(double fault), P(server wins)] per serve point, x [p1, p2]
+        self.rates = np.array(
+            [
+                [np.broadcast_to(p.first_in * p.ace, self.n) for p in (p1, p2)],
+                [np.broadcast_to((1 - p.first_in) * p.df, self.n) for p in (p1, p2)],
+                [np.broadcast_to(p.point_win, self.n) for p in (p1, p2)],
+            ],
+            dtype=np.float64,
+        )
+
+    def solve(self) -> MatchupSolution:
+        # 1. Games and tiebreaks do not depend on the set score: solve them once
+        self.games = [self._race_outcomes(lambda k, s=s: s, 4) for s in (0, 1)]
+        self.tiebreaks = [
+            self._race_outcomes(lambda k, f=f: tiebreak_server(k, f), 7) for f in (0, 1)
+        ]
+        self._set_memo: dict[tuple[int, int, int], tuple[np.ndarray, np.ndarray]] = {}
+        self.sets = [self._set(0, 0, s) for s in (0, 1)]
+
+        # 2. Match from 0-0 in sets, p1 serving first
+        self._match_memo: dict[tuple[int, int, int], tuple[np.ndarray, ...]] = {}
+        win, won_stats, all_stats, straight = self._match(0, 0, 0)
+
+        lost = 1 - win
+        return MatchupSolution(
+            p1_win=win,
+            stats_if_p1_wins=_conditional(won_stats, win[:, None, None]),
+            stats_if_p2_wins=_conditional(all_stats - won_stats, lost[:, None, None]),
+            straight_sets=np.stack(
+                [_conditional(straight[:, 0], win), _conditional(straight[:, 1], lost)],
+                axis=1,
+            ),
+        )
+
+    # ==================== GAMES / TIEBREAKS ====================
+
+    def _race_outcomes(
+        self, server_of: Callable[..., int], target: int
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        A game or tiebreak: per winner w, (P(w wins), E[stats * 1{w wins}]).
+        Only the ace and double fault rows are filled here.
+        """
+        memo: dict[tuple[int, int], _RaceValue] = {}
+        win, won_events, all_events = self._race(0, 0, server_of, target, memo)
+        outcomes = []
+        for prob, events in ((win, won_events), (1 - win, all_events - won_events)):
+            stats = np.zeros((self.n, _N_STATS, 2))
+            stats[:, ACES : DOUBLE_FAULTS + 1, :] = events
+            outcomes.append((prob, stats))
+        return outcomes
+
+    def _race(
+        self,
+        a: int,
+        b: int,
+        server_of: Callable[..., int],
+        target: int,
+        memo: dict[tuple[int, int], _RaceValue],
+    ) -> _RaceValue:
+        """
+        From p1 points a, p2 points b, first to target by two:
+        (P(p1 wins), E[events * 1{p1 wins}], E[events]) with events (n, 2, 2)
+        = [ace, double fault] x [p1, p2]. Same recursion as sim_core.TiebreakTable.
+        """
+        if max(a, b) >= target and abs(a - b) >= 2:
+            zeros = np.zeros((self.n, 2, 2))
+            return np.full(self.n, float(a > b)), zeros, zeros
+        if max(a, b) >= _MAX_RACE_POINTS:
+            zeros = np.zeros((self.n, 2, 2))
+            return np.full(self.n, 0.5), zeros, zeros
+        cached = memo.get((a, b))
+        if cached is not None:
+            return cached
+
+        srv = server_of(a + b)
+        p_ace, p_df, p_won = self.rates[:, srv]
+        server_up = (a + 1, b) if srv == 0 else (a, b + 1)
+        server_down = (a, b + 1) if srv == 0 else (a + 1, b)
+        win_up, won_up, all_up = self._race(*server_up, server_of, target, memo)
+        win_down, won_down, all_down = self._race(*server_down, server_of, target, memo)
+
+        up, down = p_won[:, None, None], (1 - p_won)[:, None, None]
+        win = p_won * win_up + (1 - p_won) * win_down
+        won_events = up * won_up + down * won_down
+        all_events = up * all_up + down * all_down
+        # An ace always wins the point, a double fault always loses it
+        won_events[:, 0, srv] += p_ace * win_up
+        won_events[:, 1, srv] += p_df * win_down
+        all_events[:, 0, srv] += p_ace
+        all_events[:, 1, srv] += p_df
+
+        memo[(a, b)] = (win, won_events, all_events)
+        return memo[(a, b)]
+
+    # ==================== SETS ====================
+
+    def _set(self, g1: int, g2: int, server: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        From games g1-g2 with `server` to serve:
+        (P(outcome), E[stats * 1{outcome}]) over the 4 set outcomes,
+        shapes (n, 4) and (n, 4, 6, 2).
+        """
+        cached = self._set_memo.get((g1, g2, server))
+        if cached is not None:
+            return cached
+
+        probs = np.zeros((self.n, _N_SET_OUTCOMES))
+        stats = np.zeros((self.n, _N_SET_OUTCOMES, _N_STATS, 2))
+        if g1 == 6 and g2 == 6:
+            # The tiebreak counts as one game; the receiver serves next set
+            for w, (q, joint) in enumerate(self.tiebreaks[server]):
+                joint = joint.copy()
+                joint[:, GAMES_WON, w] += q
+                joint[:, SETS_WON, w] += q
+                outcome = 2 * w + (1 - server)
+                probs[:, outcome] += q
+                stats[:, outcome] += joint
+        else:
+            for w, (q, joint) in enumerate(self.games[server]):
+                joint = joint.copy()
+                joint[:, GAMES_WON, w] += q
+                if w != server:
+                    joint[:, BREAKS, w] += q
+                n1, n2 = (g1 + 1, g2) if w == 0 else (g1, g2 + 1)
+                won, lost = (n1, n2) if w == 0 else (n2, n1)
+                if won >= 6 and won - lost >= 2:
+                    joint[:, SETS_WON, w] += q
+                    if lost == 0:
+                        joint[:, CLEAN_SETS, w] += q
+                    outcome = 2 * w + (1 - server)
+                    probs[:, outcome] += q
+                    stats[:, outcome] += joint
+                else:
+                    next_probs, next_stats = self._set(n1, n2, 1 - server)
+                    probs += q[:, None] * next_probs
+                    stats += (
+                        joint[:, None] * next_probs[:, :, None, None]
+                        + q[:, None, None, None] * next_stats
+                    )
+
+        self._set_memo[(g1, g2, server)] = (probs, stats)
+        return probs, stats
+
+    # ==================== MATCH ====================
+
+    def _match(self, s1: int, s2: int, server: int) -> tuple[np.ndarray, ...]:
+        """
+        From sets s1-s2 with `server` opening the next set:
+        (P(p1 wins), E[stats * 1{p1 wins}], E[stats],
+         P(each player wins in straight sets) of shape (n, 2)).
+        """
+        if s1 == self.sets_to_win or s2 == self.sets_to_win:
+            zeros = np.zeros((self.n, _N_STATS, 2))
+            straight = np.zeros((self.n, 2))
+            straight[:, 0] = s1 == self.sets_to_win and s2 == 0
+            straight[:, 1] = s2 == self.sets_to_win and s1 == 0
+            return (
+                np.full(self.n, float(s1 == self.sets_to_win)),
+                zeros,
+                zeros,
+                straight,
+            )
+        cached = self._match_memo.get((s1, s2, server))
+        if cached is not None:
+            return cached
+
+        win = np.zeros(self.n)
+        won_stats = np.zeros((self.n, _N_STATS, 2))
+        all_stats = np.zeros((self.n, _N_STATS, 2))
+        straight = np.zeros((self.n, 2))
+        set_probs, set_stats = self.sets[server]
+        for outcome in range(_N_SET_OUTCOMES):
+            w, next_server = divmod(outcome, 2)
+            q, joint = set_probs[:, outcome], set_stats[:, outcome]
+            n_win, n_won, n_all, n_straight = self._match(
+                s1 + (w == 0), s2 + (w == 1), next_server
+            )
+            win += q * n_win
+            won_stats += joint * n_win[:, None, None] + q[:, None, None] * n_won
+            all_stats += joint + q[:, None, None] * n_all
+            straight += q[:, None] * n_straight
+
+        self._match_memo[(s1, s2, server)] = (win, won_stats, all_stats, straight)
+        return self._match_memo[(s1, s2, server)]
+
+
+def _conditional(joint: np.ndarray, prob: np.ndarray) -> np.ndarray:
+    """E[x * 1{A}] / P(A), 0 where A is impossible"""
+    out: np.ndarray = np.divide(joint, prob, out=np.zeros_like(joint), where=prob > 0)
+    return out
+
+
+# ==================== HEAD-TO-HEAD CACHE ====================
+
+# (P(a beats b), E[DK | a wins], E[DK | a loses], E[DK | b wins], E[DK | b loses])
+HeadToHead = tuple[float, float, float, float, float]
+
+_MAX_CACHED_PAIRS = 100_000
+_h2h_cache: "OrderedDict[tuple[ServeProbs, ServeProbs, int], HeadToHead]" = (
+    OrderedDict()
+)
+_h2h_lookups = {"hits": 0, "misses": 0}
+register_cache("head_to_head", lambda: (_h2h_lookups["hits"], _h2h_lookups["misses"]))
+
+
+def head_to_head(
+    pairs: Sequence[tuple[ServeProbs, ServeProbs]], sets_to_win: int = 2
+) -> np.ndarray:
+    """
+    Coin-toss-for-serve head-to-heads, shape (len(pairs), 5) in HeadToHead order.
+
+    Each (a's serve vs b, b's serve vs a) pair is solved once and memoized;
+    pairs not seen before are solved together in one vectorized pass.
+    """
+    keys = [(a, b, sets_to_win) for a, b in pairs]
+    missing = list(dict.fromkeys(k for k in keys if k not in _h2h_cache))
+    _h2h_lookups["hits"] += len(keys) - len(missing)
+    _h2h_lookups["misses"] += len(missing)
+    if missing:
+        for key, row in zip(
+            missing, _solve_head_to_heads(missing, sets_to_win), strict=False
+        ):
+            _h2h_cache[key] = tuple(row)
+        while len(_h2h_cache) > _MAX_CACHED_PAIRS:
+            _h2h_cache.popitem(last=False)
+
+    out = np.empty((len(keys), 5))
+    for i, key in enumerate(keys):
+        out[i] = _h2h_cache[key]
+        _h2h_cache.move_to_end(key)
+    return out
+
+
+def _solve_head_to_heads(
+    keys: list[tuple[ServeProbs, ServeProbs, int]], sets_to_win: int
+) -> np.ndarray:
+    """Both serve orders of every pair in one solve, averaged for the coin toss"""
+    a = stack_serve_probs([k[0] for k in keys])
+    b = stack_serve_probs([k[1] for k in keys])
+    n = len(keys)
+    both = solve_matchups(
+        ServeProbs._make(np.concatenate(f) for f in zip(a, b, strict=False)),
+        ServeProbs._make(np.concatenate(f) for f in zip(b, a, strict=False)),
+        sets_to_win,
+    )
+    calc = DKScoringCalculator("BEST_OF_3" if sets_to_win == 2 else "BEST_OF_5")
+
+    # Per solved row: p1's and p2's expected DK points, given a win and a loss
+    p1_if_won = np.asarray(calc.expected_score(both.player_stats(0, won=True)))
+    p1_if_lost = np.asarray(calc.expected_score(both.player_stats(0, won=False)))
+    p2_if_won = np.asarray(calc.expected_score(both.player_stats(1, won=True)))
+    p2_if_lost = np.asarray(calc.expected_score(both.player_stats(1, won=False)))
+
+    # Rows [:n] have a serving first (a is p1), rows [n:] have b serving first
+    a_first, b_first = slice(0, n), slice(n, 2 * n)
+    p_a_first = both.p1_win[a_first]
+    p_b_first = 1 - both.p1_win[b_first]
+    p_a = 0.5 * (p_a_first + p_b_first)
+
+    def mix(
+        a_first_pts: np.ndarray,
+        b_first_pts: np.ndarray,
+        weight_a_first: np.ndarray,
+        weight_b_first: np.ndarray,
+        total: np.ndarray,
+    ) -> np.ndarray:
+        # E[points | outcome], mixing both serve orders by P(outcome, order)
+        joint = 0.5 * (weight_a_first * a_first_pts + weight_b_first * b_first_pts)
+        return _conditional(joint, total)
+
+    a_won = mix(p1_if_won[a_first], p2_if_won[b_first], p_a_first, p_b_first, p_a)
+    a_lost = mix(
+        p1_if_lost[a_first], p2_if_lost[b_first], 1 - p_a_first, 1 - p_b_first, 1 - p_a
+    )
+    b_won = mix(
+        p2_if_won[a_first], p1_if_won[b_first], 1 - p_a_first, 1 - p_b_first, 1 - p_a
+    )
+    b_lost = mix(p2_if_lost[a_first], p1_if_lost[b_first], p_a_first, p_b_first, p_a)
+    return np.stack([p_a, a_won, a_lost, b_won, b_lost], axis=1)
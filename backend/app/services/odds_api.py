@@ -1,45 +1,202 @@
-from sqlmodel import Session, select
-from datetime import datetime, timedelta
 import random
-from app.models.tennis import Match
-from app.services.data import PLAYERS_DB
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
 
+import numpy as np
 import structlog
+from sqlmodel import Session, col, func, select
+
+from app.models.tennis import Match
+from app.services.data import PLAYERS_DB
+from app.services.pricing import devig, implied_probabilities
 
 logger = structlog.get_logger()
 
-async def update_live_odds(session: Session):
+# Only matches inside this window are "live" for the odds refresher.
+# Anything older is history and is never loaded again.
+ACTIVE_WINDOW_BEFORE = timedelta(hours=6)  # Started recently, may still be in play
+ACTIVE_WINDOW_AFTER = timedelta(hours=48)
+MIN_ACTIVE_MATCHES = 5
+# Re-simulate only when the vig-free market probability moves at least this much
+RESIM_PROB_THRESHOLD = 0.005
+
+
+def market_probabilities(
+    odds_pairs: list[tuple[int, int]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bulk convert (p1_odds, p2_odds) pairs.
+    Returns (vig-free p1 probabilities, vigs).
+    """
+    odds = np.asarray(odds_pairs, dtype=np.float64).reshape(-1, 2)
+    q1 = implied_probabilities(odds[:, 0])
+    q2 = implied_probabilities(odds[:, 1])
+    fair_p1, _ = devig(q1, q2)
+    return fair_p1, q1 + q2 - 1.0
+
+
+def active_window(now: datetime) -> tuple[datetime, datetime]:
+    return now - ACTIVE_WINDOW_BEFORE, now + ACTIVE_WINDOW_AFTER
+
+
+def count_active_matches(session: Session, now: datetime) -> int:
+    """Matches the odds refresher tracks (same filter as load_active_matches)"""
+    start, end = active_window(now)
+    statement = (
+        select(func.count())
+        .select_from(Match)
+        .where(
+            Match.start_time >= start,
+            Match.start_time <= end,
+            col(Match.provider_event_id).is_not(None),
+        )
+    )
+    return session.exec(statement).one()
+
+
+def load_active_matches(session: Session, now: datetime) -> dict[str, Match]:
+    """
+    Load only the matches in the active window, keyed by provider event id.
+    """
+    start, end = active_window(now)
+    statement = select(Match).where(
+        Match.start_time >= start,
+        Match.start_time <= end,
+        col(Match.provider_event_id).is_not(None),
+    )
+    return {
+        m.provider_event_id: m
+        for m in session.exec(statement)
+        if m.provider_event_id is not None
+    }
+
+
+async def fetch_odds_events(
+    known_event_ids: list[str], n_new: int
+) -> list[dict[str, Any]]:
+    """
+    Mock odds provider.
+    Re-quotes the events we already track and lists `n_new` new ones.
+    """
+    events = []
+    odds_choices = [-150, -110, 110, 150, 200, -200]
+
+    for event_id in known_event_ids:
+        events.append(
+            {
+                "id": event_id,
+                "p1_odds": random.choice(odds_choices),
+                "p2_odds": random.choice(odds_choices),
+            }
+        )
+
+    player_names = list(PLAYERS_DB.keys())
+    for _ in range(n_new):
+        p1, p2 = random.sample(player_names, 2)
+        events.append(
+            {
+                "id": f"mock-{uuid.uuid4().hex[:12]}",
+                "player1_name": p1,
+                "player2_name": p2,
+                "start_time": datetime.now() + timedelta(hours=random.randint(1, 48)),
+                "surface": random.choice(["hard", "clay", "grass"]),
+                "p1_odds": random.choice(odds_choices),
+                "p2_odds": random.choice(odds_choices),
+            }
+        )
+    return events
+
+
+async def update_live_odds(session: Session) -> dict[str, list[uuid.UUID]]:
     """
-    Mock implementation that generates realistic test matches.
+    Refresh odds for the active slate.
+
+    Memory and query cost depend on the size of the active window,
+    not on how many matches have accumulated in the table.
+    Returns the ids of created and re-priced matches, and the ids that
+    need a new simulation (new matches, or the market moved).
     """
     logger.info("Fetching/Generating live odds")
-    
-    # 1. Clean up old matches (optional, for demo)
-    
-    # 2. Generate new matches if not enough exist
-    existing_matches = session.exec(select(Match)).all()
-    if len(existing_matches) < 5:
-        logger.info("Generating mock matches", existing_count=len(existing_matches))
-        player_names = list(PLAYERS_DB.keys())
-        
-        for i in range(3): # Create 3 matches
-            p1 = random.choice(player_names)
-            p2 = random.choice(player_names)
-            while p1 == p2:
-                p2 = random.choice(player_names)
-                
+    now = datetime.now()
+
+    # 1. Decide how many new events the (mock) feed should list
+    active_count = count_active_matches(session, now)
+    n_new = max(0, MIN_ACTIVE_MATCHES - active_count)
+    if n_new:
+        logger.info("Generating mock matches", active_count=active_count, n_new=n_new)
+
+    # 2. Load the active slate keyed by provider id
+    active = load_active_matches(session, now)
+    events = await fetch_odds_events(list(active.keys()), n_new)
+
+    # 3. Events that left the window (e.g. rescheduled) are looked up by id only
+    missing_ids = [e["id"] for e in events if e["id"] not in active]
+    if missing_ids:
+        statement = select(Match).where(col(Match.provider_event_id).in_(missing_ids))
+        active.update(
+            {
+                m.provider_event_id: m
+                for m in session.exec(statement)
+                if m.provider_event_id is not None
+            }
+        )
+
+    # 4. Price everything in one pass: stored prices vs incoming prices
+    quoted = [(e, active.get(e["id"])) for e in events]
+    quoted = [(e, m) for e, m in quoted if m is not None or "player1_name" in e]
+    new_fair, new_vig = market_probabilities(
+        [(e["p1_odds"], e["p2_odds"]) for e, _ in quoted]
+    )
+    old_fair, _ = market_probabilities(
+        [
+            (m.p1_odds, m.p2_odds) if m is not None else (e["p1_odds"], e["p2_odds"])
+            for e, m in quoted
+        ]
+    )
+
+    # 5. Upsert and diff
+    created: list[uuid.UUID] = []
+    updated: list[uuid.UUID] = []
+    resimulate: list[uuid.UUID] = []
+    for (event, match), fair, old, vig in zip(
+        quoted, new_fair, old_fair, new_vig, strict=False
+    ):
+        if match is None:
             match = Match(
-                player1_name=p1,
-                player2_name=p2,
-                start_time=datetime.now() + timedelta(hours=random.randint(1, 48)),
-                surface=random.choice(["hard", "clay", "grass"]),
-                p1_odds=random.choice([-150, -110, 110, 150, 200, -200]),
-                p2_odds=random.choice([-150, -110, 110, 150, 200, -200]),
+                provider_event_id=event["id"],
+                player1_name=event["player1_name"],
+                player2_name=event["player2_name"],
+                start_time=event["start_time"],
+                surface=event["surface"],
+                p1_odds=event["p1_odds"],
+                p2_odds=event["p2_odds"],
+                market_vig=float(vig),
+            )
+            session.add(match)
+            created.append(match.id)
+            resimulate.append(match.id)
+            logger.info(
+                "Created mock match", p1=match.player1_name, p2=match.player2_name
             )
+        elif (match.p1_odds, match.p2_odds) != (event["p1_odds"], event["p2_odds"]):
+            match.p1_odds = event["p1_odds"]
+            match.p2_odds = event["p2_odds"]
+            match.market_vig = float(vig)
             session.add(match)
-            logger.info("Created mock match", match_index=i+1, p1=p1, p2=p2)
-        
-        session.commit()
-        logger.info("Mock matches cleanup complete")
-    else:
-        logger.info("Matches already exist, skipping generation", count=len(existing_matches))
+            updated.append(match.id)
+            if (
+                abs(fair - old) >= RESIM_PROB_THRESHOLD
+                or match.last_simulated_at is None
+            ):
+                resimulate.append(match.id)
+
+    session.commit()
+    logger.info(
+        "Odds refresh complete",
+        active=len(active),
+        created=len(created),
+        updated=len(updated),
+        resimulate=len(resimulate),
+    )
+    return {"created": created, "updated": updated, "resimulate": resimulate}
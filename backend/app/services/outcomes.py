@@ -0,0 +1,227 @@
+"""
+Joint per-sim match outcomes, kept for reuse.
+
+A simulation run reduced to per-player averages loses the fact that the two
+opponents' fantasy points are strongly anti-correlated. An outcome matrix
+keeps one compact record per simulated match with both players' raw stats
+(int16) and fantasy points (float32), side by side, about 30 bytes per sim.
+Lineup construction, contest simulation and correlation reports read it back
+instead of re-simulating; tally_from_outcomes rebuilds a MatchTally, so any
+scoring rule can rescore the same worlds.
+
+Matrices live in an OutcomeStore: .npy files read back memory-mapped, or
+Redis blobs with a TTL (settings.OUTCOME_STORE). Stored outcomes are only
+as good as the player stats they were simulated from: publishing a new
+stats version clears the store, and a re-simulation either replaces a
+matchup's matrix or deletes it.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.services.sim_core import MatchTally
+
+# One record per simulated match; (2,) fields are [p1, p2]
+OUTCOME_DTYPE = np.dtype(
+    [
+        ("winner", "i1"),
+        ("aces", "i2", (2,)),
+        ("double_faults", "i2", (2,)),
+        ("breaks", "i2", (2,)),
+        ("games_won", "i2", (2,)),
+        ("sets_won", "i2", (2,)),
+        ("clean_sets", "i2", (2,)),
+        ("fantasy_points", "f4", (2,)),
+    ]
+)
+
+_TALLY_FIELDS = (
+    "aces",
+    "double_faults",
+    "breaks",
+    "games_won",
+    "sets_won",
+    "clean_sets",
+)
+
+
+def outcome_matrix(tally: MatchTally, points: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    A batched MatchTally and both players' fantasy points per sim
+    -> (n_sims,) OUTCOME_DTYPE records.
+    """
+    winner = np.asarray(tally.winner)
+    matrix = np.empty(len(winner), dtype=OUTCOME_DTYPE)
+    matrix["winner"] = winner
+    for name in _TALLY_FIELDS:
+        matrix[name] = np.asarray(getattr(tally, name)).T
+    matrix["fantasy_points"] = np.column_stack(points)
+    return matrix
+
+
+def tally_from_outcomes(matrix: np.ndarray) -> MatchTally:
+    """The batched MatchTally behind an outcome matrix, for rescoring"""
+    fields = {name: matrix[name].T.astype(np.int64) for name in _TALLY_FIELDS}
+    return MatchTally(winner=matrix["winner"].astype(np.int64), **fields)
+
+
+def points_correlation(matrix: np.ndarray) -> float:
+    """Pearson correlation of the two players' fantasy points across sims"""
+    points = matrix["fantasy_points"].astype(np.float64)
+    if len(points) < 2 or np.any(points.std(axis=0) == 0):
+        return 0.0
+    return float(np.corrcoef(points[:, 0], points[:, 1])[0, 1])
+
+
+def matchup_key(
+    player1_name: str,
+    player2_name: str,
+    surface: str,
+    sets_to_win: int,
+    variant: str = "",
+) -> str:
+    """
+    Store key for one matchup's pre-match outcomes, shared by the worker and
+    the API. variant tells apart runs that are not plain pre-match sims
+    (e.g. a live start state).
+    """
+    raw = "|".join(
+        [player1_name, player2_name, surface.lower(), str(sets_to_win), variant]
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class OutcomeStore(ABC):
+    """Save and load outcome matrices by key"""
+
+    # Reuse lookups (load_sims) across every store, for the cache metrics
+    lookups = {"hits": 0, "misses": 0}
+
+    @abstractmethod
+    def save(self, key: str, matrix: np.ndarray) -> None: ...
+
+    @abstractmethod
+    def load(self, key: str) -> np.ndarray | None:
+        """The stored matrix, or None"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Forget one matrix (no error when there is none)"""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Forget every matrix; returns how many were stored"""
+
+    def load_sims(self, key: str, n_sims: int) -> np.ndarray | None:
+        """The first n_sims stored sims, or None when fewer are stored"""
+        matrix = self.load(key)
+        if matrix is None or len(matrix) < n_sims:
+            OutcomeStore.lookups["misses"] += 1
+            return None
+        OutcomeStore.lookups["hits"] += 1
+        return matrix[:n_sims]
+
+
+register_cache(
+    "outcome_store",
+    lambda: (OutcomeStore.lookups["hits"], OutcomeStore.lookups["misses"]),
+)
+
+
+class FileOutcomeStore(OutcomeStore):
+    """
+    One .npy file per key. Loads are memory-mapped, so readers share the
+    page cache and only touch the sims they use.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def save(self, key: str, matrix: np.ndarray) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a reader never maps a half-written file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, key: str) -> np.ndarray | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        matrix: np.ndarray = np.load(path, mmap_mode="r")
+        return matrix
+
+    def delete(self, key: str) -> None:
+        # Readers that already mapped the file keep their pages
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        paths = list(self.directory.glob("*.npy"))
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
+
+
+class RedisOutcomeStore(OutcomeStore):
+    """One .npy blob per key, expiring after ttl_seconds"""
+
+    PREFIX = "sim_outcomes:"
+
+    def __init__(self, client: Any, ttl_seconds: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def save(self, key: str, matrix: np.ndarray) -> None:
+        buf = io.BytesIO()
+        np.save(buf, matrix)
+        self.client.set(self.PREFIX + key, buf.getvalue(), ex=self.ttl_seconds)
+
+    def load(self, key: str) -> np.ndarray | None:
+        blob = self.client.get(self.PREFIX + key)
+        if blob is None:
+            return None
+        matrix: np.ndarray = np.load(io.BytesIO(blob))
+        return matrix
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.PREFIX + key)
+
+    def clear(self) -> int:
+        keys = list(self.client.scan_iter(match=self.PREFIX + "*", count=1000))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+
+@lru_cache(maxsize=1)
+def get_outcome_store() -> OutcomeStore | None:
+    """The configured store, or None when persistence is off"""
+    if settings.OUTCOME_STORE == "file":
+        return FileOutcomeStore(settings.OUTCOME_DIR)
+    if settings.OUTCOME_STORE == "redis":
+        import redis
+
+        return RedisOutcomeStore(
+            redis.Redis.from_url(settings.OUTCOME_REDIS_URL),
+            settings.OUTCOME_TTL_SECONDS,
+        )
+    return None
@@ -0,0 +1,69 @@
+import uuid
+from collections.abc import Sequence
+
+from sqlmodel import Session, col, func, select
+
+from app.models.tennis import Player, PlayerStats
+from app.services.data import PLAYERS_DB
+from app.services.sim_engine import PlayerProfile
+
+
+def load_player_profile(name: str, surface: str = "hard") -> PlayerProfile | None:
+    """
+    Build a simulation PlayerProfile from PLAYERS_DB.
+    Falls back to hard-court stats when the surface is missing.
+    """
+    entry = PLAYERS_DB.get(name)
+    if not entry:
+        return None
+
+    stats = entry["stats"].get(surface.lower(), entry["stats"]["hard"])
+    return PlayerProfile(
+        name=entry["name"],
+        serve_1_in_pct=stats["serve_1_in"],
+        serve_1_won_pct=stats["serve_1_won"],
+        serve_2_won_pct=stats["serve_2_won"],
+        ace_pct=stats["ace_rate"],
+        df_pct=stats["df_rate"],
+        return_won_pct=stats["return_won"],
+    )
+
+
+def load_player_profiles(
+    session: Session, player_ids: Sequence[uuid.UUID], surface: str = "hard"
+) -> dict[uuid.UUID, PlayerProfile]:
+    """
+    Build PlayerProfiles for DB players in one query.
+    Uses the surface's PlayerStats row, falling back to the "All" row;
+    players with neither are left out. Elo is the surface rating, or the
+    overall one.
+    """
+    statement = (
+        select(Player, PlayerStats)
+        .join(PlayerStats)
+        .where(
+            col(Player.id).in_(set(player_ids)),
+            func.lower(PlayerStats.surface).in_([surface.lower(), "all"]),
+        )
+    )
+    profiles: dict[uuid.UUID, PlayerProfile] = {}
+    for player, stats in session.exec(statement).all():
+        if player.id in profiles and stats.surface.lower() == "all":
+            continue
+        surface_elo = {
+            "hard": player.elo_hard,
+            "clay": player.elo_clay,
+            "grass": player.elo_grass,
+        }
+        profiles[player.id] = PlayerProfile(
+            name=player.name,
+            serve_1_in_pct=stats.serve_1_in_pct,
+            serve_1_won_pct=stats.serve_1_won_pct,
+            serve_2_won_pct=stats.serve_2_won_pct,
+            ace_pct=stats.ace_pct,
+            df_pct=stats.df_pct,
+            # Scraped serve stats leave return points unset
+            return_won_pct=stats.return_won_pct or PlayerProfile.return_won_pct,
+            elo=surface_elo.get(surface.lower()) or player.elo_overall,
+        )
+    return profiles
@@ -0,0 +1,623 @@
+"""
+Shared tennis simulation core.
+
+A point model turns a (server, returner) pair into ServeProbs, the five
+conditional probabilities of one service point. Everything above the point
+(games, tiebreaks, sets, serve rotation, resuming from a score, counting
+stats) lives here once:
+
+- MatchCore plays one match at a time and can resume from any MatchState.
+- simulate_batch plays n matches in lockstep with NumPy.
+
+Both return a MatchTally, which scoring rules (DK classic, the simple
+fantasy table, ...) turn into points. sim_engine.TennisMatchSimulator and
+the DK engine in services/sims are thin adapters over this module.
+"""
+
+import copy
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    Protocol,
+)
+
+import numpy as np
+
+from app.core.metrics import register_lru_cache
+from app.services.sim_types import (  # noqa: F401 (re-exported)
+    MatchState,
+    ScoreState,
+    validate_state,
+)
+
+if TYPE_CHECKING:
+    from app.services.sim_engine import PlayerProfile
+
+# Point outcomes (same order as sims PointEvent, so they double as log codes)
+ACE, DOUBLE_FAULT, SERVER_WIN, RETURNER_WIN = range(4)
+
+# Rallies beyond this many tiebreak points each are negligible; the
+# tiebreak recursion stops there.
+_MAX_TIEBREAK_POINTS = 30
+
+
+class ServeProbs(NamedTuple):
+    """One player's service point, as conditional probabilities"""
+
+    first_in: float
+    ace: float  # P(ace | first serve in)
+    won_1st: float  # P(server wins | first serve in, not an ace)
+    df: float  # P(double fault | first serve missed)
+    won_2nd: float  # P(server wins | second serve in)
+
+    @property
+    def point_win(self) -> float:
+        """P(server wins the point)"""
+        return (
+            self.first_in * (self.ace + (1.0 - self.ace) * self.won_1st)
+            + (1.0 - self.first_in) * (1.0 - self.df) * self.won_2nd
+        )
+
+
+class PointModel(Protocol):
+    """A plain function or a callable object such as elo.EloBlend"""
+
+    def __call__(self, server: Any, returner: Any) -> ServeProbs: ...
+
+
+ScoringRule = Callable[[dict[str, Any]], Any]
+
+
+# ==================== POINT MODELS ====================
+
+
+def adjusted_rally(server: "PlayerProfile", returner: "PlayerProfile") -> ServeProbs:
+    """
+    Tennis Abstract rates (aces and DFs per service point), with rallies
+    averaged against the returner: (serve won% + (1 - return won%)) / 2.
+    """
+    ace = (
+        min(1.0, server.ace_pct / server.serve_1_in_pct)
+        if server.serve_1_in_pct > 0
+        else 0.0
+    )
+    first_fault_pct = 1.0 - server.serve_1_in_pct
+    df = min(1.0, server.df_pct / first_fault_pct) if first_fault_pct > 0 else 0.0
+    return ServeProbs(
+        first_in=min(1.0, server.serve_1_in_pct),
+        ace=ace,
+        won_1st=(server.serve_1_won_pct + (1.0 - returner.return_won_pct)) / 2,
+        df=df,
+        won_2nd=(server.serve_2_won_pct + (1.0 - returner.return_won_pct)) / 2,
+    )
+
+
+def raw_serve_won(server: Any, returner: Any) -> ServeProbs:
+    """
+    DK player rates taken as-is (already conditional); the returner is ignored.
+    `server` is a sims Player (or anything with the same fields).
+    """
+    return ServeProbs(
+        first_in=server.first_serve_in_pct,
+        ace=server.ace_rate_per_serve,
+        won_1st=server.first_serve_points_won_pct,
+        df=server.df_rate_per_serve,
+        won_2nd=server.second_serve_points_won_pct,
+    )
+
+
+POINT_MODELS: dict[str, PointModel] = {
+    "adjusted_rally": adjusted_rally,
+    "raw_serve_won": raw_serve_won,
+}
+
+
+def draw_point(probs: ServeProbs) -> int:
+    """Play one service point; returns ACE, DOUBLE_FAULT, SERVER_WIN or RETURNER_WIN"""
+    if random.random() < probs.first_in:
+        if random.random() < probs.ace:
+            return ACE
+        return SERVER_WIN if random.random() < probs.won_1st else RETURNER_WIN
+    if random.random() < probs.df:
+        return DOUBLE_FAULT
+    return SERVER_WIN if random.random() < probs.won_2nd else RETURNER_WIN
+
+
+def tiebreak_server(points_played: int, first_server: int) -> int:
+    """Server of the next tiebreak point: A, B, B, A, A, B, B, ..."""
+    return first_server if ((points_played + 1) // 2) % 2 == 0 else 1 - first_server
+
+
+def tiebreak_over(a: int, b: int) -> bool:
+    return max(a, b) >= 7 and abs(a - b) >= 2
+
+
+# ==================== TALLY ====================
+
+
+@dataclass
+class MatchTally:
+    """
+    Raw counts for one match (two-item lists) or for n matches at once
+    (arrays of shape (2, n)). Index 0 is p1, 1 is p2.
+    winner: 0/1 once decided, -1 while the match is in progress.
+    """
+
+    aces: Any = field(default_factory=lambda: [0, 0])
+    double_faults: Any = field(default_factory=lambda: [0, 0])
+    breaks: Any = field(default_factory=lambda: [0, 0])
+    games_won: Any = field(default_factory=lambda: [0, 0])
+    sets_won: Any = field(default_factory=lambda: [0, 0])
+    clean_sets: Any = field(default_factory=lambda: [0, 0])  # Sets won 6-0
+    winner: Any = -1
+
+    @property
+    def games_lost(self) -> Any:
+        return self.games_won[::-1]
+
+    @property
+    def sets_lost(self) -> Any:
+        return self.sets_won[::-1]
+
+    @property
+    def sets_played(self) -> Any:
+        return self.sets_won[0] + self.sets_won[1]
+
+    def player_stats(self, idx: int) -> dict[str, Any]:
+        """One player's stats, the input every ScoringRule takes"""
+        match_won = self.winner == idx
+        sets_lost = self.sets_won[1 - idx]
+        return {
+            "aces": self.aces[idx],
+            "double_faults": self.double_faults[idx],
+            "breaks": self.breaks[idx],
+            "games_won": self.games_won[idx],
+            "games_lost": self.games_won[1 - idx],
+            "sets_won": self.sets_won[idx],
+            "sets_lost": sets_lost,
+            "clean_sets": self.clean_sets[idx],
+            "match_won": match_won,
+            "straight_sets_win": match_won & (sets_lost == 0),
+        }
+
+    def fantasy_points(self, rule: ScoringRule) -> tuple[Any, Any]:
+        """(p1 points, p2 points) under a scoring rule"""
+        return rule(self.player_stats(0)), rule(self.player_stats(1))
+
+
+def stack_tallies(tallies: Sequence[MatchTally]) -> MatchTally:
+    """n single-match tallies -> one MatchTally of (2, n) arrays"""
+
+    def column(name: str) -> np.ndarray:
+        return (
+            np.array([getattr(t, name) for t in tallies], dtype=np.int64)
+            .reshape(-1, 2)
+            .T
+        )
+
+    return MatchTally(
+        aces=column("aces"),
+        double_faults=column("double_faults"),
+        breaks=column("breaks"),
+        games_won=column("games_won"),
+        sets_won=column("sets_won"),
+        clean_sets=column("clean_sets"),
+        winner=np.array([t.winner for t in tallies], dtype=np.int64),
+    )
+
+
+# ==================== SCALAR CORE ====================
+
+
+class MatchCore:
+    """
+    Point-by-point simulation of one match at a time.
+
+    on_point(server_idx, outcome) and on_set_start() are optional hooks for
+    callers that keep a point log; the tally is always kept.
+    """
+
+    def __init__(
+        self,
+        p1: ServeProbs,
+        p2: ServeProbs,
+        sets_to_win: int = 2,
+        on_point: Callable[[int, int], None] | None = None,
+        on_set_start: Callable[[], None] | None = None,
+    ):
+        self.serve = (p1, p2)
+        self.sets_to_win = sets_to_win
+        self.on_point = on_point
+        self.on_set_start = on_set_start
+        self.tally = MatchTally()
+
+    def play_point(self, server_idx: int) -> int:
+        outcome = draw_point(self.serve[server_idx])
+        if outcome == ACE:
+            self.tally.aces[server_idx] += 1
+        elif outcome == DOUBLE_FAULT:
+            self.tally.double_faults[server_idx] += 1
+        if self.on_point is not None:
+            self.on_point(server_idx, outcome)
+        return outcome
+
+    def play_game(self, server_idx: int, s_points: int = 0, r_points: int = 0) -> int:
+        """
+        A service game, optionally from a score in progress.
+        Returns: 0 if p1 wins, 1 if p2 wins
+        """
+        while True:
+            if self.play_point(server_idx) in (ACE, SERVER_WIN):
+                s_points += 1
+            else:
+                r_points += 1
+
+            if s_points >= 4 and s_points >= r_points + 2:
+                self.tally.games_won[server_idx] += 1
+                return server_idx
+            if r_points >= 4 and r_points >= s_points + 2:
+                # Returner broke serve
+                self.tally.games_won[1 - server_idx] += 1
+                self.tally.breaks[1 - server_idx] += 1
+                return 1 - server_idx
+
+    def play_tiebreak(
+        self, first_server_idx: int = 0, p1_points: int = 0, p2_points: int = 0
+    ) -> int:
+        """
+        First to 7, win by 2, optionally from a score in progress.
+        first_server_idx: who served the first point of the tiebreak.
+        Returns: 0 if p1 wins, 1 if p2 wins
+        """
+        points = [p1_points, p2_points]
+        while not tiebreak_over(*points):
+            server_idx = tiebreak_server(points[0] + points[1], first_server_idx)
+            server_won = self.play_point(server_idx) in (ACE, SERVER_WIN)
+            points[server_idx if server_won else 1 - server_idx] += 1
+
+        winner_idx = 0 if points[0] > points[1] else 1
+        self.tally.games_won[winner_idx] += 1  # TB counts as a game won
+        return winner_idx
+
+    def play_set(
+        self,
+        start_server_idx: int,
+        p1_games: int = 0,
+        p2_games: int = 0,
+        p1_points: int = 0,
+        p2_points: int = 0,
+    ) -> tuple[int, int]:
+        """
+        A set, optionally from a score in progress.
+        start_server_idx: server of the next point to be played.
+        Returns: (winner_idx, next_set_start_server_idx)
+        """
+        if self.on_set_start is not None:
+            self.on_set_start()
+        games = [p1_games, p2_games]
+        server_idx = start_server_idx
+
+        while True:
+            # Tiebreak at 6-6 (possibly already under way)
+            if games[0] == 6 and games[1] == 6:
+                played = p1_points + p2_points
+                tb_first = (
+                    server_idx if tiebreak_server(played, 0) == 0 else 1 - server_idx
+                )
+                winner_idx = self.play_tiebreak(tb_first, p1_points, p2_points)
+                self.tally.sets_won[winner_idx] += 1
+                # The tiebreak counts as a game for the serve rotation
+                return winner_idx, 1 - tb_first
+
+            if server_idx == 0:
+                game_winner = self.play_game(server_idx, p1_points, p2_points)
+            else:
+                game_winner = self.play_game(server_idx, p2_points, p1_points)
+            p1_points = p2_points = 0
+            games[game_winner] += 1
+            server_idx = 1 - server_idx
+
+            won, lost = games[game_winner], games[1 - game_winner]
+            if won >= 6 and won >= lost + 2:
+                self.tally.sets_won[game_winner] += 1
+                if lost == 0:
+                    self.tally.clean_sets[game_winner] += 1
+                return game_winner, server_idx
+
+    def play_match(self, start_state: MatchState | None = None) -> MatchTally:
+        """
+        The entire match, or only the remainder of it from start_state.
+        Returns a fresh MatchTally (anything already played is carried over).
+        """
+        state = start_state or MatchState()  # Default: P1 serves first at 0-0
+        if state.p1_sets >= self.sets_to_win or state.p2_sets >= self.sets_to_win:
+            raise ValueError("Match is already over")
+
+        self.tally = MatchTally(
+            aces=[state.p1_aces, state.p2_aces],
+            double_faults=[state.p1_dfs, state.p2_dfs],
+            games_won=[
+                state.p1_prior_games + state.p1_games,
+                state.p2_prior_games + state.p2_games,
+            ],
+            sets_won=[state.p1_sets, state.p2_sets],
+        )
+
+        # The set in progress resumes from the given games and points
+        server_idx = state.server
+        set_score = (state.p1_games, state.p2_games, state.p1_points, state.p2_points)
+        sets = self.tally.sets_won
+        while sets[0] < self.sets_to_win and sets[1] < self.sets_to_win:
+            _, server_idx = self.play_set(server_idx, *set_score)
+            set_score = (0, 0, 0, 0)
+
+        self.tally.winner = 0 if sets[0] > sets[1] else 1
+        return self.tally
+
+
+# ==================== TIEBREAK TABLE ====================
+
+
+class TiebreakTable:
+    """
+    Exact tiebreak outcome for one matchup, per first server (0 = p1).
+
+    p1_win[f]:             P(p1 wins the tiebreak)
+    events_if_p1_wins[f]:  expected counts given p1 wins, shape
+                           (2, 2) = [ace, double fault] x [p1, p2]
+    events_if_p2_wins[f]:  same, given p2 wins
+
+    Built by dynamic programming over (p1 points, p2 points), so the batched
+    core settles a tiebreak with one draw instead of ~12 lockstep points.
+    """
+
+    def __init__(self, p1: ServeProbs, p2: ServeProbs):
+        self._outcomes = [self._point_outcomes(p1), self._point_outcomes(p2)]
+        self.p1_win = np.zeros(2)
+        self.events_if_p1_wins = np.zeros((2, 2, 2))
+        self.events_if_p2_wins = np.zeros((2, 2, 2))
+        for first in (0, 1):
+            memo: dict[tuple[int, int], tuple[float, np.ndarray, np.ndarray]] = {}
+            win, won_events, all_events = self._solve(0, 0, first, memo)
+            self.p1_win[first] = win
+            self.events_if_p1_wins[first] = won_events / win if win > 0 else 0.0
+            self.events_if_p2_wins[first] = (
+                (all_events - won_events) / (1 - win) if win < 1 else 0.0
+            )
+
+    @staticmethod
+    def _point_outcomes(probs: ServeProbs) -> tuple[float, float, float]:
+        """P(ace), P(double fault), P(server wins the point) on one serve point"""
+        return (
+            probs.first_in * probs.ace,
+            (1 - probs.first_in) * probs.df,
+            probs.point_win,
+        )
+
+    def _solve(
+        self,
+        a: int,
+        b: int,
+        first: int,
+        memo: dict[tuple[int, int], tuple[float, np.ndarray, np.ndarray]],
+    ) -> tuple[float, np.ndarray, np.ndarray]:
+        """
+        From p1 points a, p2 points b:
+        (P(p1 wins), E[events * 1{p1 wins}], E[events])
+        """
+        if tiebreak_over(a, b):
+            return float(a > b), np.zeros((2, 2)), np.zeros((2, 2))
+        if max(a, b) >= _MAX_TIEBREAK_POINTS:
+            return 0.5, np.zeros((2, 2)), np.zeros((2, 2))
+        cached = memo.get((a, b))
+        if cached is not None:
+            return cached
+
+        srv = tiebreak_server(a + b, first)
+        p_ace, p_df, p_won = self._outcomes[srv]
+        server_up = (a + 1, b) if srv == 0 else (a, b + 1)
+        server_down = (a, b + 1) if srv == 0 else (a + 1, b)
+        win_up, won_up, all_up = self._solve(*server_up, first, memo)
+        win_down, won_down, all_down = self._solve(*server_down, first, memo)
+
+        win = p_won * win_up + (1 - p_won) * win_down
+        won_events = p_won * won_up + (1 - p_won) * won_down
+        all_events = p_won * all_up + (1 - p_won) * all_down
+        # An ace always wins the point, a double fault always loses it
+        won_events[0, srv] += p_ace * win_up
+        won_events[1, srv] += p_df * win_down
+        all_events[0, srv] += p_ace
+        all_events[1, srv] += p_df
+
+        memo[(a, b)] = (win, won_events, all_events)
+        return memo[(a, b)]
+
+    def resumed(self, a: int, b: int, first: int) -> "TiebreakTable":
+        """
+        This table with the first-server-`first` entry replaced by the
+        outcome of a tiebreak in progress at a-b (p1-p2 points).
+        """
+        table = copy.copy(self)
+        table.p1_win, table.events_if_p1_wins, table.events_if_p2_wins = (
+            self.p1_win.copy(),
+            self.events_if_p1_wins.copy(),
+            self.events_if_p2_wins.copy(),
+        )
+        win, won_events, all_events = self._solve(a, b, first, {})
+        table.p1_win[first] = win
+        table.events_if_p1_wins[first] = won_events / win if win > 0 else 0.0
+        table.events_if_p2_wins[first] = (
+            (all_events - won_events) / (1 - win) if win < 1 else 0.0
+        )
+        return table
+
+
+@lru_cache(maxsize=256)
+def tiebreak_table(p1: ServeProbs, p2: ServeProbs) -> TiebreakTable:
+    """One table per matchup; repeated projections never rebuild it"""
+    return TiebreakTable(p1, p2)
+
+
+# ==================== BATCHED CORE ====================
+
+register_lru_cache("tiebreak_table", tiebreak_table)
+
+
+def simulate_batch(
+    p1: ServeProbs,
+    p2: ServeProbs,
+    n_sims: int,
+    sets_to_win: int = 2,
+    rng: np.random.Generator | None = None,
+    start_state: MatchState | None = None,
+) -> MatchTally:
+    """
+    Play n matches in lockstep: every loop iteration plays one point in
+    each unfinished match. Same rules as MatchCore, except that tiebreaks
+    are settled in one step from the matchup's TiebreakTable (winner from
+    the exact win probability, aces and double faults as Poisson counts
+    around their expected values given that winner).
+
+    start_state resumes every match from a score in progress, with what
+    was already played carried into the tally (as MatchCore.play_match).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    p_in, p_ace, p_won_1st, p_df, p_won_2nd = (
+        np.array(col) for col in zip(p1, p2, strict=False)
+    )
+    tiebreaks = tiebreak_table(p1, p2)
+    state = start_state or MatchState()
+    validate_state(state, sets_to_win)
+
+    def start(p1_value: int, p2_value: int) -> np.ndarray:
+        return np.repeat(
+            np.array([[p1_value], [p2_value]], dtype=np.int64), n_sims, axis=1
+        )
+
+    # Live score
+    server = np.full(n_sims, state.server, dtype=np.int64)
+    points = start(state.p1_points, state.p2_points)
+    games = start(state.p1_games, state.p2_games)
+
+    tally = MatchTally(
+        aces=start(state.p1_aces, state.p2_aces),
+        double_faults=start(state.p1_dfs, state.p2_dfs),
+        breaks=np.zeros((2, n_sims), dtype=np.int64),
+        games_won=start(
+            state.p1_prior_games + state.p1_games, state.p2_prior_games + state.p2_games
+        ),
+        sets_won=start(state.p1_sets, state.p2_sets),
+        clean_sets=np.zeros((2, n_sims), dtype=np.int64),
+        winner=np.zeros(n_sims, dtype=np.int64),
+    )
+
+    active = np.arange(n_sims)
+    if state.p1_games == state.p2_games == 6:
+        # Resuming inside a tiebreak: settle it from its score, like step 3
+        # below, and play on from the next set
+        played = state.p1_points + state.p2_points
+        first = state.server if tiebreak_server(played, 0) == 0 else 1 - state.server
+        w = _settle_tiebreaks(
+            tiebreaks.resumed(state.p1_points, state.p2_points, first),
+            active,
+            np.full(n_sims, first),
+            tally,
+            rng,
+        )
+        tally.games_won[w, active] += 1
+        tally.sets_won[w, active] += 1
+        games[:] = points[:] = 0
+        server[:] = 1 - first
+        match_over = tally.sets_won[w, active] == sets_to_win
+        tally.winner[match_over] = w[match_over]
+        active = active[~match_over]
+
+    while active.size:
+        # 1. Play one point in every unfinished match
+        srv = server[active]
+        u = rng.random((3, active.size))
+        first_in = u[0] < p_in[srv]
+        ace = first_in & (u[1] < p_ace[srv])
+        double_fault = ~first_in & (u[1] < p_df[srv])
+        rally_won = np.where(first_in, u[2] < p_won_1st[srv], u[2] < p_won_2nd[srv])
+        server_won = ace | (rally_won & ~double_fault)
+
+        tally.aces[srv, active] += ace
+        tally.double_faults[srv, active] += double_fault
+        point_winner = np.where(server_won, srv, 1 - srv)
+        points[point_winner, active] += 1
+
+        # 2. Close finished games
+        won = points[point_winner, active]
+        lost = points[1 - point_winner, active]
+        game_over = (won >= 4) & (won - lost >= 2)
+        if not game_over.any():
+            continue
+
+        g = active[game_over]
+        w = point_winner[game_over]
+        srv_g = srv[game_over]
+        broke = w != srv_g
+        tally.breaks[w[broke], g[broke]] += 1
+        games[w, g] += 1
+        tally.games_won[w, g] += 1
+        points[:, g] = 0
+        server[g] = 1 - srv_g
+
+        # 3. Settle tiebreaks at 6-6 (they count as one game; the player
+        # who received first in the tiebreak serves first in the next set)
+        tiebreak = (games[0, g] == 6) & (games[1, g] == 6)
+        if tiebreak.any():
+            t = g[tiebreak]
+            tb_first = server[t]
+            w[tiebreak] = _settle_tiebreaks(tiebreaks, t, tb_first, tally, rng)
+            games[w[tiebreak], t] += 1
+            tally.games_won[w[tiebreak], t] += 1
+            server[t] = 1 - tb_first
+
+        # 4. Close finished sets
+        gw = games[w, g]
+        gl = games[1 - w, g]
+        set_over = tiebreak | ((gw >= 6) & (gw - gl >= 2))
+        if not set_over.any():
+            continue
+
+        s = g[set_over]
+        sw = w[set_over]
+        tally.sets_won[sw, s] += 1
+        clean = gl[set_over] == 0
+        tally.clean_sets[sw[clean], s[clean]] += 1
+        games[:, s] = 0
+
+        # 5. Retire finished matches
+        match_over = tally.sets_won[sw, s] == sets_to_win
+        tally.winner[s[match_over]] = sw[match_over]
+        if match_over.any():
+            active = active[~np.isin(active, s[match_over])]
+
+    return tally
+
+
+def _settle_tiebreaks(
+    table: TiebreakTable,
+    sims: np.ndarray,
+    first_server: np.ndarray,
+    tally: MatchTally,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Settle tiebreaks for `sims`; adds their aces/DFs and returns the winners"""
+    p1_won = rng.random(sims.size) < table.p1_win[first_server]
+    expected = np.where(
+        p1_won[:, None, None],
+        table.events_if_p1_wins[first_server],
+        table.events_if_p2_wins[first_server],
+    )
+    counts = rng.poisson(expected)  # (n, [ace, df], player)
+    tally.aces[:, sims] += counts[:, 0].T
+    tally.double_faults[:, sims] += counts[:, 1].T
+    return np.where(p1_won, 0, 1)
@@ -1,241 +1,194 @@
-import random
 from dataclasses import dataclass
-from typing import Tuple, Dict, Any, List
+from typing import Any
+
+import numpy as np
+
+from app.services.sim_core import (
+    ACE,
+    DOUBLE_FAULT,
+    SERVER_WIN,
+    MatchCore,
+    MatchTally,
+    PointModel,
+    adjusted_rally,
+    simulate_batch,
+    stack_tallies,
+    tiebreak_server,
+)
+from app.services.sim_types import MatchState, ScoreState
+
+__all__ = [
+    "PlayerProfile",
+    "ScoreState",
+    "MatchState",
+    "MatchStats",
+    "TennisMatchSimulator",
+    "tiebreak_server",
+]
+
+_OUTCOMES = {ACE: "ace", DOUBLE_FAULT: "df", SERVER_WIN: "server_win"}
+
 
 @dataclass
 class PlayerProfile:
     name: str
-    serve_1_in_pct: float      # "1st%"
-    serve_1_won_pct: float     # "1st W%" (Points won when 1st serve is IN)
-    serve_2_won_pct: float     # "2nd W%" (Points won when 2nd serve is IN)
-    ace_pct: float             # "Ace%" (Aces per total service points)
-    df_pct: float              # "DF%" (Double faults per total service points)
-    return_won_pct: float = 0.30 # Return points won (for opponent adjustment)
+    serve_1_in_pct: float  # "1st%"
+    serve_1_won_pct: float  # "1st W%" (Points won when 1st serve is IN)
+    serve_2_won_pct: float  # "2nd W%" (Points won when 2nd serve is IN)
+    ace_pct: float  # "Ace%" (Aces per total service points)
+    df_pct: float  # "DF%" (Double faults per total service points)
+    return_won_pct: float = 0.30  # Return points won (for opponent adjustment)
+    elo: float | None = None  # Surface Elo, for the Elo-blended point model
+
 
 @dataclass
 class MatchStats:
     winner: str
-    p1_stats: Dict[str, int]
-    p2_stats: Dict[str, int]
+    p1_stats: dict[str, int]
+    p2_stats: dict[str, int]
+
 
 class TennisMatchSimulator:
-    def __init__(self, p1: PlayerProfile, p2: PlayerProfile, sets_to_win=2):
+    """
+    PlayerProfile adapter over sim_core.MatchCore.
+    point_model defaults to the adjusted-rally model.
+    """
+
+    def __init__(
+        self,
+        p1: PlayerProfile,
+        p2: PlayerProfile,
+        sets_to_win: int = 2,
+        point_model: PointModel = adjusted_rally,
+    ):
         self.p1 = p1
         self.p2 = p2
         self.sets_to_win = sets_to_win
-        
-        # Reset per match
-        self.stats = {
-            p1.name: {"aces": 0, "dfs": 0, "games": 0, "sets": 0, "match_win": 0},
-            p2.name: {"aces": 0, "dfs": 0, "games": 0, "sets": 0, "match_win": 0}
+        self.point_model = point_model
+        self.core = MatchCore(point_model(p1, p2), point_model(p2, p1), sets_to_win)
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Running counts for the current match, keyed by player name"""
+        return {
+            self.p1.name: self.fantasy_stats(self.core.tally, 0),
+            self.p2.name: self.fantasy_stats(self.core.tally, 1),
         }
-    
-    def _get_conditional_probs(self, server: PlayerProfile) -> Tuple[float, float]:
+
+    def _get_conditional_probs(self, server: PlayerProfile) -> tuple[float, float]:
         """
-        Converts raw Tennis Abstract stats into conditional simulation probabilities.
+        Converts raw Tennis Abstract stats into conditional simulation probabilities:
+        P(ace | 1st serve in), P(DF | 1st serve fault).
         """
-        # 1. Probability of Ace GIVEN 1st serve is in
-        # (Assuming nearly all aces happen on 1st serve for simplicity)
-        # Avoid division by zero
-        if server.serve_1_in_pct > 0:
-            prob_ace_if_in = server.ace_pct / server.serve_1_in_pct
-        else:
-            prob_ace_if_in = 0.0
-
-        # 2. Probability of DF GIVEN 1st serve was a fault
-        # Denominator is the % of points that go to a 2nd serve
-        first_serve_fault_pct = 1.0 - server.serve_1_in_pct
-        if first_serve_fault_pct > 0:
-            prob_df_if_2nd = server.df_pct / first_serve_fault_pct
-        else:
-            prob_df_if_2nd = 0.0
-
-        return prob_ace_if_in, prob_df_if_2nd
+        probs = self.point_model(server, self.p2 if server is self.p1 else self.p1)
+        return probs.ace, probs.df
 
     def simulate_point(self, server: PlayerProfile, returner: PlayerProfile) -> str:
         """
         Returns outcome string: 'server_win', 'returner_win', 'ace', 'df'
         Updates stats for aces and double faults.
         """
-        ace_prob, df_prob = self._get_conditional_probs(server)
-        
-        # --- FIRST SERVE ---
-        if random.random() < server.serve_1_in_pct:
-            # Serve is IN
-            if random.random() < ace_prob:
-                self.stats[server.name]["aces"] += 1
-                return "ace"
-            
-            # Rally on 1st Serve
-            # Adjusted Win % = (Server 1st Won% + (1 - Returner Won%)) / 2
-            rally_win_prob = (server.serve_1_won_pct + (1.0 - returner.return_won_pct)) / 2
-            
-            if random.random() < rally_win_prob:
-                return "server_win"
-            else:
-                return "returner_win"
-        
-        # --- SECOND SERVE ---
-        else:
-            # First serve fault. Check for Double Fault.
-            if random.random() < df_prob:
-                self.stats[server.name]["dfs"] += 1
-                return "df"
-            
-            # Rally on 2nd Serve
-            # Adjusted Win % = (Server 2nd Won% + (1 - Returner Won%)) / 2
-            rally_win_prob = (server.serve_2_won_pct + (1.0 - returner.return_won_pct)) / 2
-            
-            if random.random() < rally_win_prob:
-                return "server_win"
-            else:
-                return "returner_win"
-
-    def simulate_game(self, server_idx: int) -> int:
-        """
-        Simulates a standard game.
+        outcome = self.core.play_point(0 if server is self.p1 else 1)
+        return _OUTCOMES.get(outcome, "returner_win")
+
+    def simulate_game(
+        self, server_idx: int, s_points: int = 0, r_points: int = 0
+    ) -> int:
+        """
+        Simulates a standard game, optionally from a score already in progress.
         server_idx: 0 for p1, 1 for p2
         Returns: 0 if p1 wins, 1 if p2 wins
         """
-        server = self.p1 if server_idx == 0 else self.p2
-        returner = self.p2 if server_idx == 0 else self.p1
-        
-        s_points, r_points = 0, 0
-        
-        while True:
-            result = self.simulate_point(server, returner)
-            
-            # 'ace' and 'df' mapping to point winner
-            if result == "ace" or result == "server_win":
-                s_points += 1
-            else: # df or returner_win
-                r_points += 1
-                
-            # Win Condition (Standard Game)
-            # Must have at least 4 points and be ahead by 2
-            if s_points >= 4 and s_points >= r_points + 2:
-                self.stats[server.name]["games"] += 1
-                return server_idx
-            if r_points >= 4 and r_points >= s_points + 2:
-                # Returner broke serve
-                self.stats[returner.name]["games"] += 1
-                return 1 - server_idx
-
-    def simulate_tiebreak(self) -> int:
-        """
-        Simulates a tiebreak (first to 7, win by 2).
+        return self.core.play_game(server_idx, s_points, r_points)
+
+    def simulate_tiebreak(
+        self, first_server_idx: int = 0, p1_points: int = 0, p2_points: int = 0
+    ) -> int:
+        """
+        Simulates a tiebreak (first to 7, win by 2), optionally from a score in progress.
+        first_server_idx: who served the first point of the tiebreak.
         Returns: 0 if p1 wins, 1 if p2 wins
         """
-        p1_points = 0
-        p2_points = 0
-        
-        # Tiebreak rotation: 1st point Server A, then 2 pts Server B, etc.
-        # Track total points to determine server
-        points_played = 0
-        
-        while True:
-            # Determine current server
-            # Pattern: A (0), B(1,2), A(3,4), B(5,6)...
-            # Logic: if ((points_played + 1) // 2) % 2 == 0 -> P1 serves (idx 0)
-            if ((points_played + 1) // 2) % 2 == 0:
-                server_idx = 0
-            else:
-                server_idx = 1
-                
-            server = self.p1 if server_idx == 0 else self.p2
-            returner = self.p2 if server_idx == 0 else self.p1
-            
-            result = self.simulate_point(server, returner)
-            
-            if result == "ace" or result == "server_win":
-                if server_idx == 0: p1_points += 1
-                else: p2_points += 1
-            else: # returner wins point
-                if server_idx == 0: p2_points += 1
-                else: p1_points += 1
-            
-            points_played += 1
-
-            if p1_points >= 7 and p1_points >= p2_points + 2:
-                self.stats[self.p1.name]["games"] += 1 # TB counts as a game won
-                return 0
-            if p2_points >= 7 and p2_points >= p1_points + 2:
-                self.stats[self.p2.name]["games"] += 1
-                return 1
-
-    def simulate_set(self, start_server_idx: int) -> Tuple[int, int]:
-        """
-        Simulate a set.
+        return self.core.play_tiebreak(first_server_idx, p1_points, p2_points)
+
+    def simulate_set(
+        self,
+        start_server_idx: int,
+        p1_games: int = 0,
+        p2_games: int = 0,
+        p1_points: int = 0,
+        p2_points: int = 0,
+    ) -> tuple[int, int]:
+        """
+        Simulate a set, optionally from a score in progress.
+        start_server_idx: server of the next point to be played.
         Returns: (winner_idx, next_set_start_server_idx)
         """
-        p1_games = 0
-        p2_games = 0
-        current_server_idx = start_server_idx
-        
-        while True:
-            game_winner = self.simulate_game(current_server_idx)
-            
-            if game_winner == 0:
-                p1_games += 1
-            else:
-                p2_games += 1
-                
-            current_server_idx = 1 - current_server_idx # Switch server
-            
-            # Set Win Conditions
-            if p1_games >= 6 and p1_games >= p2_games + 2:
-                self.stats[self.p1.name]["sets"] += 1
-                return 0, current_server_idx
-            if p2_games >= 6 and p2_games >= p1_games + 2:
-                self.stats[self.p2.name]["sets"] += 1
-                return 1, current_server_idx
-            
-            # Tiebreak at 6-6
-            if p1_games == 6 and p2_games == 6:
-                tb_winner = self.simulate_tiebreak()
-                if tb_winner == 0:
-                    self.stats[self.p1.name]["sets"] += 1
-                else:
-                    self.stats[self.p2.name]["sets"] += 1
-                return tb_winner, current_server_idx
-
-    def simulate_match(self) -> MatchStats:
-        """
-        Simulates the entire match.
+        return self.core.play_set(
+            start_server_idx, p1_games, p2_games, p1_points, p2_points
+        )
+
+    def simulate_match(self, start_state: MatchState | None = None) -> MatchStats:
+        """
+        Simulates the entire match, or only the remainder of it from start_state.
         Returns: MatchStats object with raw results
         """
-        p1_sets = 0
-        p2_sets = 0
-        server_idx = 0 # Assume P1 serves first (randomize in real app if needed)
-        
-        # Reset stats for the match instance
-        self.stats[self.p1.name] = {"aces": 0, "dfs": 0, "games": 0, "sets": 0, "match_win": 0}
-        self.stats[self.p2.name] = {"aces": 0, "dfs": 0, "games": 0, "sets": 0, "match_win": 0}
-
-        while p1_sets < self.sets_to_win and p2_sets < self.sets_to_win:
-            winner_idx, next_server_idx = self.simulate_set(server_idx)
-            if winner_idx == 0:
-                p1_sets += 1
-            else:
-                p2_sets += 1
-            server_idx = next_server_idx
-            
-        match_winner_idx = 0 if p1_sets > p2_sets else 1
-        winner_name = self.p1.name if match_winner_idx == 0 else self.p2.name
-        self.stats[winner_name]["match_win"] = 1
-        
+        tally = self.core.play_match(start_state)
         return MatchStats(
-            winner=winner_name,
-            p1_stats=self.stats[self.p1.name].copy(),
-            p2_stats=self.stats[self.p2.name].copy()
+            winner=self.p1.name if tally.winner == 0 else self.p2.name,
+            p1_stats=self.fantasy_stats(tally, 0),
+            p2_stats=self.fantasy_stats(tally, 1),
         )
 
-    def run(self, n_sims: int = 1000) -> List[MatchStats]:
+    def run(
+        self, n_sims: int = 1000, start_state: MatchState | None = None
+    ) -> list[MatchStats]:
         """
-        Runs n_sims of the match.
+        Runs n_sims of the match (or of its remainder from start_state).
         Returns a list of MatchStats (raw outcomes).
         """
         results = []
         for _ in range(n_sims):
-            results.append(self.simulate_match())
+            results.append(self.simulate_match(start_state))
         return results
+
+    def run_tally(
+        self, n_sims: int = 1000, start_state: MatchState | None = None
+    ) -> MatchTally:
+        """
+        Like run, but returns one MatchTally of (2, n_sims) arrays.
+        Point by point; run_batch is the fast path for the same result.
+        """
+        return stack_tallies([self.core.play_match(start_state) for _ in range(n_sims)])
+
+    def run_batch(
+        self,
+        n_sims: int = 1000,
+        rng: np.random.Generator | None = None,
+        start_state: MatchState | None = None,
+    ) -> MatchTally:
+        """
+        Runs n_sims matches on the batched core, from 0-0 or from start_state.
+        Returns one MatchTally of (2, n_sims) arrays instead of n objects.
+        """
+        p1_serve, p2_serve = self.core.serve
+        return simulate_batch(
+            p1_serve, p2_serve, n_sims, self.sets_to_win, rng, start_state
+        )
+
+    @staticmethod
+    def fantasy_stats(tally: MatchTally, idx: int) -> dict[str, Any]:
+        """
+        The raw stats dict calculate_fantasy_points expects.
+        Ints for one match, arrays for a batched tally.
+        """
+        match_win = tally.winner == idx
+        return {
+            "aces": tally.aces[idx],
+            "dfs": tally.double_faults[idx],
+            "games": tally.games_won[idx],
+            "sets": tally.sets_won[idx],
+            "match_win": match_win.astype(int)
+            if isinstance(match_win, np.ndarray)
+            else int(match_win),
+        }
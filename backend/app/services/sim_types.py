@@ -0,0 +1,66 @@
+"""
+Plain score and request types of the simulators, kept free of NumPy so the
+API's models can import them without loading the simulation code.
+sim_core re-exports ScoreState, MatchState and validate_state.
+"""
+
+from dataclasses import dataclass
+from typing import Literal
+
+# What optimize_lineups ranks lineups by
+Objective = Literal["mean", "ceiling", "win_prob"]
+
+
+@dataclass(frozen=True)
+class ScoreState:
+    """
+    An in-match score. Points are raw counts (0, 1, 2, 3 = 0/15/30/40);
+    inside a 6-6 tiebreak they are tiebreak points.
+    server: 0 if p1 is serving the current point, 1 if p2.
+    """
+
+    p1_sets: int = 0
+    p2_sets: int = 0
+    p1_games: int = 0
+    p2_games: int = 0
+    p1_points: int = 0
+    p2_points: int = 0
+    server: int = 0
+
+
+@dataclass(frozen=True)
+class MatchState(ScoreState):
+    """
+    A ScoreState plus what has already been accumulated for fantasy scoring,
+    so a simulation can resume mid-match.
+    p1_prior_games / p2_prior_games: games won in completed sets.
+    """
+
+    p1_prior_games: int = 0
+    p2_prior_games: int = 0
+    p1_aces: int = 0
+    p2_aces: int = 0
+    p1_dfs: int = 0
+    p2_dfs: int = 0
+
+
+def validate_state(state: ScoreState, sets_to_win: int = 2) -> None:
+    """Raise ValueError unless state is a reachable in-match score"""
+    s1, s2 = state.p1_sets, state.p2_sets
+    g1, g2 = state.p1_games, state.p2_games
+    pt1, pt2 = state.p1_points, state.p2_points
+    if state.server not in (0, 1):
+        raise ValueError("server must be 0 (p1) or 1 (p2)")
+    if min(s1, s2, g1, g2, pt1, pt2) < 0:
+        raise ValueError("Scores must be non-negative")
+    if s1 >= sets_to_win or s2 >= sets_to_win:
+        raise ValueError("Match is already over")
+    if (max(g1, g2) >= 6 and abs(g1 - g2) >= 2) or max(g1, g2) >= 7:
+        raise ValueError(f"Invalid game score {g1}-{g2}")
+
+    # Past deuce (or 6-6 in a tiebreak) the leader is at most one point up
+    floor = 6 if g1 == g2 == 6 else 3
+    if (pt1 >= floor and pt2 >= floor and abs(pt1 - pt2) > 1) or (
+        min(pt1, pt2) < floor and max(pt1, pt2) > floor
+    ):
+        raise ValueError(f"Invalid point score {pt1}-{pt2}")
@@ -0,0 +1,12 @@
+"""
+DraftKings tennis simulation.
+
+simulation/  DK adapters over app.services.sim_core, and the point event log
+models/      Player and DKMatchResult
+scoring/     DK classic scoring for best-of-3 and best-of-5
+engine.py    SimulationEngine, the public entry point
+"""
+
+from .engine import SimulationEngine
+
+__all__ = ["SimulationEngine"]
@@ -3,27 +3,40 @@ Tennis Match Simulation Engine
 Enhanced with DK Fantasy Scoring Capabilities
 Main simulation logic for the Simulation Service
 """
+
+import logging
 import random
-import numpy as np
-from typing import Dict, Any, Tuple, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
-import logging
-import json
+from typing import Any
+
+import numpy as np
 
 # Import new DK capabilities
-from .simulation.match_simulator import DKMatchSimulator
-from .simulation.point_simulator import PointSimulator, PointEvent
-from .models.player import Player as DKPlayer
+from app.services.sim_core import (
+    ACE,
+    DOUBLE_FAULT,
+    RETURNER_WIN,
+    SERVER_WIN,
+    draw_point,
+    raw_serve_won,
+    simulate_batch,
+)
+
 from .models.match_result import DKMatchResult
+from .models.player import Player as DKPlayer
 from .scoring.dk_calculator import DKScoringCalculator
+from .simulation.match_simulator import DKMatchSimulator
+from .simulation.point_simulator import PointSimulator
 
 logger = logging.getLogger(__name__)
 
+
 # Keep original data structures for compatibility
 @dataclass
 class Player:
     """Player statistics for simulation - Enhanced"""
+
     name: str
     first_serve_in_pct: float
     ace_rate_per_serve: float
@@ -34,189 +47,191 @@ class Player:
 
 class PointEventType:
     """Types of point events"""
+
     ACE = "ACE"
     DOUBLE_FAULT = "DOUBLE_FAULT"
     RALLY_WIN = "RALLY_WIN"
     RALLY_LOSS = "RALLY_LOSS"
 
 
+# sim_core point outcome -> legacy event type
+_LEGACY_EVENTS = {
+    ACE: PointEventType.ACE,
+    DOUBLE_FAULT: PointEventType.DOUBLE_FAULT,
+    SERVER_WIN: PointEventType.RALLY_WIN,
+    RETURNER_WIN: PointEventType.RALLY_LOSS,
+}
+
+
 class SimulationEngine:
     """
     Enhanced simulation engine with DK capabilities
     Maintains backward compatibility while adding complete DK fantasy functionality
     """
-    
-    def __init__(self, seed: int = None):
+
+    def __init__(self, seed: int | None = None):
         """
         Initialize enhanced simulation engine
-        
+
         Args:
             seed: Random seed for reproducibility
         """
         if seed is not None:
             random.seed(seed)
             np.random.seed(seed)
-        
+        self.rng = np.random.default_rng(seed)
+
         # Initialize DK simulation engines
         self.dk_simulator_bo3 = DKMatchSimulator("BEST_OF_3")
         self.dk_simulator_bo5 = DKMatchSimulator("BEST_OF_5")
+        self.dk_calculator_bo3 = DKScoringCalculator("BEST_OF_3")
+        self.dk_calculator_bo5 = DKScoringCalculator("BEST_OF_5")
         self.point_simulator = PointSimulator()
-        
+
         # Legacy event tracking
         self.event_counts = {
             PointEventType.ACE: 0,
             PointEventType.DOUBLE_FAULT: 0,
             PointEventType.RALLY_WIN: 0,
-            PointEventType.RALLY_LOSS: 0
+            PointEventType.RALLY_LOSS: 0,
         }
-    
+
     # ==================== NEW DK METHODS ====================
-    
+
     def simulate_dk_match(
         self,
         player1: Player,
         player2: Player,
         match_format: str = "BEST_OF_3",
-        walkover: bool = False
+        walkover: bool = False,
     ) -> DKMatchResult:
         """
         NEW: Complete DK match simulation with all 15 scoring events
-        
+
         Args:
             player1: First player
             player2: Second player
             match_format: "BEST_OF_3" or "BEST_OF_5"
             walkover: Whether this is a walkover
-            
+
         Returns:
             DKMatchResult with complete fantasy scoring
         """
         # Convert to DK player format
         dk_player1 = self._convert_to_dk_player(player1)
         dk_player2 = self._convert_to_dk_player(player2)
-        
+
         # Select appropriate simulator
-        simulator = (self.dk_simulator_bo3 if match_format == "BEST_OF_3" 
-                    else self.dk_simulator_bo5)
-        
+        simulator = (
+            self.dk_simulator_bo3
+            if match_format == "BEST_OF_3"
+            else self.dk_simulator_bo5
+        )
+
         # Run DK simulation
         return simulator.simulate_dk_match(dk_player1, dk_player2, walkover)
-    
+
     def get_dk_projection(
         self,
         player1: Player,
         player2: Player,
         match_format: str = "BEST_OF_3",
-        num_simulations: int = 1000
-    ) -> Dict[str, Any]:
+        num_simulations: int = 1000,
+    ) -> dict[str, Any]:
         """
         NEW: Monte Carlo analysis with DK point projections
-        
+
+        All simulations run in lockstep on sim_core's batched NumPy core, so the
+        cost grows with match length rather than with Python objects per point.
+
         Args:
             player1: First player
             player2: Second player
             match_format: Match format
             num_simulations: Number of simulations to run
-            
+
         Returns:
             Dictionary with DK projection statistics
         """
-        player1_dk_points = []
-        player2_dk_points = []
-        player1_win_rate = []
-        player2_win_rate = []
-        
         dk_player1 = self._convert_to_dk_player(player1)
         dk_player2 = self._convert_to_dk_player(player2)
-        
-        simulator = (self.dk_simulator_bo3 if match_format == "BEST_OF_3" 
-                    else self.dk_simulator_bo5)
-        
-        for _ in range(num_simulations):
-            result = simulator.simulate_dk_match(dk_player1, dk_player2)
-            player1_dk_points.append(result.player1_dk_points)
-            player2_dk_points.append(result.player2_dk_points)
-            player1_win_rate.append(1.0 if result.winner == player1.name else 0.0)
-            player2_win_rate.append(1.0 if result.winner == player2.name else 0.0)
-        
-        return {
+
+        if match_format == "BEST_OF_3":
+            sets_to_win, calculator = 2, self.dk_calculator_bo3
+        else:
+            sets_to_win, calculator = 3, self.dk_calculator_bo5
+
+        tally = simulate_batch(
+            raw_serve_won(dk_player1, dk_player2),
+            raw_serve_won(dk_player2, dk_player1),
+            num_simulations,
+            sets_to_win,
+            self.rng,
+        )
+        dk_points = tally.fantasy_points(calculator.score)
+
+        projection: dict[str, Any] = {
             "player1_name": player1.name,
             "player2_name": player2.name,
             "match_format": match_format,
-            "player1_avg_dk_points": np.mean(player1_dk_points),
-            "player1_dk_std": np.std(player1_dk_points),
-            "player2_avg_dk_points": np.mean(player2_dk_points),
-            "player2_dk_std": np.std(player2_dk_points),
-            "player1_win_rate": np.mean(player1_win_rate),
-            "player2_win_rate": np.mean(player2_win_rate),
-            "total_simulations": num_simulations,
-            "timestamp": datetime.utcnow().isoformat()
         }
-    
+        for idx, prefix in ((0, "player1"), (1, "player2")):
+            player_stats = tally.player_stats(idx)
+            projection[f"{prefix}_avg_dk_points"] = float(dk_points[idx].mean())
+            projection[f"{prefix}_dk_std"] = float(dk_points[idx].std())
+            projection[f"{prefix}_win_rate"] = float(player_stats["match_won"].mean())
+            projection[f"{prefix}_avg_aces"] = float(player_stats["aces"].mean())
+            projection[f"{prefix}_avg_double_faults"] = float(
+                player_stats["double_faults"].mean()
+            )
+            projection[f"{prefix}_avg_breaks"] = float(player_stats["breaks"].mean())
+            projection[f"{prefix}_avg_games_won"] = float(
+                player_stats["games_won"].mean()
+            )
+
+        projection["total_simulations"] = num_simulations
+        projection["timestamp"] = datetime.utcnow().isoformat()
+        return projection
+
     # ==================== LEGACY COMPATIBILITY METHODS ====================
-    
-    def simulate_point(self, server: Player, returner: Player) -> Tuple[str, PointEventType]:
+
+    def simulate_point(self, server: Player, returner: Player) -> tuple[str, str]:
         """
         Simulate a single tennis point - Enhanced
-        
+
         Args:
             server: Player serving
             returner: Player returning
-            
+
         Returns:
             Tuple of (winner_name, event_type)
         """
         # Reset event counts
         self.event_counts = {k: 0 for k in self.event_counts.keys()}
-        
-        # First serve attempt
-        if random.random() < server.first_serve_in_pct:
-            # First serve in
-            if random.random() < server.ace_rate_per_serve:
-                # Ace
-                self.event_counts[PointEventType.ACE] += 1
-                return server.name, PointEventType.ACE
-            elif random.random() < server.first_serve_points_won_pct:
-                # Server wins point on first serve
-                self.event_counts[PointEventType.RALLY_WIN] += 1
-                return server.name, PointEventType.RALLY_WIN
-            else:
-                # Returner wins on first serve
-                self.event_counts[PointEventType.RALLY_LOSS] += 1
-                return returner.name, PointEventType.RALLY_LOSS
-        else:
-            # First serve fault - second serve
-            if random.random() < server.df_rate_per_serve:
-                # Double fault
-                self.event_counts[PointEventType.DOUBLE_FAULT] += 1
-                return returner.name, PointEventType.DOUBLE_FAULT
-            elif random.random() < server.second_serve_points_won_pct:
-                # Server wins point on second serve
-                self.event_counts[PointEventType.RALLY_WIN] += 1
-                return server.name, PointEventType.RALLY_WIN
-            else:
-                # Returner wins on second serve
-                self.event_counts[PointEventType.RALLY_LOSS] += 1
-                return returner.name, PointEventType.RALLY_LOSS
-    
+
+        outcome = draw_point(raw_serve_won(server, returner))
+        event = _LEGACY_EVENTS[outcome]
+        self.event_counts[event] += 1
+        return (server.name if outcome in (ACE, SERVER_WIN) else returner.name), event
+
     def simulate_match(
         self,
         player1: Player,
         player2: Player,
         num_games: int = 12,
         points_per_game: int = 4,
-        use_dk_scoring: bool = False
-    ) -> Dict[str, Any]:
+        use_dk_scoring: bool = False,
+    ) -> dict[str, Any]:
         """
         Simulate a match - Enhanced with DK support
-        
+
         Args:
             player1: First player
             player2: Second player
             num_games: Number of games to simulate (legacy parameter)
             points_per_game: Points needed to win a game
             use_dk_scoring: Whether to use DK fantasy scoring
-            
+
         Returns:
             Dictionary with match results
         """
@@ -227,20 +242,18 @@ class SimulationEngine:
             return self._convert_dk_to_legacy_format(dk_result, num_games)
         else:
             # Use legacy simulation
-            return self._simulate_legacy_match(player1, player2, num_games, points_per_game)
-    
+            return self._simulate_legacy_match(
+                player1, player2, num_games, points_per_game
+            )
+
     def _simulate_legacy_match(
-        self,
-        player1: Player,
-        player2: Player,
-        num_games: int,
-        points_per_game: int = 4
-    ) -> Dict[str, Any]:
+        self, player1: Player, player2: Player, num_games: int, points_per_game: int = 4
+    ) -> dict[str, Any]:
         """Legacy match simulation for backward compatibility"""
         player1_games_won = 0
         player2_games_won = 0
         game_details = []
-        
+
         for game_num in range(num_games):
             # Alternate server (player1 serves first)
             if game_num % 2 == 0:
@@ -249,25 +262,27 @@ class SimulationEngine:
             else:
                 server = player2
                 returner = player1
-            
+
             # Simulate the game
             game_winner = self._simulate_game(server, returner, points_per_game)
-            
+
             if game_winner == player1.name:
                 player1_games_won += 1
             else:
                 player2_games_won += 1
-            
-            game_details.append({
-                "game_number": game_num + 1,
-                "server": server.name,
-                "winner": game_winner
-            })
-        
+
+            game_details.append(
+                {
+                    "game_number": game_num + 1,
+                    "server": server.name,
+                    "winner": game_winner,
+                }
+            )
+
         # Calculate percentages
         player1_win_pct = (player1_games_won / num_games) * 100
         player2_win_pct = (player2_games_won / num_games) * 100
-        
+
         return {
             "player1_name": player1.name,
             "player2_name": player2.name,
@@ -277,40 +292,45 @@ class SimulationEngine:
             "player1_win_pct": round(player1_win_pct, 2),
             "player2_win_pct": round(player2_win_pct, 2),
             "game_details": game_details,
-            "event_breakdown": {"games_simulated": num_games, "points_per_game": points_per_game},
-            "timestamp": datetime.utcnow().isoformat()
+            "event_breakdown": {
+                "games_simulated": num_games,
+                "points_per_game": points_per_game,
+            },
+            "timestamp": datetime.utcnow().isoformat(),
         }
-    
-    def _simulate_game(self, server: Player, returner: Player, points_per_game: int = 4) -> str:
+
+    def _simulate_game(
+        self, server: Player, returner: Player, points_per_game: int = 4
+    ) -> str:
         """Simulate a single service game"""
         server_points = 0
         returner_points = 0
-        
+
         while server_points < points_per_game and returner_points < points_per_game:
             winner, _ = self.simulate_point(server, returner)
             if winner == server.name:
                 server_points += 1
             else:
                 returner_points += 1
-        
+
         return server.name if server_points > returner_points else returner.name
-    
+
     def generate_projections(
         self,
         player1: Player,
         player2: Player,
         num_runs: int = 1000,
-        use_dk_scoring: bool = False
-    ) -> Dict[str, Any]:
+        use_dk_scoring: bool = False,
+    ) -> dict[str, Any]:
         """
         Generate player projections - Enhanced with DK support
-        
+
         Args:
             player1: First player
             player2: Second player
             num_runs: Number of simulation runs
             use_dk_scoring: Whether to include DK projections
-            
+
         Returns:
             Dictionary with projection statistics
         """
@@ -320,35 +340,39 @@ class SimulationEngine:
             # Legacy Monte Carlo analysis
             player1_results = []
             player2_results = []
-            
+
             event_counts = {
                 PointEventType.ACE: {"player1": 0, "player2": 0},
                 PointEventType.DOUBLE_FAULT: {"player1": 0, "player2": 0},
                 PointEventType.RALLY_WIN: {"player1": 0, "player2": 0},
-                PointEventType.RALLY_LOSS: {"player1": 0, "player2": 0}
+                PointEventType.RALLY_LOSS: {"player1": 0, "player2": 0},
             }
-            
-            for i in range(num_runs):
+
+            for _i in range(num_runs):
                 # Simulate point with player1 serving
                 winner1, event1 = self.simulate_point(player1, player2)
-                
+
                 if winner1 == player1.name:
                     player1_results.append(1)
                 else:
                     player1_results.append(0)
-                
-                event_counts[event1]["player1" if winner1 == player1.name else "player2"] += 1
-                
+
+                event_counts[event1][
+                    "player1" if winner1 == player1.name else "player2"
+                ] += 1
+
                 # Simulate point with player2 serving
                 winner2, event2 = self.simulate_point(player2, player1)
-                
+
                 if winner2 == player2.name:
                     player2_results.append(1)
                 else:
                     player2_results.append(0)
-                
-                event_counts[event2]["player2" if winner2 == player2.name else "player1"] += 1
-            
+
+                event_counts[event2][
+                    "player2" if winner2 == player2.name else "player1"
+                ] += 1
+
             # Calculate statistics
             player1_stats = {
                 "points_won": np.mean(player1_results),
@@ -356,66 +380,65 @@ class SimulationEngine:
                 "min": np.min(player1_results),
                 "max": np.max(player1_results),
                 "aces": event_counts[PointEventType.ACE]["player1"] / (num_runs * 2),
-                "double_faults": event_counts[PointEventType.DOUBLE_FAULT]["player1"] / (num_runs * 2),
-                "rally_wins": event_counts[PointEventType.RALLY_WIN]["player1"] / (num_runs * 2)
+                "double_faults": event_counts[PointEventType.DOUBLE_FAULT]["player1"]
+                / (num_runs * 2),
+                "rally_wins": event_counts[PointEventType.RALLY_WIN]["player1"]
+                / (num_runs * 2),
             }
-            
+
             player2_stats = {
                 "points_won": np.mean(player2_results),
                 "std": np.std(player2_results),
                 "min": np.min(player2_results),
                 "max": np.max(player2_results),
                 "aces": event_counts[PointEventType.ACE]["player2"] / (num_runs * 2),
-                "double_faults": event_counts[PointEventType.DOUBLE_FAULT]["player2"] / (num_runs * 2),
-                "rally_wins": event_counts[PointEventType.RALLY_WIN]["player2"] / (num_runs * 2)
+                "double_faults": event_counts[PointEventType.DOUBLE_FAULT]["player2"]
+                / (num_runs * 2),
+                "rally_wins": event_counts[PointEventType.RALLY_WIN]["player2"]
+                / (num_runs * 2),
             }
-            
+
             return {
                 "player1_stats": player1_stats,
                 "player2_stats": player2_stats,
                 "total_simulations": num_runs,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
             }
-    
+
     def simulate_points(
-        self,
-        player1: Player,
-        player2: Player,
-        num_points: int
-    ) -> Dict[str, Any]:
+        self, player1: Player, player2: Player, num_points: int
+    ) -> dict[str, Any]:
         """Simulate multiple points for statistical analysis"""
         player1_wins = 0
         player2_wins = 0
-        
+
         event_counts = {
             PointEventType.ACE: 0,
             PointEventType.DOUBLE_FAULT: 0,
             PointEventType.RALLY_WIN: 0,
-            PointEventType.RALLY_LOSS: 0
+            PointEventType.RALLY_LOSS: 0,
         }
-        
+
         point_details = []
-        
+
         for i in range(num_points):
             winner, event = self.simulate_point(player1, player2)
-            
+
             if winner == player1.name:
                 player1_wins += 1
             else:
                 player2_wins += 1
-            
+
             event_counts[event] += 1
-            
-            point_details.append({
-                "point_number": i + 1,
-                "winner": winner,
-                "event": event
-            })
-        
+
+            point_details.append(
+                {"point_number": i + 1, "winner": winner, "event": event}
+            )
+
         # Calculate percentages
         player1_win_pct = (player1_wins / num_points) * 100
         player2_win_pct = (player2_wins / num_points) * 100
-        
+
         return {
             "player1_name": player1.name,
             "player2_name": player2.name,
@@ -426,11 +449,11 @@ class SimulationEngine:
             "player2_win_pct": round(player2_win_pct, 2),
             "event_breakdown": event_counts,
             "point_details": point_details,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
         }
-    
+
     # ==================== UTILITY METHODS ====================
-    
+
     def _convert_to_dk_player(self, player: Player) -> DKPlayer:
         """Convert legacy Player to DK Player format"""
         return DKPlayer(
@@ -439,10 +462,12 @@ class SimulationEngine:
             ace_rate_per_serve=player.ace_rate_per_serve,
             first_serve_points_won_pct=player.first_serve_points_won_pct,
             df_rate_per_serve=player.df_rate_per_serve,
-            second_serve_points_won_pct=player.second_serve_points_won_pct
+            second_serve_points_won_pct=player.second_serve_points_won_pct,
         )
-    
-    def _convert_dk_to_legacy_format(self, dk_result: DKMatchResult, num_games: int) -> Dict[str, Any]:
+
+    def _convert_dk_to_legacy_format(
+        self, dk_result: DKMatchResult, num_games: int
+    ) -> dict[str, Any]:
         """Convert DK result to legacy format for backward compatibility"""
         return {
             "player1_name": dk_result.player1_name,
@@ -450,10 +475,16 @@ class SimulationEngine:
             "total_games": dk_result.player1_games_won + dk_result.player1_games_lost,
             "player1_games_won": dk_result.player1_games_won,
             "player2_games_won": dk_result.player2_games_won,
-            "player1_win_pct": (dk_result.player1_games_won / 
-                               (dk_result.player1_games_won + dk_result.player1_games_lost)) * 100,
-            "player2_win_pct": (dk_result.player2_games_won / 
-                               (dk_result.player2_games_won + dk_result.player2_games_lost)) * 100,
+            "player1_win_pct": (
+                dk_result.player1_games_won
+                / (dk_result.player1_games_won + dk_result.player1_games_lost)
+            )
+            * 100,
+            "player2_win_pct": (
+                dk_result.player2_games_won
+                / (dk_result.player2_games_won + dk_result.player2_games_lost)
+            )
+            * 100,
             # NEW DK fields
             "player1_dk_points": dk_result.player1_dk_points,
             "player2_dk_points": dk_result.player2_dk_points,
@@ -469,6 +500,9 @@ class SimulationEngine:
             "total_sets_played": dk_result.total_sets_played,
             "dk_format": dk_result.match_format,
             "game_details": [],  # Not tracked in legacy format
-            "event_breakdown": {"dk_format": dk_result.match_format, "sets_played": dk_result.total_sets_played},
-            "timestamp": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+            "event_breakdown": {
+                "dk_format": dk_result.match_format,
+                "sets_played": dk_result.total_sets_played,
+            },
+            "timestamp": datetime.utcnow().isoformat(),
+        }
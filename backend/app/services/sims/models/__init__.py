@@ -0,0 +1 @@
+"""Data models shared by the DK simulators."""
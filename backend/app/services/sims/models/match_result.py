@@ -0,0 +1,47 @@
+# app/services/sims/models/match_result.py
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from ..simulation.point_simulator import PointEventLog
+
+
+@dataclass
+class DKMatchResult:
+    """One simulated match with its DK fantasy points and counting stats"""
+
+    player1_name: str
+    player2_name: str
+    match_format: str
+    match_played: bool
+    walkover: bool
+    player1_dk_points: float
+    player2_dk_points: float
+    player1_aces: int
+    player1_double_faults: int
+    player1_breaks: int
+    player1_games_won: int
+    player1_games_lost: int
+    player1_sets_won: int
+    player1_sets_lost: int
+    player2_aces: int
+    player2_double_faults: int
+    player2_breaks: int
+    player2_games_won: int
+    player2_games_lost: int
+    player2_sets_won: int
+    player2_sets_lost: int
+    winner: str
+    total_sets_played: int
+    match_duration_estimate: int
+    timestamp: datetime
+    # Point-by-point log, only populated when the simulator runs with trace=True
+    events: PointEventLog = field(default_factory=PointEventLog)
+
+    @property
+    def player1_events(self) -> PointEventLog:
+        """Full match log (one log is shared by both players)"""
+        return self.events
+
+    @property
+    def player2_events(self) -> PointEventLog:
+        return self.events
@@ -0,0 +1,17 @@
+# app/services/sims/models/player.py
+from dataclasses import dataclass
+
+
+@dataclass
+class Player:
+    """
+    Serve profile consumed by the DK simulators.
+    Every rate is conditional on reaching that branch of the point.
+    """
+
+    name: str
+    first_serve_in_pct: float
+    ace_rate_per_serve: float  # P(ace | first serve in)
+    first_serve_points_won_pct: float  # P(win | first serve in, not an ace)
+    df_rate_per_serve: float  # P(double fault | first serve missed)
+    second_serve_points_won_pct: float  # P(win | second serve in)
@@ -0,0 +1 @@
+"""DraftKings fantasy scoring."""
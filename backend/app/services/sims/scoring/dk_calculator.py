@@ -0,0 +1,149 @@
+# app/services/sims/scoring/dk_calculator.py
+from collections.abc import Mapping
+
+import numpy as np
+
+Number = int | float | bool | np.ndarray
+
+# DraftKings classic tennis scoring
+DK_SCORING: dict[str, dict[str, float]] = {
+    "BEST_OF_3": {
+        "MATCH_PLAYED": 30.0,
+        "GAME_WON": 2.5,
+        "GAME_LOST": -2.0,
+        "SET_WON": 6.0,
+        "SET_LOST": -3.0,
+        "MATCH_WON": 6.0,
+        "ACE": 0.4,
+        "DOUBLE_FAULT": -1.0,
+        "BREAK": 0.75,
+        "CLEAN_SET": 4.0,  # Set won 6-0
+        "STRAIGHT_SETS": 6.0,
+        "NO_DOUBLE_FAULT": 2.5,
+        "ACE_BONUS": 2.0,
+        "ACE_BONUS_THRESHOLD": 10,
+        "WALKOVER": 30.0,  # Advancing on a walkover pays the match-played points
+    },
+    "BEST_OF_5": {
+        "MATCH_PLAYED": 30.0,
+        "GAME_WON": 2.0,
+        "GAME_LOST": -1.6,
+        "SET_WON": 5.0,
+        "SET_LOST": -2.5,
+        "MATCH_WON": 5.0,
+        "ACE": 0.25,
+        "DOUBLE_FAULT": -1.0,
+        "BREAK": 0.5,
+        "CLEAN_SET": 2.5,
+        "STRAIGHT_SETS": 5.0,
+        "NO_DOUBLE_FAULT": 5.0,
+        "ACE_BONUS": 2.0,
+        "ACE_BONUS_THRESHOLD": 15,
+        "WALKOVER": 30.0,
+    },
+}
+
+
+class DKScoringCalculator:
+    def __init__(self, match_format: str = "BEST_OF_3"):
+        if match_format not in DK_SCORING:
+            raise ValueError(f"Unknown match format: {match_format}")
+        self.match_format = match_format
+        self.scoring_config = DK_SCORING[match_format]
+
+    def calculate_player_points(self, stats: dict[str, Number]) -> float:
+        """DK points for one player's match stats (MatchTally.player_stats plus flags)"""
+        if stats.get("walkover"):
+            return self.scoring_config["WALKOVER"]
+        if not stats.get("match_played"):
+            return 0.0
+        return float(self.score(stats))
+
+    def score(self, stats: dict[str, Number]) -> Number:
+        """
+        DK points for a played match, as a sim_core ScoringRule.
+        Works on a single match or on MatchTally arrays from the batched core.
+        """
+        aces, double_faults = stats["aces"], stats["double_faults"]
+        return self._points(
+            games_won=stats["games_won"],
+            games_lost=stats["games_lost"],
+            sets_won=stats["sets_won"],
+            sets_lost=stats["sets_lost"],
+            match_won=stats["match_won"],
+            aces=stats["aces"],
+            double_faults=stats["double_faults"],
+            breaks=stats["breaks"],
+            clean_sets=stats["clean_sets"],
+            straight_sets_win=stats["straight_sets_win"],
+            no_double_faults=double_faults == 0,
+            ace_bonus=aces >= self.scoring_config["ACE_BONUS_THRESHOLD"],
+        )
+
+    def expected_score(self, stats: Mapping[str, Number]) -> Number:
+        """
+        Expected DK points from expected stats (matchups.MatchupSolution.player_stats),
+        with match_won and straight_sets_win as probabilities.
+        Every term is linear except the two bonuses, which treat aces and
+        double faults as Poisson counts around their expected values.
+        """
+        aces, double_faults = stats["aces"], stats["double_faults"]
+        return self._points(
+            games_won=stats["games_won"],
+            games_lost=stats["games_lost"],
+            sets_won=stats["sets_won"],
+            sets_lost=stats["sets_lost"],
+            match_won=stats["match_won"],
+            aces=aces,
+            double_faults=double_faults,
+            breaks=stats["breaks"],
+            clean_sets=stats["clean_sets"],
+            straight_sets_win=stats["straight_sets_win"],
+            no_double_faults=np.exp(-double_faults),
+            ace_bonus=_poisson_at_least(
+                aces, int(self.scoring_config["ACE_BONUS_THRESHOLD"])
+            ),
+        )
+
+    def _points(
+        self,
+        games_won: Number,
+        games_lost: Number,
+        sets_won: Number,
+        sets_lost: Number,
+        match_won: Number,
+        aces: Number,
+        double_faults: Number,
+        breaks: Number,
+        clean_sets: Number,
+        straight_sets_win: Number,
+        no_double_faults: Number,
+        ace_bonus: Number,
+    ) -> Number:
+        # Plain arithmetic so scalars and arrays share one formula
+        cfg = self.scoring_config
+        return (
+            cfg["MATCH_PLAYED"]
+            + games_won * cfg["GAME_WON"]
+            + games_lost * cfg["GAME_LOST"]
+            + sets_won * cfg["SET_WON"]
+            + sets_lost * cfg["SET_LOST"]
+            + match_won * cfg["MATCH_WON"]
+            + aces * cfg["ACE"]
+            + double_faults * cfg["DOUBLE_FAULT"]
+            + breaks * cfg["BREAK"]
+            + clean_sets * cfg["CLEAN_SET"]
+            + straight_sets_win * cfg["STRAIGHT_SETS"]
+            + no_double_faults * cfg["NO_DOUBLE_FAULT"]
+            + ace_bonus * cfg["ACE_BONUS"]
+        )
+
+
+def _poisson_at_least(mean: Number, k: int) -> Number:
+    """P(X >= k) for X ~ Poisson(mean)"""
+    term = np.exp(-np.asarray(mean, dtype=np.float64))
+    below = term.copy()
+    for j in range(1, k):
+        term = term * mean / j
+        below = below + term
+    return 1.0 - below
@@ -0,0 +1 @@
+"""DK match adapter and point event log over app.services.sim_core."""
@@ -0,0 +1,115 @@
+# app/services/sims/simulation/match_simulator.py
+from datetime import datetime, timezone
+from typing import Any
+
+from app.services.sim_core import MatchCore, MatchTally, raw_serve_won
+
+from ..models.match_result import DKMatchResult
+from ..models.player import Player
+from ..scoring.dk_calculator import DKScoringCalculator
+from .point_simulator import PointEventLog
+
+
+class DKMatchSimulator:
+    """DK adapter over sim_core.MatchCore (raw serve-won point model, DK scoring)"""
+
+    def __init__(self, match_format: str = "BEST_OF_3", trace: bool = False):
+        """
+        trace: keep the full point-by-point history on each result.
+        Off by default: aces/DFs come from the core's per-point counters.
+        """
+        self.match_format = match_format
+        self.trace = trace
+        self.sets_to_win = 2 if match_format == "BEST_OF_3" else 3
+        self.dk_calculator = DKScoringCalculator(match_format)
+
+    def simulate_dk_match(
+        self, player1: Player, player2: Player, walkover: bool = False
+    ) -> DKMatchResult:
+        """Simulate complete DK tennis match"""
+
+        if walkover:
+            return self._handle_walkover(player1, player2)
+
+        # Point-by-point log only exists in trace mode (one log, shared by both players)
+        events = PointEventLog((player1.name, player2.name))
+        core = MatchCore(
+            raw_serve_won(player1, player2),
+            raw_serve_won(player2, player1),
+            self.sets_to_win,
+            on_point=events.record if self.trace else None,
+            on_set_start=events.start_set if self.trace else None,
+        )
+        tally = core.play_match()  # Player 1 serves first
+
+        player1_stats = self._player_stats(tally, 0)
+        player2_stats = self._player_stats(tally, 1)
+
+        return DKMatchResult(
+            player1_name=player1.name,
+            player2_name=player2.name,
+            match_format=self.match_format,
+            match_played=True,
+            walkover=False,
+            player1_dk_points=self.dk_calculator.calculate_player_points(player1_stats),
+            player2_dk_points=self.dk_calculator.calculate_player_points(player2_stats),
+            events=events,
+            player1_aces=player1_stats["aces"],
+            player1_double_faults=player1_stats["double_faults"],
+            player1_breaks=player1_stats["breaks"],
+            player1_games_won=player1_stats["games_won"],
+            player1_games_lost=player1_stats["games_lost"],
+            player1_sets_won=player1_stats["sets_won"],
+            player1_sets_lost=player1_stats["sets_lost"],
+            player2_aces=player2_stats["aces"],
+            player2_double_faults=player2_stats["double_faults"],
+            player2_breaks=player2_stats["breaks"],
+            player2_games_won=player2_stats["games_won"],
+            player2_games_lost=player2_stats["games_lost"],
+            player2_sets_won=player2_stats["sets_won"],
+            player2_sets_lost=player2_stats["sets_lost"],
+            winner=player1.name if tally.winner == 0 else player2.name,
+            total_sets_played=tally.sets_played,
+            match_duration_estimate=0,  # Placeholder for future implementation
+            timestamp=datetime.now(timezone.utc),
+        )
+
+    def _player_stats(self, tally: MatchTally, idx: int) -> dict[str, Any]:
+        """Core stats plus the flags DKScoringCalculator checks"""
+        stats = tally.player_stats(idx)
+        stats["match_played"] = True
+        stats["walkover"] = False
+        stats["no_double_faults"] = stats["double_faults"] == 0
+        return stats
+
+    def _handle_walkover(self, player1: Player, player2: Player) -> DKMatchResult:
+        """Handle walkover scenario"""
+        walkover_points = self.dk_calculator.scoring_config["WALKOVER"]
+        return DKMatchResult(
+            player1_name=player1.name,
+            player2_name=player2.name,
+            match_format=self.match_format,
+            match_played=True,
+            walkover=True,
+            player1_dk_points=walkover_points,
+            player2_dk_points=walkover_points,
+            events=PointEventLog((player1.name, player2.name)),
+            player1_aces=0,
+            player2_aces=0,
+            player1_double_faults=0,
+            player2_double_faults=0,
+            player1_breaks=0,
+            player2_breaks=0,
+            player1_games_won=0,
+            player2_games_won=0,
+            player1_games_lost=0,
+            player2_games_lost=0,
+            player1_sets_won=0,
+            player2_sets_won=0,
+            player1_sets_lost=0,
+            player2_sets_lost=0,
+            winner="",
+            total_sets_played=0,
+            match_duration_estimate=0,
+            timestamp=datetime.now(timezone.utc),
+        )
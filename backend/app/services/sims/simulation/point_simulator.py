@@ -0,0 +1,198 @@
+# app/services/sims/simulation/point_simulator.py
+from array import array
+from collections.abc import Iterator
+from enum import Enum
+from typing import Any, Optional, Union, overload
+
+from app.services.sim_core import draw_point, raw_serve_won
+
+from ..models.player import Player
+
+
+class PointEvent(Enum):
+    ACE = "ACE"
+    DOUBLE_FAULT = "DOUBLE_FAULT"
+    RALLY_WIN = "RALLY_WIN"  # Point won after serve
+    RALLY_LOSS = "RALLY_LOSS"  # Point lost after serve
+
+
+# Compact event codes (index into EVENTS); they equal sim_core's point outcomes
+EVENTS = tuple(PointEvent)
+EVENT_CODES = {event: code for code, event in enumerate(EVENTS)}
+_RALLY_LOSS = EVENT_CODES[PointEvent.RALLY_LOSS]
+
+
+class PointEventLog:
+    """
+    Compact point-by-point log: parallel byte columns of event code and
+    server index (0/1 into `players`); the point number is the position.
+
+    Iterating yields the same {"type", "player", "timestamp"} dicts the old
+    list-of-dicts history did, built on demand. Slicing (and for_set) returns
+    a view over the same buffers, without copying. Pickles as raw bytes.
+    """
+
+    __slots__ = ("players", "codes", "servers", "offset", "set_starts")
+
+    def __init__(
+        self,
+        players: tuple[str, str] = ("", ""),
+        codes: Union["array[int]", memoryview] | None = None,
+        servers: Union["array[int]", memoryview] | None = None,
+        offset: int = 0,
+        set_starts: Optional["array[int]"] = None,
+    ):
+        self.players = players
+        # array("b") for a full log, read-only memoryview slices for a view
+        self.codes: Any = codes if codes is not None else array("b")
+        self.servers: Any = servers if servers is not None else array("b")
+        self.offset = offset  # Point number of the first entry (for views)
+        self.set_starts = set_starts if set_starts is not None else array("I")
+
+    def append(self, event_type: PointEvent, server_idx: int) -> None:
+        self.codes.append(EVENT_CODES[event_type])
+        self.servers.append(server_idx)
+
+    def record(self, server_idx: int, code: int) -> None:
+        """MatchCore on_point hook: append a raw outcome code"""
+        self.codes.append(code)
+        self.servers.append(server_idx)
+
+    def start_set(self) -> None:
+        """Mark the next recorded point as the first point of a new set"""
+        self.set_starts.append(len(self.codes))
+
+    def for_set(self, set_number: int) -> "PointEventLog":
+        """Zero-copy view of one set's points (set_number is 1-based)"""
+        start = self.set_starts[set_number - 1]
+        end = (
+            self.set_starts[set_number]
+            if set_number < len(self.set_starts)
+            else len(self.codes)
+        )
+        return self[start:end]
+
+    def event_for(self, i: int) -> tuple[PointEvent, int]:
+        """(event, index of the player credited with it) for point i"""
+        code = self.codes[i]
+        server_idx = self.servers[i]
+        return EVENTS[code], (1 - server_idx if code == _RALLY_LOSS else server_idx)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @overload
+    def __getitem__(self, key: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "PointEventLog": ...
+
+    def __getitem__(self, key: int | slice) -> Union[dict[str, Any], "PointEventLog"]:
+        if isinstance(key, slice):
+            start, _, _ = key.indices(len(self.codes))
+            return PointEventLog(
+                self.players,
+                memoryview(self.codes)[key],
+                memoryview(self.servers)[key],
+                self.offset + start,
+            )
+        if key < 0:
+            key += len(self.codes)
+        event, player_idx = self.event_for(key)
+        return {
+            "type": event.value,
+            "player": self.players[player_idx],
+            "timestamp": self.offset + key,
+        }
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self.codes)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PointEventLog):
+            return (
+                self.players == other.players
+                and self.offset == other.offset
+                and bytes(self.codes) == bytes(other.codes)
+                and bytes(self.servers) == bytes(other.servers)
+            )
+        return bool(list(self) == other)
+
+    def __getstate__(self) -> tuple[tuple[str, str], bytes, bytes, int, bytes]:
+        return (
+            self.players,
+            bytes(self.codes),
+            bytes(self.servers),
+            self.offset,
+            self.set_starts.tobytes(),
+        )
+
+    def __setstate__(
+        self, state: tuple[tuple[str, str], bytes, bytes, int, bytes]
+    ) -> None:
+        players, codes, servers, offset, set_starts = state
+        self.players = players
+        self.codes = array("b", codes)
+        self.servers = array("b", servers)
+        self.offset = offset
+        self.set_starts = array("I")
+        self.set_starts.frombytes(set_starts)
+
+
+class PointSimulator:
+    def __init__(self, trace: bool = False):
+        # Per-player counters are always kept; the point-by-point log
+        # is only recorded in trace mode
+        self.trace = trace
+        self.point_history = PointEventLog()
+        self.event_counts: dict[str, dict[str, int]] = {}
+        self.points_played = 0
+        self._player_index: dict[str, int] = {}
+
+    def reset(self, players: tuple[str, str] = ("", "")) -> None:
+        """Clear counters (and history) before a new match"""
+        # A fresh log, so results still holding views of the last one stay valid
+        self.point_history = PointEventLog(players)
+        self.event_counts = {}
+        self.points_played = 0
+        self._player_index = {name: idx for idx, name in enumerate(players) if name}
+
+    def count(self, player_name: str, event_type: PointEvent) -> int:
+        """Number of `event_type` events recorded for a player"""
+        return self.event_counts.get(player_name, {}).get(event_type.value, 0)
+
+    def simulate_point(
+        self, server: Player, returner: Player
+    ) -> tuple[str, PointEvent]:
+        """Simulate a single tennis point (raw serve-won model)"""
+        event = EVENTS[draw_point(raw_serve_won(server, returner))]
+        server_won = event in (PointEvent.ACE, PointEvent.RALLY_WIN)
+        # Aces, DFs and rally wins are credited to the server, rally losses to the returner
+        credited = returner.name if event == PointEvent.RALLY_LOSS else server.name
+        self._record_event(event, credited, server.name)
+        return (server.name if server_won else returner.name), event
+
+    def _record_event(
+        self, event_type: PointEvent, player_name: str, server_name: str
+    ) -> None:
+        """Record point event for later analysis"""
+        counts = self.event_counts.get(player_name)
+        if counts is None:
+            counts = self.event_counts[player_name] = {e.value: 0 for e in PointEvent}
+        counts[event_type.value] += 1
+
+        if self.trace:
+            self.point_history.append(event_type, self._server_index(server_name))
+        self.points_played += 1
+
+    def _server_index(self, server_name: str) -> int:
+        idx = self._player_index.get(server_name)
+        if idx is None:
+            # Standalone use without reset(players): register names as they serve
+            idx = len(self._player_index)
+            self._player_index[server_name] = idx
+            players = list(self.point_history.players)
+            players[idx] = server_name
+            self.point_history.players = (players[0], players[1])
+        return idx
@@ -0,0 +1,142 @@
+"""
+Tournament bracket Monte Carlo.
+
+A single-elimination draw is resolved round by round for every simulation at
+once: each match is one uniform draw against the exact head-to-head win
+probability (matchups.head_to_head, memoized per pair), never a replay of its
+points. Expected DK points per player add up the expected points of every
+match played, conditional on winning or losing it.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.matchups import head_to_head
+from app.services.sim_core import PointModel, adjusted_rally
+from app.services.sim_engine import PlayerProfile
+
+
+@dataclass
+class TournamentResult:
+    """
+    names:            draw order, None for a bye
+    rounds:           round labels, e.g. ["R32", "R16", "QF", "SF", "F", "W"]
+    reach:            P(player reaches each round), shape (draw size, len(rounds))
+    expected_points:  expected DK points over the whole tournament
+    """
+
+    names: list[str | None]
+    rounds: list[str]
+    reach: np.ndarray
+    expected_points: np.ndarray
+    n_sims: int
+
+
+def round_labels(draw_size: int) -> list[str]:
+    """Players left at each stage: R128 ... R16, QF, SF, F, then W (champion)"""
+    named = {8: "QF", 4: "SF", 2: "F", 1: "W"}
+    labels = []
+    size = draw_size
+    while size >= 1:
+        labels.append(named.get(size, f"R{size}"))
+        size //= 2
+    return labels
+
+
+def simulate_tournament(
+    draw: Sequence[PlayerProfile | None],
+    n_sims: int = 20000,
+    sets_to_win: int = 2,
+    rng: np.random.Generator | None = None,
+    point_model: PointModel = adjusted_rally,
+) -> TournamentResult:
+    """
+    draw: players in bracket order (slot 0 plays slot 1, ...); None is a bye.
+    Its length must be a power of two.
+    """
+    size = len(draw)
+    if size < 2 or size & (size - 1):
+        raise ValueError(f"Draw size must be a power of two, got {size}")
+    rng = rng or np.random.default_rng()
+
+    # 1. Head-to-head tables for every pair of slots that could meet
+    win, points_if_won, points_if_lost = _head_to_head_tables(
+        draw, sets_to_win, point_model
+    )
+
+    # 2. Play the bracket one round at a time, all simulations in lockstep
+    rounds = round_labels(size)
+    alive = np.broadcast_to(np.arange(size), (n_sims, size))
+    reach = np.zeros((size, len(rounds)))
+    reach[:, 0] = n_sims
+    points = np.zeros(size)
+    for r in range(1, len(rounds)):
+        a, b = alive[:, 0::2], alive[:, 1::2]
+        a_wins = rng.random(a.shape) < win[a, b]
+        points += np.bincount(
+            a.ravel(),
+            np.where(a_wins, points_if_won[a, b], points_if_lost[a, b]).ravel(),
+            size,
+        )
+        points += np.bincount(
+            b.ravel(),
+            np.where(a_wins, points_if_lost[b, a], points_if_won[b, a]).ravel(),
+            size,
+        )
+        alive = np.where(a_wins, a, b)
+        reach[:, r] = np.bincount(alive.ravel(), minlength=size)
+
+    # 3. Aggregation
+    return TournamentResult(
+        names=[p.name if p is not None else None for p in draw],
+        rounds=rounds,
+        reach=reach / n_sims,
+        expected_points=points / n_sims,
+        n_sims=n_sims,
+    )
+
+
+def _head_to_head_tables(
+    draw: Sequence[PlayerProfile | None],
+    sets_to_win: int,
+    point_model: PointModel,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (size, size) tables indexed [player, opponent]: P(player wins), and the
+    player's expected DK points given a win or a loss. A bye always loses
+    and nobody scores against one.
+    """
+    size = len(draw)
+    win = np.zeros((size, size))
+    points_if_won = np.zeros((size, size))
+    points_if_lost = np.zeros((size, size))
+
+    players = [i for i, p in enumerate(draw) if p is not None]
+    byes = [i for i, p in enumerate(draw) if p is None]
+    win[np.ix_(players, byes)] = 1.0
+    # Two byes: one of them "advances" so its next opponent gets a walkover
+    win[np.ix_(byes, byes)] = 1.0
+
+    i, j = np.triu_indices(len(players), k=1)
+    i, j = np.array(players, dtype=np.intp)[i], np.array(players, dtype=np.intp)[j]
+    if len(i):
+        h2h = head_to_head(
+            [
+                (point_model(draw[a], draw[b]), point_model(draw[b], draw[a]))
+                for a, b in zip(i, j, strict=False)
+            ],
+            sets_to_win,
+        )
+        win[i, j], points_if_won[i, j], points_if_lost[i, j] = (
+            h2h[:, 0],
+            h2h[:, 1],
+            h2h[:, 2],
+        )
+        win[j, i], points_if_won[j, i], points_if_lost[j, i] = (
+            1 - h2h[:, 0],
+            h2h[:, 3],
+            h2h[:, 4],
+        )
+    return win, points_if_won, points_if_lost
@@ -0,0 +1,167 @@
+"""
+Per-process warm cache of player profiles and matchup setups.
+
+Worker processes are long-lived and re-simulate the same players all day.
+WarmCache keeps every PlayerProfile and every matchup's simulator (its two
+players' ServeProbs, resolved once; run_batch keeps no state between calls)
+until the player stats change.
+
+A stats change is announced as a new "stats version": publish_stats_version
+stores it in Redis and publishes it on STATS_CHANNEL. Each worker process
+reads the current version when it warms up and then follows the channel
+from a daemon thread (listen_for_stats_versions), clearing its cache
+whenever the version moves. Without Redis (SQLite mode) the cache lives as
+long as the process, or until invalidate() is called.
+"""
+
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.services.profiles import load_player_profile
+from app.services.sim_engine import PlayerProfile, TennisMatchSimulator
+
+logger = structlog.get_logger()
+
+STATS_CHANNEL = "sim:stats-version"
+# The current version, for processes that start after it was published
+STATS_VERSION_KEY = "sim:stats-version"
+
+ProfileKey = tuple[str, str]  # (name, surface)
+MatchupKey = tuple[str, str, str, int]  # (p1 name, p2 name, surface, sets_to_win)
+
+
+class WarmCache:
+    """PlayerProfiles and matchup simulators, valid for one stats version"""
+
+    def __init__(self) -> None:
+        self.version: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self._profiles: dict[ProfileKey, PlayerProfile | None] = {}
+        self._matchups: dict[MatchupKey, TennisMatchSimulator | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._matchups)
+
+    def profile(self, name: str, surface: str = "hard") -> PlayerProfile | None:
+        """load_player_profile, once per player and surface (None is cached too)"""
+        profiles = self._profiles
+        key = (name, surface.lower())
+        if key in profiles:
+            self.hits += 1
+            return profiles[key]
+        self.misses += 1
+        profiles[key] = profile = load_player_profile(name, surface)
+        return profile
+
+    def simulator(
+        self, p1_name: str, p2_name: str, surface: str = "hard", sets_to_win: int = 2
+    ) -> TennisMatchSimulator | None:
+        """A ready simulator for the matchup, or None when either player has no stats"""
+        # Filled into the dicts current at the start, so an invalidation
+        # that lands midway cannot leave an old entry in the new cache
+        matchups = self._matchups
+        key = (p1_name, p2_name, surface.lower(), sets_to_win)
+        if key in matchups:
+            self.hits += 1
+            return matchups[key]
+        self.misses += 1
+        p1, p2 = self.profile(p1_name, surface), self.profile(p2_name, surface)
+        matchups[key] = sim = (
+            TennisMatchSimulator(p1, p2, sets_to_win=sets_to_win) if p1 and p2 else None
+        )
+        return sim
+
+    def warm(
+        self, matchups: Iterable[tuple[str, str, str]], sets_to_win: int = 2
+    ) -> int:
+        """Preload (p1 name, p2 name, surface) matchups; returns how many are cached"""
+        for p1_name, p2_name, surface in matchups:
+            self.simulator(p1_name, p2_name, surface, sets_to_win)
+        return len(self)
+
+    def invalidate(self, version: str | None = None) -> None:
+        """Drop everything; version is the stats version the next entries belong to"""
+        self._profiles = {}
+        self._matchups = {}
+        self.version = version
+
+
+warm_cache = WarmCache()
+register_cache("warm_cache", lambda: (warm_cache.hits, warm_cache.misses))
+
+
+# ==================== STATS VERSION ====================
+
+
+def _redis() -> Any:
+    if settings.USE_SQLITE:
+        return None
+    import redis
+
+    return redis.Redis.from_url(settings.STATS_VERSION_REDIS_URL, decode_responses=True)
+
+
+def current_stats_version() -> str | None:
+    client = _redis()
+    return client.get(STATS_VERSION_KEY) if client else None
+
+
+def publish_stats_version(version: str | None = None) -> str:
+    """Announce new player stats: every worker's warm cache is dropped"""
+    version = version or uuid.uuid4().hex
+    client = _redis()
+    if client:
+        client.set(STATS_VERSION_KEY, version)
+        client.publish(STATS_CHANNEL, version)
+    # This process may simulate too (eager tasks, scripts)
+    warm_cache.invalidate(version)
+    # Stored joint outcomes were simulated from the old stats
+    from app.services.outcomes import get_outcome_store
+
+    store = get_outcome_store()
+    if store:
+        store.clear()
+    logger.info("Stats version published", version=version)
+    return version
+
+
+def apply_stats_version(cache: WarmCache, version: str) -> None:
+    if version != cache.version:
+        cache.invalidate(version)
+        logger.info("Warm cache invalidated", version=version)
+
+
+def listen_for_stats_versions(
+    cache: WarmCache = warm_cache, retry_seconds: float = 5.0
+) -> threading.Thread | None:
+    """Follow STATS_CHANNEL in a daemon thread; None without Redis"""
+    if _redis() is None:
+        return None
+
+    def listen() -> None:
+        while True:
+            try:
+                pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(STATS_CHANNEL)
+                # A version published while disconnected would be missed
+                version = current_stats_version()
+                if version:
+                    apply_stats_version(cache, version)
+                for message in pubsub.listen():
+                    apply_stats_version(cache, message["data"])
+            except Exception as e:
+                # A Redis outage keeps the cache as it is until the next version
+                logger.warning("Stats version listener disconnected", error=str(e))
+                time.sleep(retry_seconds)
+
+    thread = threading.Thread(target=listen, name="stats-version-listener", daemon=True)
+    thread.start()
+    return thread
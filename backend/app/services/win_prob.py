@@ -0,0 +1,226 @@
+"""
+Exact live win probabilities.
+
+Given the probability that each player wins a point on serve, the match is a
+Markov chain over score states, so P(p1 wins | score) can be solved exactly
+by dynamic programming instead of simulated. A LiveWinProbTable precomputes
+every reachable state of a best-of-3 or best-of-5 match once per matchup;
+lookups afterwards are a dict access.
+
+Serve rotation follows sim_core.MatchCore: servers alternate every game,
+and a tiebreak counts as one game (the player who received first in the
+tiebreak serves first in the next set).
+"""
+
+from functools import lru_cache
+
+from app.core.metrics import register_lru_cache
+from app.services.sim_core import adjusted_rally, tiebreak_server
+from app.services.sim_engine import PlayerProfile
+from app.services.sim_types import ScoreState, validate_state
+
+StateKey = tuple[int, int, int, int, int, int, int]
+
+
+def serve_point_win_prob(server: PlayerProfile, returner: PlayerProfile) -> float:
+    """
+    P(server wins the point) under the adjusted-rally point model.
+    """
+    return adjusted_rally(server, returner).point_win
+
+
+class LiveWinProbTable:
+    """
+    P(p1 wins the match) for every reachable score state.
+
+    p1_serve: P(p1 wins a point on his serve)
+    p2_serve: P(p2 wins a point on his serve)
+    """
+
+    def __init__(self, p1_serve: float, p2_serve: float, sets_to_win: int = 2):
+        self.p1_serve = p1_serve
+        self.p2_serve = p2_serve
+        self.sets_to_win = sets_to_win
+        self._serve = (p1_serve, p2_serve)
+        self._game_cache: dict[tuple[int, int, int], float] = {}
+        self._tb_cache: dict[tuple[int, int, int], float] = {}
+        self._set_start_cache: dict[tuple[int, int, int, int, int], float] = {}
+        self.table: dict[StateKey, float] = self._build()
+
+    # ==================== LOOKUP ====================
+
+    def win_prob(self, state: ScoreState) -> float:
+        """P(p1 wins | state). O(1)."""
+        return self.table[self._key(state)]
+
+    @property
+    def pre_match(self) -> float:
+        """P(p1 wins) before the first point, p1 serving first."""
+        return self.table[(0, 0, 0, 0, 0, 0, 0)]
+
+    def _key(self, state: ScoreState) -> StateKey:
+        s1, s2 = state.p1_sets, state.p2_sets
+        g1, g2 = state.p1_games, state.p2_games
+        pt1, pt2 = state.p1_points, state.p2_points
+        validate_state(state, self.sets_to_win)
+
+        # Deuce / long tiebreaks collapse onto the first equivalent state
+        floor = 6 if self._is_tiebreak(g1, g2) else 3
+        if pt1 >= floor and pt2 >= floor:
+            diff = pt1 - pt2
+            pt1, pt2 = floor + max(diff, 0), floor + max(-diff, 0)
+
+        return (s1, s2, g1, g2, pt1, pt2, state.server)
+
+    # ==================== BUILD ====================
+
+    def _build(self) -> dict[StateKey, float]:
+        table: dict[StateKey, float] = {}
+        for s1 in range(self.sets_to_win):
+            for s2 in range(self.sets_to_win):
+                for g1 in range(7):
+                    for g2 in range(7):
+                        if self._set_over(g1, g2):
+                            continue
+                        for pt1, pt2 in self._point_states(g1, g2):
+                            for server in (0, 1):
+                                table[(s1, s2, g1, g2, pt1, pt2, server)] = self._solve(
+                                    s1, s2, g1, g2, pt1, pt2, server
+                                )
+        return table
+
+    @staticmethod
+    def _is_tiebreak(g1: int, g2: int) -> bool:
+        return g1 == 6 and g2 == 6
+
+    @staticmethod
+    def _set_over(g1: int, g2: int) -> bool:
+        return (max(g1, g2) >= 6 and abs(g1 - g2) >= 2) or max(g1, g2) == 7
+
+    def _point_states(self, g1: int, g2: int) -> list[tuple[int, int]]:
+        top = 6 if self._is_tiebreak(g1, g2) else 3
+        states = [(a, b) for a in range(top + 1) for b in range(top + 1)]
+        return states + [(top + 1, top), (top, top + 1)]
+
+    def _solve(
+        self, s1: int, s2: int, g1: int, g2: int, pt1: int, pt2: int, server: int
+    ) -> float:
+        if self._is_tiebreak(g1, g2):
+            # Recover who served the first tiebreak point from the current server
+            played = pt1 + pt2
+            first = server if tiebreak_server(played, 0) == 0 else 1 - server
+            tb = self._tiebreak(pt1, pt2, first)
+            # Tiebreak counts as a game: the other player opens the next set
+            return tb * self._set_start(s1 + 1, s2, 1 - first) + (
+                1 - tb
+            ) * self._set_start(s1, s2 + 1, 1 - first)
+
+        srv_pts, ret_pts = (pt1, pt2) if server == 0 else (pt2, pt1)
+        hold = self._game(server, srv_pts, ret_pts)
+        p1_game = hold if server == 0 else 1.0 - hold
+        return p1_game * self._after_game(s1, s2, g1 + 1, g2, server) + (
+            1.0 - p1_game
+        ) * self._after_game(s1, s2, g1, g2 + 1, server)
+
+    def _after_game(self, s1: int, s2: int, g1: int, g2: int, server: int) -> float:
+        nxt = 1 - server
+        if g1 >= 6 and g1 - g2 >= 2:
+            return self._set_start(s1 + 1, s2, nxt)
+        if g2 >= 6 and g2 - g1 >= 2:
+            return self._set_start(s1, s2 + 1, nxt)
+        return self._games(s1, s2, g1, g2, nxt)
+
+    def _set_start(self, s1: int, s2: int, server: int) -> float:
+        if s1 >= self.sets_to_win:
+            return 1.0
+        if s2 >= self.sets_to_win:
+            return 0.0
+        return self._games(s1, s2, 0, 0, server)
+
+    def _games(self, s1: int, s2: int, g1: int, g2: int, server: int) -> float:
+        """P(p1 wins) at the start of a game."""
+        key = (s1, s2, g1, g2, server)
+        cached = self._set_start_cache.get(key)
+        if cached is None:
+            cached = self._solve(s1, s2, g1, g2, 0, 0, server)
+            self._set_start_cache[key] = cached
+        return cached
+
+    def _game(self, server: int, i: int, j: int) -> float:
+        """P(server wins the game) from server points i, returner points j."""
+        key = (server, i, j)
+        cached = self._game_cache.get(key)
+        if cached is not None:
+            return cached
+
+        p = self._serve[server]
+        q = 1.0 - p
+        if i >= 4 and i - j >= 2:
+            result = 1.0
+        elif j >= 4 and j - i >= 2:
+            result = 0.0
+        elif i >= 3 and j >= 3:
+            deuce = p * p / (p * p + q * q)
+            if i == j:
+                result = deuce
+            elif i > j:
+                result = p + q * deuce
+            else:
+                result = p * deuce
+        else:
+            result = p * self._game(server, i + 1, j) + q * self._game(server, i, j + 1)
+
+        self._game_cache[key] = result
+        return result
+
+    def _tiebreak(self, a: int, b: int, first: int) -> float:
+        """P(p1 wins the tiebreak) from p1 points a, p2 points b."""
+        key = (a, b, first)
+        cached = self._tb_cache.get(key)
+        if cached is not None:
+            return cached
+
+        srv = tiebreak_server(a + b, first)
+        p1_point = self._serve[0] if srv == 0 else 1.0 - self._serve[1]
+
+        if a >= 7 and a - b >= 2:
+            result = 1.0
+        elif b >= 7 and b - a >= 2:
+            result = 0.0
+        elif a >= 6 and b >= 6:
+            # From 6-6 every pair of points has one serve each
+            x = self._serve[0] * (1.0 - self._serve[1])
+            y = (1.0 - self._serve[0]) * self._serve[1]
+            tied = x / (x + y) if x + y > 0 else 0.5
+            if a == b:
+                result = tied
+            elif a > b:
+                result = p1_point + (1.0 - p1_point) * tied
+            else:
+                result = p1_point * tied
+        else:
+            result = p1_point * self._tiebreak(a + 1, b, first) + (
+                1.0 - p1_point
+            ) * self._tiebreak(a, b + 1, first)
+
+        self._tb_cache[key] = result
+        return result
+
+
+@lru_cache(maxsize=512)
+def live_table(
+    p1_serve: float, p2_serve: float, sets_to_win: int = 2
+) -> LiveWinProbTable:
+    """One table per matchup; repeated live polls never rebuild it."""
+    return LiveWinProbTable(p1_serve, p2_serve, sets_to_win)
+
+
+register_lru_cache("live_table", live_table)
+
+
+def live_table_for(
+    p1: PlayerProfile, p2: PlayerProfile, sets_to_win: int = 2
+) -> LiveWinProbTable:
+    return live_table(
+        serve_point_win_prob(p1, p2), serve_point_win_prob(p2, p1), sets_to_win
+    )
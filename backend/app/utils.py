@@ -4,9 +4,7 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
@@ -26,6 +24,8 @@ def render_email_template(*, template_name: str, context: dict[str, Any]) -> str
     template_str = (
         Path(__file__).parent / "email-templates" / "build" / template_name
     ).read_text()
+    from jinja2 import Template
+
     html_content = Template(template_str).render(context)
     return html_content
 
@@ -37,6 +37,9 @@ def send_email(
     html_content: str = "",
 ) -> None:
     assert settings.emails_enabled, "no provided configuration for email variables"
+    # Only loaded when mail is actually sent: it is slow to import
+    import emails  # type: ignore
+
     message = emails.Message(
         subject=subject,
         html=html_content,
@@ -1,14 +1,34 @@
+import asyncio
+import time
+import uuid
+from typing import TYPE_CHECKING, Any
+
+import structlog
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+
+from app.core import metrics
 from app.core.config import settings
-from app.services.odds_api import update_live_odds
-import asyncio
-import structlog
 from app.core.logging import setup_logging
+from app.core.profiling import PhaseTimer, ProfileMode, profiled
+from app.services.odds_api import update_live_odds
+
+if TYPE_CHECKING:
+    from app.models.tennis import Match
 
 setup_logging()
 logger = structlog.get_logger()
 
+# A match's results, or why it could not be simulated
+SimResult = str | dict[str, float]
+
 celery = Celery(__name__)
 celery.conf.broker_url = settings.CELERY_BROKER_URL
 celery.conf.result_backend = settings.CELERY_RESULT_BACKEND
@@ -19,140 +39,345 @@ if settings.USE_SQLITE:
     # We need to ensure we don't try to connect to Redis
 
 
+# --- METRICS ---
+_task_started: dict[str, float] = {}
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs: Any) -> None:
+    # Runs in the parent; the tasks' metrics come from the prefork children
+    # through PROMETHEUS_MULTIPROC_DIR (app.core.metrics)
+    metrics.clear_multiprocess_dir()
+    if settings.WORKER_METRICS_PORT:
+        metrics.serve()
+        logger.info("Serving worker metrics", port=settings.WORKER_METRICS_PORT)
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid: int, **kwargs: Any) -> None:
+    metrics.mark_process_dead(pid)
+
+
+@task_prerun.connect
+def start_task_timer(task_id: str, **kwargs: Any) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(
+    task_id: str, task: Any, state: str | None = None, **kwargs: Any
+) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        metrics.TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+# --- DB CONNECTIONS ---
+@worker_process_init.connect
+def reset_db_pool(**kwargs: Any) -> None:
+    # A forked pool process inherits the parent's pooled connections, sockets
+    # included: drop them without closing (that would close the parent's too)
+    from app.core.db import engine
+
+    engine.dispose(close=False)
+
+
+# --- WARM CACHE ---
+@worker_process_init.connect
+def warm_worker_cache(**kwargs: Any) -> None:
+    # Profiles and matchup simulators for the active slate, kept until the
+    # published stats version changes (app.services.warm_cache)
+    from datetime import datetime
+
+    from sqlmodel import Session, select
+
+    from app.core.db import engine
+    from app.models.tennis import Match
+    from app.services.odds_api import active_window
+    from app.services.warm_cache import (
+        current_stats_version,
+        listen_for_stats_versions,
+        warm_cache,
+    )
+
+    try:
+        warm_cache.invalidate(current_stats_version())
+        listen_for_stats_versions(warm_cache)
+        start, end = active_window(datetime.now())
+        with Session(engine) as session:
+            matches = session.exec(
+                select(Match).where(Match.start_time >= start, Match.start_time <= end)
+            ).all()
+        n_matchups = warm_cache.warm(
+            (m.player1_name, m.player2_name, m.surface) for m in matches
+        )
+        logger.info(
+            "Warm cache loaded", matchups=n_matchups, version=warm_cache.version
+        )
+    except Exception as e:
+        # A cold cache only costs the first task of each matchup its setup
+        logger.warning("Warm cache not preloaded", error=str(e))
+
+
 # --- 1. THE SCHEDULE (BEAT) ---
 @celery.on_after_configure.connect
-def setup_periodic_tasks(sender, **kwargs):
+def setup_periodic_tasks(sender: Any, **kwargs: Any) -> None:
     logger.info("Setting up periodic tasks")
     # Fetch Odds every 15 minutes
     sender.add_periodic_task(
-        crontab(minute='*/15'), 
-        run_odds_fetch.s(), 
-        name='fetch-live-odds'
+        crontab(minute="*/15"), run_odds_fetch.s(), name="fetch-live-odds"
     )
     # Fetch Stats once a day at 4am (Stub)
     sender.add_periodic_task(
-        crontab(hour=4, minute=0), 
-        run_stats_fetch.s(), 
-        name='fetch-daily-stats'
+        crontab(hour=4, minute=0), run_stats_fetch.s(), name="fetch-daily-stats"
     )
 
+
 # --- 2. THE TASKS (WORKERS) ---
 
+
 @celery.task
-def run_odds_fetch():
+def run_odds_fetch() -> None:
     logger.info("Starting odds fetch task")
     from sqlmodel import Session
+
     from app.core.db import engine
+
     session = Session(engine)
     try:
-        asyncio.run(update_live_odds(session))
+        refresh = asyncio.run(update_live_odds(session))
         logger.info("Odds fetch task completed")
     except Exception as e:
         logger.error("Odds fetch failed", error=str(e))
+        return
     finally:
         session.close()
+    # Only the matches that are new or whose market moved get re-simulated,
+    # as one batch per refresh
+    if refresh["resimulate"]:
+        try:
+            run_tennis_simulation_batch.delay(
+                [str(match_id) for match_id in refresh["resimulate"]]
+            )
+        except Exception as e:
+            logger.error("Re-simulation enqueue failed", error=str(e))
+
 
 @celery.task
-def run_stats_fetch():
+def run_stats_fetch() -> None:
     logger.info("Fetching daily stats (Not implemented)")
+    # New daily stats: every worker drops its warm profiles and matchups
+    from app.services.warm_cache import publish_stats_version
+
+    publish_stats_version()
+
 
 @celery.task
-def run_tennis_simulation(match_id: str, n_sims: int = 2000):
+def run_tennis_simulation(
+    match_id: str,
+    n_sims: int = 2000,
+    persist_outcomes: bool = True,
+    profile: ProfileMode | None = None,
+) -> SimResult:
     """
     Run the Monte Carlo simulation for a match.
+    persist_outcomes: also save the joint per-sim outcomes to the outcome
+    store (a no-op unless settings.OUTCOME_STORE is set); when off, the
+    matchup's stored outcomes are dropped instead, as they are now stale.
+    profile: "cprofile" or "sample" to save a profile of this run to
+    settings.PROFILE_DIR (off by default, at no cost).
     """
+    with structlog.contextvars.bound_contextvars(match_id=match_id):
+        with profiled(profile, f"run_tennis_simulation-{match_id}"):
+            return _run_tennis_simulation(match_id, n_sims, persist_outcomes)
+
+
+def _run_tennis_simulation(
+    match_id: str, n_sims: int, persist_outcomes: bool
+) -> SimResult:
+    from datetime import datetime
+
     from sqlmodel import Session
+
     from app.core.db import engine
     from app.models.tennis import Match
-    from app.services.data import PLAYERS_DB
-    from app.services.sim_engine import TennisMatchSimulator, PlayerProfile
-    from datetime import datetime
-    
+
+    timer = PhaseTimer()
     session = Session(engine)
+    session_opened = time.perf_counter()
     try:
-        logger.info("Starting simulation", match_id=match_id, n_sims=n_sims)
-        match = session.get(Match, match_id)
+        logger.info("Starting simulation", n_sims=n_sims)
+        with timer.phase("db_load"):
+            # Task arguments arrive as strings; not every backend coerces them
+            match = session.get(Match, uuid.UUID(match_id))
         if not match:
-            logger.error("Match not found", match_id=match_id)
+            logger.error("Match not found")
             return "Match not found"
-        
-        # 1. Load Player Profiles
-        p1_profile = PLAYERS_DB.get(match.player1_name)
-        p2_profile = PLAYERS_DB.get(match.player2_name)
-        
-        if not p1_profile or not p2_profile:
-            logger.error("Missing stats", 
-                         p1=match.player1_name, 
-                         p2=match.player2_name,
-                         p1_found=bool(p1_profile),
-                         p2_found=bool(p2_profile)
-            )
-            return "Missing Player Stats"
-
-        # 2. Run Engine
-        # Convert dict stats to PlayerProfile objects
-        p1_stats = p1_profile["stats"].get(match.surface, p1_profile["stats"]["hard"])
-        p2_stats = p2_profile["stats"].get(match.surface, p2_profile["stats"]["hard"])
-        
-        p1_obj = PlayerProfile(
-            name=p1_profile["name"],
-            serve_1_in_pct=p1_stats["serve_1_in"],
-            serve_1_won_pct=p1_stats["serve_1_won"],
-            serve_2_won_pct=p1_stats["serve_2_won"],
-            ace_pct=p1_stats["ace_rate"],
-            df_pct=p1_stats["df_rate"],
-            return_won_pct=p1_stats["return_won"]
-        )
-        
-        p2_obj = PlayerProfile(
-            name=p2_profile["name"],
-            serve_1_in_pct=p2_stats["serve_1_in"],
-            serve_1_won_pct=p2_stats["serve_1_won"],
-            serve_2_won_pct=p2_stats["serve_2_won"],
-            ace_pct=p2_stats["ace_rate"],
-            df_pct=p2_stats["df_rate"],
-            return_won_pct=p2_stats["return_won"]
-        )
 
-        sim = TennisMatchSimulator(p1_obj, p2_obj, sets_to_win=2) # Default to 2 sets for now
-        results = sim.run(n_sims=n_sims) # Returns List[MatchStats]
-        
-        # 3. Post-Process (Scoring & Aggregating)
-        p1_wins = 0
-        from app.services.fantasy_scoring import calculate_fantasy_points
-        
-        p1_fantasy_points = []
-        p2_fantasy_points = []
-        
-        for res in results:
-            if res.winner == p1_obj.name:
-                p1_wins += 1
-                
-            fp1 = calculate_fantasy_points(res.p1_stats)
-            fp2 = calculate_fantasy_points(res.p2_stats)
-            
-            p1_fantasy_points.append(fp1)
-            p2_fantasy_points.append(fp2)
-            
-        p1_win_pct = p1_wins / n_sims
-        avg_fp1 = sum(p1_fantasy_points) / n_sims
-        avg_fp2 = sum(p2_fantasy_points) / n_sims
-        
+        result = _simulate_match(match, n_sims, persist_outcomes, timer)
+        if isinstance(result, str):
+            return result
+
         # 4. Save Results
-        match.sim_win_prob_p1 = p1_win_pct
-        match.last_simulated_at = datetime.now()
-        session.add(match)
-        session.commit()
-        
-        logger.info("Sim Complete", 
-                    match_id=match_id, 
-                    p1_win_pct=p1_win_pct,
-                    p1_avg_fp=avg_fp1,
-                    simulations=n_sims
+        with timer.phase("commit"):
+            match.sim_win_prob_p1 = result["p1_win_pct"]
+            match.last_simulated_at = datetime.now()
+            session.add(match)
+            session.commit()
+
+        logger.info(
+            "Sim Complete",
+            p1_win_pct=result["p1_win_pct"],
+            p1_avg_fp=result["p1_avg_fp"],
+            simulations=n_sims,
+            timings_ms=timer.timings_ms,
+            total_ms=timer.total_ms,
         )
-        return {"p1_win_pct": p1_win_pct, "p1_avg_fp": avg_fp1, "p2_avg_fp": avg_fp2}
+        return result
     except Exception as e:
-        logger.error("Error in simulation", match_id=match_id, error=str(e))
+        logger.error("Error in simulation", error=str(e), timings_ms=timer.timings_ms)
         return f"Error: {e}"
     finally:
         session.close()
+        metrics.DB_SESSION_DURATION.labels("worker").observe(
+            time.perf_counter() - session_opened
+        )
+
+
+def _simulate_match(
+    match: "Match", n_sims: int, persist_outcomes: bool, timer: PhaseTimer
+) -> SimResult:
+    """
+    Simulate one loaded Match (no database access): the results dict, or a
+    message when a player's stats are missing. Phases add up on timer.
+    """
+    from app.services.fantasy_scoring import calculate_fantasy_points
+    from app.services.outcomes import get_outcome_store, matchup_key, outcome_matrix
+    from app.services.warm_cache import warm_cache
+
+    # 1. Player Profiles and matchup setup, from the process's warm cache
+    with timer.phase("profiles"):
+        sim = warm_cache.simulator(
+            match.player1_name, match.player2_name, match.surface, sets_to_win=2
+        )  # Default to 2 sets for now
+
+    if sim is None:
+        logger.error(
+            "Missing stats",
+            p1=match.player1_name,
+            p2=match.player2_name,
+            p1_found=bool(warm_cache.profile(match.player1_name, match.surface)),
+            p2_found=bool(warm_cache.profile(match.player2_name, match.surface)),
+        )
+        return "Missing Player Stats"
+    p1_obj, p2_obj = sim.p1, sim.p2
+
+    # 2. Run Engine
+    with timer.phase("simulate"):
+        tally = sim.run_batch(n_sims=n_sims)  # One MatchTally of (2, n_sims) arrays
+    metrics.SIMULATED_MATCHES.labels("worker").inc(n_sims)
+
+    # 3. Post-Process (Scoring & Aggregating), all sims at once
+    with timer.phase("scoring"):
+        p1_fantasy_points = calculate_fantasy_points(sim.fantasy_stats(tally, 0))
+        p2_fantasy_points = calculate_fantasy_points(sim.fantasy_stats(tally, 1))
+
+        p1_win_pct = float((tally.winner == 0).mean())
+        avg_fp1 = float(p1_fantasy_points.mean())
+        avg_fp2 = float(p2_fantasy_points.mean())
+
+    # Keep the joint per-sim outcomes for lineups / contests when a store is
+    # configured. Without persist_outcomes the stored ones are dropped, so
+    # they never disagree with the win probability written back to the match
+    store = get_outcome_store()
+    if store:
+        with timer.phase("persist_outcomes"):
+            key = matchup_key(p1_obj.name, p2_obj.name, match.surface, 2)
+            if persist_outcomes:
+                store.save(
+                    key, outcome_matrix(tally, (p1_fantasy_points, p2_fantasy_points))
+                )
+            else:
+                store.delete(key)
+
+    return {"p1_win_pct": p1_win_pct, "p1_avg_fp": avg_fp1, "p2_avg_fp": avg_fp2}
+
+
+@celery.task
+def run_tennis_simulation_batch(
+    match_ids: list[str], n_sims: int = 2000, persist_outcomes: bool = True
+) -> dict[str, SimResult]:
+    """
+    Re-simulate a set of matches in one task (one batch per odds refresh).
+    One session and a constant number of round trips, however many matches:
+    every Match is loaded by one SELECT ... WHERE id IN (...), and every
+    result written by one bulk UPDATE and one commit.
+    """
+    from datetime import datetime
+
+    from sqlmodel import Session, col, select, update
+
+    from app.core.db import engine
+    from app.models.tennis import Match
+
+    logger.info("Starting simulation batch", n_matches=len(match_ids), n_sims=n_sims)
+    timer = PhaseTimer()
+    results: dict[str, SimResult] = {}
+    updates: list[dict[str, Any]] = []
+    session = Session(engine)
+    session_opened = time.perf_counter()
+    try:
+        with timer.phase("db_load"):
+            # Task arguments arrive as strings; not every backend coerces them
+            ids = [uuid.UUID(match_id) for match_id in match_ids]
+            matches = {
+                str(m.id): m
+                for m in session.exec(select(Match).where(col(Match.id).in_(ids)))
+            }
+
+        for match_id in match_ids:
+            match = matches.get(str(uuid.UUID(match_id)))
+            if match is None:
+                logger.error("Match not found", match_id=match_id)
+                results[match_id] = "Match not found"
+                continue
+            # One match failing does not fail the batch
+            with structlog.contextvars.bound_contextvars(match_id=match_id):
+                try:
+                    result = results[match_id] = _simulate_match(
+                        match, n_sims, persist_outcomes, timer
+                    )
+                except Exception as e:
+                    logger.error("Error in simulation", error=str(e))
+                    results[match_id] = f"Error: {e}"
+                    continue
+            if isinstance(result, dict):
+                updates.append(
+                    {
+                        "id": match.id,
+                        "sim_win_prob_p1": result["p1_win_pct"],
+                        "last_simulated_at": datetime.now(),
+                    }
+                )
+
+        if updates:
+            with timer.phase("commit"):
+                # ORM bulk UPDATE by primary key: one executemany
+                session.execute(update(Match), updates)
+                session.commit()
+    finally:
+        session.close()
+        metrics.DB_SESSION_DURATION.labels("worker").observe(
+            time.perf_counter() - session_opened
+        )
+
+    logger.info(
+        "Simulation batch complete",
+        n_matches=len(match_ids),
+        n_simulated=len(updates),
+        timings_ms=timer.timings_ms,
+        total_ms=timer.total_ms,
+    )
+    return results
@@ -0,0 +1,65 @@
+"""
+Fixtures for the simulation benchmarks (scripts/bench.sh).
+
+Every benchmark starts from the same seed and the same two profiles, so a
+change in timing comes from the code, not from longer or shorter matches.
+"""
+
+import random
+from collections.abc import Generator
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.sim_engine import PlayerProfile, TennisMatchSimulator
+
+SEED = 20240601
+
+P1_PROFILE = PlayerProfile(
+    name="Sinner",
+    serve_1_in_pct=0.65,
+    serve_1_won_pct=0.75,
+    serve_2_won_pct=0.55,
+    ace_pct=0.10,
+    df_pct=0.03,
+    return_won_pct=0.30,
+)
+P2_PROFILE = PlayerProfile(
+    name="Alcaraz",
+    serve_1_in_pct=0.65,
+    serve_1_won_pct=0.74,
+    serve_2_won_pct=0.54,
+    ace_pct=0.08,
+    df_pct=0.04,
+    return_won_pct=0.30,
+)
+
+
+@pytest.fixture(autouse=True)
+def seeded() -> None:
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(SEED)
+
+
+@pytest.fixture
+def sim() -> TennisMatchSimulator:
+    return TennisMatchSimulator(P1_PROFILE, P2_PROFILE, sets_to_win=2)
+
+
+@pytest.fixture(scope="module")
+def client() -> Generator[TestClient, None, None]:
+    with TestClient(app) as c:
+        yield c
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json) -> None:
+    # The baseline keeps summary stats only, not every round's timing
+    for bench in output_json["benchmarks"]:
+        bench["stats"].pop("data", None)
@@ -0,0 +1,122 @@
+"""
+Throughput of the simulation hot paths, from one point up to an API call.
+
+    bash scripts/bench.sh            # compare with benchmarks/baseline.json
+    bash scripts/bench.sh --save     # re-record the baseline
+"""
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.fantasy_scoring import calculate_fantasy_points
+from app.services.sim_engine import TennisMatchSimulator
+from app.services.sims.engine import Player, SimulationEngine
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+
+from .conftest import P1_PROFILE, P2_PROFILE, SEED
+
+# Same serve profiles, as the DK engine's conditional rates
+DK_P1 = Player(
+    name="Sinner",
+    first_serve_in_pct=0.65,
+    ace_rate_per_serve=0.154,
+    first_serve_points_won_pct=0.705,
+    df_rate_per_serve=0.086,
+    second_serve_points_won_pct=0.55,
+)
+DK_P2 = Player(
+    name="Alcaraz",
+    first_serve_in_pct=0.65,
+    ace_rate_per_serve=0.123,
+    first_serve_points_won_pct=0.703,
+    df_rate_per_serve=0.114,
+    second_serve_points_won_pct=0.54,
+)
+
+PLAYER_STATS = {"match_win": 1, "sets": 2, "games": 13, "aces": 9, "dfs": 2}
+
+
+# ==================== SCALAR CORE ====================
+
+
+def test_simulate_point(benchmark, sim: TennisMatchSimulator) -> None:
+    benchmark(sim.simulate_point, P1_PROFILE, P2_PROFILE)
+
+
+def test_simulate_game(benchmark, sim: TennisMatchSimulator) -> None:
+    benchmark(sim.simulate_game, 0)
+
+
+def test_simulate_match(benchmark, sim: TennisMatchSimulator) -> None:
+    benchmark(sim.simulate_match)
+
+
+def test_run_100(benchmark, sim: TennisMatchSimulator) -> None:
+    results = benchmark(sim.run, 100)
+    assert len(results) == 100
+
+
+# ==================== BATCHED CORE ====================
+
+
+def test_run_batch_10000(
+    benchmark, sim: TennisMatchSimulator, rng: np.random.Generator
+) -> None:
+    tally = benchmark(sim.run_batch, 10000, rng)
+    assert len(tally.winner) == 10000
+
+
+# ==================== SCORING ====================
+
+
+def test_fantasy_points(benchmark) -> None:
+    benchmark(calculate_fantasy_points, PLAYER_STATS)
+
+
+def test_fantasy_points_10000(
+    benchmark, sim: TennisMatchSimulator, rng: np.random.Generator
+) -> None:
+    stats = sim.fantasy_stats(sim.run_batch(10000, rng), 0)
+    points = benchmark(calculate_fantasy_points, stats)
+    assert points.shape == (10000,)
+
+
+# ==================== DK STACK ====================
+
+
+def test_dk_match(benchmark) -> None:
+    engine = SimulationEngine(seed=SEED)
+    benchmark(engine.simulate_dk_match, DK_P1, DK_P2)
+
+
+def test_dk_projection_1000(benchmark) -> None:
+    engine = SimulationEngine(seed=SEED)
+    projection = benchmark(engine.get_dk_projection, DK_P1, DK_P2, num_simulations=1000)
+    assert projection["total_simulations"] == 1000
+
+
+def test_dk_score_10000(
+    benchmark, sim: TennisMatchSimulator, rng: np.random.Generator
+) -> None:
+    tally = sim.run_batch(10000, rng)
+    calc = DKScoringCalculator()
+    benchmark(tally.fantasy_points, calc.score)
+
+
+# ==================== API ====================
+
+
+def test_ad_hoc_round_trip(benchmark, client: TestClient) -> None:
+    payload = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Carlos Alcaraz",
+        "n_sims": 1000,
+    }
+
+    def round_trip() -> dict:
+        response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+        assert response.status_code == 200
+        return response.json()
+
+    assert benchmark(round_trip)["simulations"] == 1000
@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+# Simulation benchmarks against the committed baseline.
+#
+#   bash scripts/bench.sh           fail if any median is more than BENCH_TOLERANCE% slower (default 20)
+#   bash scripts/bench.sh --save    re-record benchmarks/baseline.json on this machine
+
+set -e
+set -x
+
+BASELINE=benchmarks/baseline.json
+
+if [ "$1" = "--save" ]; then
+    pytest benchmarks/ --benchmark-only --benchmark-json="$BASELINE"
+else
+    pytest benchmarks/ --benchmark-only \
+        --benchmark-compare="$BASELINE" \
+        --benchmark-compare-fail="median:${BENCH_TOLERANCE:-20}%"
+fi
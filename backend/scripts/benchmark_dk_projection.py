@@ -0,0 +1,93 @@
+"""
+Projections per second: sim_engine.TennisMatchSimulator vs the DK engine.
+
+    python scripts/benchmark_dk_projection.py --sims 1000 --repeat 5
+
+A "projection" is one matchup simulated --sims times.
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.sim_engine import PlayerProfile, TennisMatchSimulator
+from app.services.sims.engine import Player, SimulationEngine
+
+P1_PROFILE = PlayerProfile(
+    name="Sinner",
+    serve_1_in_pct=0.65,
+    serve_1_won_pct=0.75,
+    serve_2_won_pct=0.55,
+    ace_pct=0.10,
+    df_pct=0.03,
+    return_won_pct=0.30,
+)
+P2_PROFILE = PlayerProfile(
+    name="Alcaraz",
+    serve_1_in_pct=0.65,
+    serve_1_won_pct=0.74,
+    serve_2_won_pct=0.54,
+    ace_pct=0.08,
+    df_pct=0.04,
+    return_won_pct=0.30,
+)
+
+
+def to_dk_player(profile: PlayerProfile) -> Player:
+    """Same serve profile, expressed as the DK engine's conditional rates"""
+    ace = profile.ace_pct / profile.serve_1_in_pct
+    return Player(
+        name=profile.name,
+        first_serve_in_pct=profile.serve_1_in_pct,
+        ace_rate_per_serve=ace,
+        first_serve_points_won_pct=(profile.serve_1_won_pct - ace) / (1 - ace),
+        df_rate_per_serve=profile.df_pct / (1 - profile.serve_1_in_pct),
+        second_serve_points_won_pct=profile.serve_2_won_pct,
+    )
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sims", type=int, default=1000, help="Simulations per projection"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = SimulationEngine(seed=7)
+    dk1, dk2 = to_dk_player(P1_PROFILE), to_dk_player(P2_PROFILE)
+    tennis_sim = TennisMatchSimulator(P1_PROFILE, P2_PROFILE)
+
+    cases = {
+        "TennisMatchSimulator.run": lambda: tennis_sim.run(n_sims=args.sims),
+        "DKMatchSimulator loop": lambda: [
+            engine.simulate_dk_match(dk1, dk2) for _ in range(args.sims)
+        ],
+        "SimulationEngine.get_dk_projection": lambda: engine.get_dk_projection(
+            dk1, dk2, num_simulations=args.sims
+        ),
+    }
+
+    print(f"{args.sims} sims per projection, best of {args.repeat}")
+    print(f"{'path':<38}{'projections/s':>15}{'matches/s':>14}")
+    for name, fn in cases.items():
+        seconds = timed(fn, args.repeat)
+        print(f"{name:<38}{1 / seconds:>15.2f}{args.sims / seconds:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
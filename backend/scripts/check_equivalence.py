@@ -0,0 +1,46 @@
+"""
+Check a simulation engine against the reference TennisMatchSimulator.
+
+    python scripts/check_equivalence.py --engine batch --sims 20000
+
+Exits non-zero when any matchup of the profile grid fails (see
+app/services/equivalence.py for the tests and margins).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.equivalence import ENGINES, compare_engines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--engine", choices=sorted(ENGINES), default="batch", help="Candidate engine"
+    )
+    parser.add_argument(
+        "--sims", type=int, default=20000, help="Simulations per matchup and engine"
+    )
+    parser.add_argument("--sets-to-win", type=int, default=2, choices=(2, 3))
+    parser.add_argument("--confidence", type=float, default=0.99)
+    parser.add_argument("--ks-alpha", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = compare_engines(
+        ENGINES[args.engine],
+        n_sims=args.sims,
+        sets_to_win=args.sets_to_win,
+        confidence=args.confidence,
+        ks_alpha=args.ks_alpha,
+        seed=args.seed,
+    )
+    print(report.summary())
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
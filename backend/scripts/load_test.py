@@ -0,0 +1,167 @@
+"""
+Load-test the API's read routes at a fixed concurrency.
+
+    python scripts/load_test.py --url http://localhost:8000 --concurrency 50 --duration 30
+
+Each of --concurrency clients requests the paths in turn, back to back,
+for --duration seconds. Prints latency percentiles overall and per window
+(a stable p99 stays flat from window to window) and exits non-zero when the
+overall p99 is over --p99-budget ms or any request failed.
+
+--in-process serves the app through httpx's ASGI transport instead of a
+URL (no server or network; client and app share one event loop).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+DEFAULT_PATHS = ("/api/v1/matches/", "/api/v1/matches/edges")
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    paths,
+    offset: int,
+    deadline: float,
+    samples: list,
+    errors: Counter,
+):
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[f"{path} {response.status_code}"] += 1
+                continue
+        except httpx.HTTPError as e:
+            errors[f"{path} {type(e).__name__}"] += 1
+            continue
+        samples.append((start, time.perf_counter() - start))
+
+
+async def run_load(client: httpx.AsyncClient, paths, concurrency: int, duration: float):
+    """(start time, latency in seconds) of every successful request, and failures by path and cause"""
+    samples: list = []
+    errors: Counter = Counter()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(
+            _client_loop(client, paths, n, deadline, samples, errors)
+            for n in range(concurrency)
+        )
+    )
+    return samples, errors
+
+
+def _percentiles(latencies: np.ndarray) -> str:
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return f"p50 {p50:7.1f}  p95 {p95:7.1f}  p99 {p99:7.1f}  max {latencies.max() * 1000:7.1f} ms"
+
+
+async def main_async(args) -> int:
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    if args.in_process:
+        from app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        )
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.url, limits=limits, timeout=args.timeout
+        )
+
+    async with client:
+        # Warm-up: connections, caches and the first queries are not measured
+        await run_load(
+            client, args.paths, args.concurrency, min(2.0, args.duration / 5)
+        )
+        samples, errors = await run_load(
+            client, args.paths, args.concurrency, args.duration
+        )
+
+    if not samples:
+        print("No successful requests", dict(errors))
+        return 1
+    starts = np.array([s for s, _ in samples])
+    latencies = np.array([lat for _, lat in samples])
+    windows = np.floor((starts - starts.min()) / args.window).astype(int)
+
+    print(
+        f"{len(samples)} requests, {args.concurrency} clients, {len(samples) / args.duration:.0f} req/s"
+    )
+    print(f"  overall      {_percentiles(latencies)}")
+    for w in range(windows.max() + 1):
+        in_window = latencies[windows == w]
+        if len(in_window):
+            window = f"{w * args.window:g}-{(w + 1) * args.window:g}s"
+            print(f"  {window:<12} {_percentiles(in_window)}")
+    for cause, count in errors.most_common():
+        print(f"  FAILED {count} x {cause}")
+
+    p99_ms = float(np.percentile(latencies, 99) * 1000)
+    if errors or (args.p99_budget and p99_ms > args.p99_budget):
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--url", default="http://localhost:8000", help="Base URL of the API"
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Serve app.main in-process instead of --url",
+    )
+    parser.add_argument(
+        "--path",
+        dest="paths",
+        action="append",
+        help=f"Path to request (repeatable; default {', '.join(DEFAULT_PATHS)})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=50, help="Concurrent clients"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Seconds to measure"
+    )
+    parser.add_argument(
+        "--window", type=float, default=5.0, help="Seconds per reported window"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10.0, help="Per-request timeout, seconds"
+    )
+    parser.add_argument(
+        "--p99-budget",
+        type=float,
+        default=250.0,
+        help="Fail when the overall p99 is above this (ms; 0 = off)",
+    )
+    args = parser.parse_args()
+    args.paths = args.paths or list(DEFAULT_PATHS)
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
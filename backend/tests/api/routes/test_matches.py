@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+
+from app.core.config import settings
+from app.models.tennis import Match
+
+
+def test_read_slate_edges(client: TestClient, db: Session) -> None:
+    db.execute(delete(Match))
+    start = datetime.now() + timedelta(hours=2)
+    simulated = Match(
+        player1_name="Jannik Sinner",
+        player2_name="Carlos Alcaraz",
+        start_time=start,
+        p1_odds=-110,
+        p2_odds=-110,
+        sim_win_prob_p1=0.6,
+    )
+    pending = Match(
+        player1_name="Novak Djokovic",
+        player2_name="Daniil Medvedev",
+        start_time=start + timedelta(hours=1),
+        p1_odds=-200,
+        p2_odds=170,
+    )
+    history = Match(
+        player1_name="Novak Djokovic",
+        player2_name="Carlos Alcaraz",
+        start_time=datetime.now() - timedelta(days=10),
+    )
+    db.add_all([simulated, pending, history])
+    db.commit()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/matches/edges",
+        params={"method": "power", "kelly_multiplier": 1.0},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["method"] == "power"
+    assert content["count"] == 2
+
+    first, second = content["data"]
+    assert first["match_id"] == str(simulated.id)
+    assert abs(first["p1_edge"] - 0.1) < 1e-9
+    assert first["p1_kelly"] > 0
+    assert second["p1_edge"] is None
+    assert abs(second["p1_fair_prob"] + second["p2_fair_prob"] - 1) < 1e-9
+
+    db.execute(delete(Match))
+    db.commit()
+
+
+def test_read_slate_edges_bad_method(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/matches/edges", params={"method": "nope"}
+    )
+    assert response.status_code == 422
+
+
+def test_read_slate_edges_bad_kelly_multiplier(client: TestClient) -> None:
+    for kelly_multiplier in (0, -0.5, 1.5):
+        response = client.get(
+            f"{settings.API_V1_STR}/matches/edges",
+            params={"kelly_multiplier": kelly_multiplier},
+        )
+        assert response.status_code == 422
+
+
+def test_read_matches_and_match(client: TestClient, db: Session) -> None:
+    db.execute(delete(Match))
+    match = Match(
+        player1_name="Jannik Sinner",
+        player2_name="Carlos Alcaraz",
+        start_time=datetime.now() + timedelta(hours=1),
+        sim_win_prob_p1=0.55,
+    )
+    db.add(match)
+    db.commit()
+
+    response = client.get(f"{settings.API_V1_STR}/matches/")
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()] == [str(match.id)]
+
+    response = client.get(f"{settings.API_V1_STR}/matches/{match.id}")
+    assert response.status_code == 200
+    assert response.json()["sim_win_prob_p1"] == 0.55
+
+    response = client.get(f"{settings.API_V1_STR}/matches/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+    db.execute(delete(Match))
+    db.commit()
@@ -0,0 +1,342 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, delete
+
+from app.core.config import settings
+from app.models import Player, PlayerStats
+from app.services import outcomes
+from app.services.outcomes import FileOutcomeStore
+
+
+def test_ad_hoc_simulation(client: TestClient) -> None:
+    payload = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Carlos Alcaraz",
+        "n_sims": 20,
+    }
+    response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["simulations"] == 20
+    assert 0 <= content["p1_win_pct"] <= 1
+    assert -1 <= content["fantasy_points_correlation"] <= 1
+    assert content["outcomes_key"] is None
+
+
+def test_ad_hoc_simulation_from_start_state(client: TestClient) -> None:
+    payload = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Carlos Alcaraz",
+        "n_sims": 20,
+        "start_state": {
+            "p1_sets": 1,
+            "p1_games": 5,
+            "p1_prior_games": 6,
+            "p1_aces": 12,
+        },
+    }
+    response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+    assert response.status_code == 200
+    assert response.json()["p1_avg_aces"] >= 12
+
+
+def test_ad_hoc_simulation_finished_start_state(client: TestClient) -> None:
+    payload = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Carlos Alcaraz",
+        "start_state": {"p2_sets": 2},
+    }
+    response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+    assert response.status_code == 400
+
+
+def test_ad_hoc_simulation_invalid_start_state(client: TestClient) -> None:
+    for start_state, detail in [
+        ({"server": 2}, "server must be"),
+        ({"p1_games": 9, "p2_games": 0}, "Invalid game score"),
+        ({"p1_points": -3}, "non-negative"),
+        ({"p1_points": 5, "p2_points": 1}, "Invalid point score"),
+    ]:
+        payload = {
+            "player1_name": "Jannik Sinner",
+            "player2_name": "Carlos Alcaraz",
+            "start_state": start_state,
+        }
+        response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+        assert response.status_code == 400
+        assert detail in response.json()["detail"]
+
+
+def test_live_win_prob(client: TestClient) -> None:
+    params = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Daniil Medvedev",
+        "surface": "Hard",
+        "p1_sets": 1,
+        "p1_games": 5,
+        "p2_games": 4,
+        "p1_points": 3,
+        "server": 0,
+    }
+    response = client.get(
+        f"{settings.API_V1_STR}/simulation/live-win-prob", params=params
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["p1_win_prob"] > 0.95
+    assert abs(content["p1_win_prob"] + content["p2_win_prob"] - 1) < 1e-9
+
+
+def test_live_win_prob_invalid_score(client: TestClient) -> None:
+    params = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Daniil Medvedev",
+        "p1_games": 6,
+        "p2_games": 2,
+    }
+    response = client.get(
+        f"{settings.API_V1_STR}/simulation/live-win-prob", params=params
+    )
+    assert response.status_code == 400
+
+
+def test_live_win_prob_unknown_player(client: TestClient) -> None:
+    params = {"player1_name": "Nobody", "player2_name": "Daniil Medvedev"}
+    response = client.get(
+        f"{settings.API_V1_STR}/simulation/live-win-prob", params=params
+    )
+    assert response.status_code == 404
+
+
+def test_tournament_simulation(client: TestClient, db: Session) -> None:
+    # Stats favour the low numbers, clay Elo the high ones
+    players = [
+        Player(name=f"Tournament Player {i}", elo_clay=1700 + 15 * i) for i in range(32)
+    ]
+    db.add_all(players)
+    db.commit()
+    for i, player in enumerate(players):
+        db.add(
+            PlayerStats(
+                player_id=player.id,
+                surface="All",
+                serve_1_in_pct=0.62,
+                serve_1_won_pct=0.75 - 0.003 * i,
+                serve_2_won_pct=0.53,
+                ace_pct=0.08,
+                df_pct=0.03,
+                return_won_pct=0.38,
+            )
+        )
+    db.commit()
+
+    ids = [str(p.id) for p in players]
+    payload = {"player_ids": ids[:31] + [None], "surface": "Clay", "n_sims": 200}
+    response = client.post(f"{settings.API_V1_STR}/simulation/tournament", json=payload)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["rounds"] == ["R32", "R16", "QF", "SF", "F", "W"]
+    assert len(content["players"]) == 31
+    assert sum(p["reach"]["W"] for p in content["players"]) == pytest.approx(1.0)
+    # Player 30 drew the bye
+    assert content["players"][30]["reach"]["R16"] == 1.0
+
+    payload["elo_weight"] = 1.0
+    response = client.post(f"{settings.API_V1_STR}/simulation/tournament", json=payload)
+    assert response.status_code == 200
+    elo_players = response.json()["players"]
+    assert elo_players[29]["reach"]["W"] > content["players"][29]["reach"]["W"]
+    assert elo_players[0]["reach"]["W"] < content["players"][0]["reach"]["W"]
+
+    response = client.post(
+        f"{settings.API_V1_STR}/simulation/tournament", json={"player_ids": ids[:16]}
+    )
+    assert response.status_code == 400
+
+    player_ids = [p.id for p in players]
+    db.execute(delete(PlayerStats).where(col(PlayerStats.player_id).in_(player_ids)))
+    db.execute(delete(Player).where(col(Player.id).in_(player_ids)))
+    db.commit()
+
+
+def test_lineup_optimizer(client: TestClient) -> None:
+    payload = {
+        "matches": [
+            {
+                "player1": {"name": "Jannik Sinner", "salary": 10500},
+                "player2": {"name": "Carlos Alcaraz", "salary": 10200},
+            },
+            {
+                "player1": {"name": "Novak Djokovic", "salary": 9400},
+                "player2": {"name": "Daniil Medvedev", "salary": 8100},
+            },
+        ],
+        "n_sims": 200,
+        "lineup_size": 2,
+        "salary_cap": 20000,
+        "objective": "win_prob",
+        "field_size": 50,
+    }
+    response = client.post(f"{settings.API_V1_STR}/simulation/lineups", json=payload)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == len(content["data"]) > 0
+    for lineup in content["data"]:
+        assert lineup["salary"] <= 20000
+        assert 0 <= lineup["win_prob"] <= 1
+
+    # 30 players, exactly one 6-player lineup under the cap: no random field can be drawn
+    tight = {
+        **payload,
+        "n_sims": 100,
+        "lineup_size": 6,
+        "salary_cap": 30000,
+        "field_size": 10,
+    }
+    tight["matches"] = [
+        {
+            "player1": {"name": "Jannik Sinner", "salary": 5000 if m < 3 else 5001},
+            "player2": {"name": "Carlos Alcaraz", "salary": 5000 if m < 3 else 5001},
+        }
+        for m in range(15)
+    ]
+    response = client.post(f"{settings.API_V1_STR}/simulation/lineups", json=tight)
+    assert response.status_code == 400
+    assert "too tight" in response.json()["detail"]
+
+    payload["matches"][0]["player1"]["name"] = "Unknown Player"
+    response = client.post(f"{settings.API_V1_STR}/simulation/lineups", json=payload)
+    assert response.status_code == 404
+
+
+def test_ad_hoc_simulation_persists_outcomes(
+    client: TestClient, tmp_path, monkeypatch
+) -> None:
+    payload = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Carlos Alcaraz",
+        "n_sims": 300,
+        "persist_outcomes": True,
+    }
+    monkeypatch.setattr(outcomes, "get_outcome_store", lambda: None)
+    response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+    assert response.status_code == 400
+
+    store = FileOutcomeStore(str(tmp_path))
+    monkeypatch.setattr(outcomes, "get_outcome_store", lambda: store)
+    response = client.post(f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload)
+    assert response.status_code == 200
+    content = response.json()
+    matrix = store.load(content["outcomes_key"])
+    assert len(matrix) == 300
+    assert matrix["fantasy_points"][:, 0].mean() == pytest.approx(
+        content["p1_avg_fantasy_points"], rel=1e-5
+    )
+
+    # The lineup optimizer reuses the stored matchup instead of re-simulating
+    lineup_payload = {
+        "matches": [
+            {
+                "player1": {"name": "Jannik Sinner", "salary": 9000},
+                "player2": {"name": "Carlos Alcaraz", "salary": 9000},
+            }
+        ],
+        "n_sims": 300,
+        "lineup_size": 1,
+        "top_k": 2,
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/simulation/lineups", json=lineup_payload
+    )
+    assert response.status_code == 200
+    lineups = response.json()["data"]
+    wins = (matrix["winner"] == 0).mean()
+    assert len(lineups) == 2
+    assert {lu["players"][0] for lu in lineups} == {"Jannik Sinner", "Carlos Alcaraz"}
+    assert 0 < wins < 1
+
+
+def test_contest_simulation(client: TestClient) -> None:
+    payload = {
+        "matches": [
+            {
+                "player1": {"name": "Jannik Sinner", "salary": 10500, "ownership": 0.6},
+                "player2": {
+                    "name": "Carlos Alcaraz",
+                    "salary": 10200,
+                    "ownership": 0.5,
+                },
+            },
+            {
+                "player1": {"name": "Novak Djokovic", "salary": 9400, "ownership": 0.4},
+                "player2": {
+                    "name": "Daniil Medvedev",
+                    "salary": 8100,
+                    "ownership": 0.3,
+                },
+            },
+        ],
+        "lineups": [
+            ["Jannik Sinner", "Novak Djokovic"],
+            ["Carlos Alcaraz", "Daniil Medvedev"],
+        ],
+        "n_sims": 200,
+        "salary_cap": 20000,
+        "field_size": 98,
+        "entry_fee": 5,
+        "payouts": [
+            {"first_place": 1, "last_place": 1, "prize": 200},
+            {"first_place": 2, "last_place": 20, "prize": 10},
+        ],
+    }
+    response = client.post(f"{settings.API_V1_STR}/simulation/contest", json=payload)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["entries"] == 100
+    assert content["count"] == 2
+    for lineup in content["data"]:
+        assert 0 <= lineup["cash_rate"] <= 1
+        assert lineup["roi"] == pytest.approx(lineup["expected_payout"] / 5 - 1)
+        assert 1 <= lineup["finish"]["p10"] <= lineup["finish"]["p90"] <= 100
+
+    payload["matches"][1]["player2"]["ownership"] = None
+    response = client.post(f"{settings.API_V1_STR}/simulation/contest", json=payload)
+    assert response.status_code == 400
+
+    payload["lineups"][0] = ["Jannik Sinner", "Roger Federer"]
+    response = client.post(f"{settings.API_V1_STR}/simulation/contest", json=payload)
+    assert response.status_code == 400
+
+
+def test_contest_rejects_ambiguous_or_over_cap_entries(client: TestClient) -> None:
+    payload = {
+        "matches": [
+            {
+                "player1": {"name": "Jannik Sinner", "salary": 10500},
+                "player2": {"name": "Carlos Alcaraz", "salary": 10200},
+            },
+            {
+                "player1": {"name": "Novak Djokovic", "salary": 9400},
+                "player2": {"name": "Daniil Medvedev", "salary": 8100},
+            },
+        ],
+        "lineups": [
+            ["Jannik Sinner", "Novak Djokovic"],
+            ["Jannik Sinner", "Carlos Alcaraz"],
+        ],
+        "n_sims": 200,
+        "salary_cap": 20000,
+        "field_size": 10,
+        "entry_fee": 5,
+        "payouts": [{"first_place": 1, "last_place": 1, "prize": 50}],
+    }
+    # Sinner + Alcaraz is 20700
+    response = client.post(f"{settings.API_V1_STR}/simulation/contest", json=payload)
+    assert response.status_code == 400
+    assert "salary cap" in response.json()["detail"]
+
+    payload["lineups"] = [["Jannik Sinner", "Novak Djokovic"]]
+    payload["matches"][1]["player2"]["name"] = "Jannik Sinner"
+    response = client.post(f"{settings.API_V1_STR}/simulation/contest", json=payload)
+    assert response.status_code == 400
+    assert "more than one slate match" in response.json()["detail"]
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from app.services.contest import payout_table, simulate_contest
+from app.services.lineups import random_field
+
+_rng = np.random.default_rng(1)
+# Coarse points so that ties are common
+POINTS = np.round(_rng.gamma(4, 5, size=(400, 10)) * 4) / 4
+
+
+def _brute_force(lineups: np.ndarray, field: np.ndarray, prizes: np.ndarray):
+    entries = np.concatenate([lineups, field])
+    paid = np.zeros(len(entries))
+    paid[: len(prizes)] = prizes
+    ranks = np.empty((len(POINTS), len(lineups)), dtype=int)
+    payouts = np.empty((len(POINTS), len(lineups)))
+    for w, world in enumerate(POINTS):
+        totals = world[entries].sum(axis=1)
+        order = np.sort(totals)[::-1]
+        for i in range(len(lineups)):
+            places = np.flatnonzero(order == totals[i])
+            ranks[w, i] = places[0] + 1
+            payouts[w, i] = paid[places].mean()
+    return ranks, payouts
+
+
+def test_matches_brute_force_with_ties() -> None:
+    lineups = np.array([[0, 1, 2], [3, 4, 5], [0, 1, 2], [6, 7, 8]])
+    field = np.stack([_rng.choice(10, 3, replace=False) for _ in range(60)])
+    prizes = payout_table([(1, 1, 100), (2, 5, 20), (6, 15, 5)], 64)
+
+    result = simulate_contest(
+        POINTS, lineups, field, prizes, entry_fee=3, chunk_size=64
+    )
+    ranks, payouts = _brute_force(lineups, field, prizes)
+    assert np.array_equal(result.ranks, ranks)
+    np.testing.assert_allclose(result.payouts, payouts)
+
+    # Duplicated entries always finish level and split the same prizes
+    assert np.array_equal(result.payouts[:, 0], result.payouts[:, 2])
+    assert result.n_entries == 64
+    np.testing.assert_allclose(result.roi, result.expected_payout / 3 - 1)
+    assert np.all((0 <= result.cash_rate) & (result.cash_rate <= 1))
+
+
+def test_identical_field_splits_the_pool() -> None:
+    lineup = np.array([[1, 2, 3]])
+    field = np.repeat(lineup, 9, axis=0)
+    prizes = payout_table([(1, 1, 50), (2, 3, 25)], 10)
+    result = simulate_contest(POINTS, lineup, field, prizes, entry_fee=10)
+    assert np.all(result.ranks == 1)
+    np.testing.assert_allclose(result.payouts, 10.0)
+    np.testing.assert_allclose(result.roi, 0.0)
+
+
+def test_payout_table() -> None:
+    prizes = payout_table([(1, 1, 1000), (2, 3, 250)], 5)
+    assert prizes.tolist() == [1000, 250, 250, 0, 0]
+    with pytest.raises(ValueError):
+        payout_table([(4, 6, 10)], 5)
+    with pytest.raises(ValueError):
+        simulate_contest(
+            POINTS, np.array([[0, 1, 2]]), np.array([[3, 4, 5]]), np.ones(3), 1.0
+        )
+
+
+def test_ownership_weighted_field() -> None:
+    salaries = np.full(10, 5000)
+    ownership = np.array([0.9, 0.5, 0.5, 0.3, 0.3, 0.2, 0.2, 0.1, 0.0, 0.0])
+    field = random_field(
+        POINTS, salaries, 5000, 15000, 3, np.random.default_rng(0), ownership=ownership
+    )
+    counts = np.bincount(field.ravel(), minlength=10)
+    assert counts[8] == counts[9] == 0
+    assert counts[0] > counts[1] > counts[7] > 0
+    with pytest.raises(ValueError):
+        random_field(
+            POINTS, salaries, 10, 15000, 3, ownership=np.r_[np.ones(2), np.zeros(8)]
+        )
@@ -0,0 +1,28 @@
+import pytest
+
+from app.core import db
+from app.core.config import settings
+from app.worker import reset_db_pool
+
+
+def test_pool_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert db.pool_options(5, 10, 30.0) == {}
+
+    monkeypatch.setattr(settings, "USE_SQLITE", False)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 600)
+    assert db.pool_options(5, 10, 30.0) == {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+    }
+
+
+def test_forked_worker_gets_a_fresh_pool() -> None:
+    inherited = db.engine.pool
+    with db.engine.connect():
+        pass
+    reset_db_pool()
+    assert db.engine.pool is not inherited
+    assert inherited.checkedin() == 1  # left for the parent, not closed
@@ -0,0 +1,255 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from app.services.sims import SimulationEngine
+from app.services.sims.engine import Player
+from app.services.sims.models.match_result import DKMatchResult
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+from app.services.sims.simulation.match_simulator import DKMatchSimulator
+from app.services.sims.simulation.point_simulator import (
+    PointEvent,
+    PointEventLog,
+    PointSimulator,
+)
+
+P1 = Player(
+    name="Big Server",
+    first_serve_in_pct=0.62,
+    ace_rate_per_serve=0.15,
+    first_serve_points_won_pct=0.72,
+    df_rate_per_serve=0.08,
+    second_serve_points_won_pct=0.52,
+)
+
+P2 = Player(
+    name="Grinder",
+    first_serve_in_pct=0.66,
+    ace_rate_per_serve=0.05,
+    first_serve_points_won_pct=0.66,
+    df_rate_per_serve=0.10,
+    second_serve_points_won_pct=0.50,
+)
+
+
+def test_calculator_scores_bo3_match() -> None:
+    calc = DKScoringCalculator("BEST_OF_3")
+    stats = {
+        "match_played": True,
+        "walkover": False,
+        "games_won": 12,
+        "games_lost": 3,
+        "sets_won": 2,
+        "sets_lost": 0,
+        "match_won": True,
+        "aces": 10,
+        "double_faults": 0,
+        "breaks": 4,
+        "clean_sets": 1,
+        "straight_sets_win": True,
+    }
+    # 30 + 30 - 6 + 12 + 6 + 4 + 3 + 4 + 6 + 2.5 (no DF) + 2 (10+ aces)
+    assert calc.calculate_player_points(stats) == pytest.approx(93.5)
+
+    assert (
+        calc.calculate_player_points({"walkover": True})
+        == calc.scoring_config["WALKOVER"]
+    )
+    assert calc.calculate_player_points({"match_played": False}) == 0.0
+
+
+def test_calculator_batch_matches_single() -> None:
+    calc = DKScoringCalculator("BEST_OF_5")
+    rows = [
+        {
+            "games_won": 18,
+            "games_lost": 10,
+            "sets_won": 3,
+            "sets_lost": 1,
+            "match_won": True,
+            "aces": 15,
+            "double_faults": 2,
+            "breaks": 5,
+            "clean_sets": 0,
+            "straight_sets_win": False,
+        },
+        {
+            "games_won": 10,
+            "games_lost": 18,
+            "sets_won": 1,
+            "sets_lost": 3,
+            "match_won": False,
+            "aces": 3,
+            "double_faults": 0,
+            "breaks": 2,
+            "clean_sets": 0,
+            "straight_sets_win": False,
+        },
+    ]
+    batch = {k: np.array([r[k] for r in rows]) for k in rows[0]}
+    single = [calc.calculate_player_points({**r, "match_played": True}) for r in rows]
+    assert calc.score(batch) == pytest.approx(single)
+
+
+def test_unknown_format_rejected() -> None:
+    with pytest.raises(ValueError):
+        DKScoringCalculator("BEST_OF_7")
+
+
+def test_dk_match_is_consistent() -> None:
+    random.seed(3)
+    sim = DKMatchSimulator("BEST_OF_3")
+    for _ in range(50):
+        result = sim.simulate_dk_match(P1, P2)
+        assert isinstance(result, DKMatchResult)
+        assert max(result.player1_sets_won, result.player2_sets_won) == 2
+        assert (
+            result.total_sets_played
+            == result.player1_sets_won + result.player2_sets_won
+        )
+        # Both players' game totals are credited, not just the set winner's
+        assert result.player1_games_won == result.player2_games_lost
+        assert result.player2_games_won == result.player1_games_lost
+        # No trace: the point log stays empty
+        assert len(result.events) == 0
+
+
+def test_trace_mode_log_agrees_with_counters() -> None:
+    random.seed(5)
+    sim = DKMatchSimulator("BEST_OF_3", trace=True)
+    result = sim.simulate_dk_match(P1, P2)
+
+    log = result.events
+    assert result.player1_events is log and result.player2_events is log
+    assert len(log.set_starts) == result.total_sets_played
+    aces = sum(
+        1 for e in log if e["type"] == PointEvent.ACE.value and e["player"] == P1.name
+    )
+    assert aces == result.player1_aces
+    dfs = sum(
+        1
+        for e in log
+        if e["type"] == PointEvent.DOUBLE_FAULT.value and e["player"] == P2.name
+    )
+    assert dfs == result.player2_double_faults
+
+    # Set views are zero-copy and keep absolute point numbers
+    second_set = log.for_set(2)
+    assert second_set[0]["timestamp"] == log.set_starts[1]
+    assert sum(len(log.for_set(i + 1)) for i in range(result.total_sets_played)) == len(
+        log
+    )
+    assert pickle.loads(pickle.dumps(log)) == log
+
+
+# Point histories recorded by the engine before per-point counters and the
+# compact log (one letter per point: Ace, Double fault, rally Won or Lost by
+# the server, and the server's index). These seeds play the same points in
+# both engines, so the decoded log and the counters must reproduce them.
+_LETTERS = {
+    "A": PointEvent.ACE,
+    "D": PointEvent.DOUBLE_FAULT,
+    "W": PointEvent.RALLY_WIN,
+    "L": PointEvent.RALLY_LOSS,
+}
+
+
+def _history(events: str, servers: str) -> list[dict[str, object]]:
+    """The old list-of-dicts history: rally losses go to the returner"""
+    names = (P1.name, P2.name)
+    return [
+        {
+            "type": _LETTERS[letter].value,
+            "player": names[1 - int(server) if letter == "L" else int(server)],
+            "timestamp": i,
+        }
+        for i, (letter, server) in enumerate(zip(events, servers, strict=True))
+    ]
+
+
+def test_seeded_match_reproduces_pre_change_history() -> None:
+    events = (
+        "WWWWLLLWALLWWLWWLLWLWWLWLDALLAAWALWWLLLWWWLLAWWWWDWWLWLWWWWWWWWWLLLWWWD"
+        "LLWWWLWLLWWWLAALWWWWWWLWWWWLLWLLWAWAWLLWLLWWLWWWLLLLWWWLWWAWLWLWWWWLWLLL"
+        "AWWW"
+    )
+    servers = (
+        "000011111100000011111111110000001111111111000000111111000001111000000000"
+        "011111000000001111100000111111111100000000000011111000001111100000111110"
+        "000"
+    )
+    random.seed(3)
+    result = DKMatchSimulator("BEST_OF_3", trace=True).simulate_dk_match(P1, P2)
+    assert list(result.events) == _history(events, servers)
+    assert list(result.events.set_starts) == [0, 48, 106]
+    # Each point counted once (the old per-set rescan counted earlier sets again)
+    counts = (
+        result.player1_aces,
+        result.player1_double_faults,
+        result.player2_aces,
+        result.player2_double_faults,
+    )
+    assert counts == (8, 1, 4, 2)
+
+    # The trace only records: the same seed without it gives the same counts
+    random.seed(3)
+    untraced = DKMatchSimulator("BEST_OF_3").simulate_dk_match(P1, P2)
+    assert untraced.player1_aces == result.player1_aces
+    assert untraced.player2_double_faults == result.player2_double_faults
+
+
+def test_point_simulator_reproduces_pre_change_history() -> None:
+    random.seed(12)
+    sim = PointSimulator(trace=True)
+    sim.reset((P1.name, P2.name))
+    for i in range(24):
+        sim.simulate_point(*((P1, P2) if i % 2 == 0 else (P2, P1)))
+
+    assert list(sim.point_history) == _history("WALLWWDWDWLWWDWWALWWWWWW", "01" * 12)
+    counts = {
+        p.name: (
+            sim.count(p.name, PointEvent.ACE),
+            sim.count(p.name, PointEvent.DOUBLE_FAULT),
+        )
+        for p in (P1, P2)
+    }
+    assert counts == {P1.name: (1, 2), P2.name: (1, 1)}
+    assert sim.points_played == 24
+
+
+def test_walkover() -> None:
+    result = SimulationEngine().simulate_dk_match(P1, P2, walkover=True)
+    assert result.walkover
+    assert result.player1_dk_points == DKScoringCalculator().scoring_config["WALKOVER"]
+    assert result.events == PointEventLog((P1.name, P2.name))
+
+
+def test_projection_matches_object_simulator() -> None:
+    n = 3000
+    engine = SimulationEngine(seed=11)
+    projection = engine.get_dk_projection(P1, P2, num_simulations=n)
+
+    results = [engine.simulate_dk_match(P1, P2) for _ in range(n)]
+    loop_points = np.array([r.player1_dk_points for r in results])
+    loop_win = np.mean([r.winner == P1.name for r in results])
+
+    assert projection["total_simulations"] == n
+    assert projection["player1_win_rate"] + projection[
+        "player2_win_rate"
+    ] == pytest.approx(1.0)
+    # Same model, independent samples: agree within a few standard errors
+    se = loop_points.std() / np.sqrt(n) * np.sqrt(2)
+    assert abs(projection["player1_avg_dk_points"] - loop_points.mean()) < 4 * se
+    assert abs(projection["player1_win_rate"] - loop_win) < 4 * np.sqrt(2 * 0.25 / n)
+
+
+def test_projection_is_reproducible_with_seed() -> None:
+    first = SimulationEngine(seed=42).get_dk_projection(
+        P1, P2, "BEST_OF_5", num_simulations=200
+    )
+    second = SimulationEngine(seed=42).get_dk_projection(
+        P1, P2, "BEST_OF_5", num_simulations=200
+    )
+    assert first["player1_avg_dk_points"] == second["player1_avg_dk_points"]
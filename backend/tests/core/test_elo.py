@@ -0,0 +1,80 @@
+import pytest
+
+from app.services.elo import EloBlend, elo_win_prob, match_win_grid, shift_point_win
+from app.services.sim_core import adjusted_rally
+from app.services.sim_engine import PlayerProfile
+from app.services.win_prob import live_table
+
+FAVOURITE = PlayerProfile(
+    "Favourite", 0.62, 0.76, 0.55, 0.10, 0.03, return_won_pct=0.36, elo=2150
+)
+UNDERDOG = PlayerProfile(
+    "Underdog", 0.60, 0.72, 0.52, 0.07, 0.04, return_won_pct=0.38, elo=1900
+)
+
+
+def _exact(p1_serve: float, p2_serve: float, sets_to_win: int = 2) -> float:
+    """P(p1 wins) with a coin toss for the first server"""
+    return 0.5 * (
+        live_table(p1_serve, p2_serve, sets_to_win).pre_match
+        + 1.0
+        - live_table(p2_serve, p1_serve, sets_to_win).pre_match
+    )
+
+
+def test_elo_win_prob() -> None:
+    assert elo_win_prob(1800, 1800) == 0.5
+    assert elo_win_prob(2200, 1800) == pytest.approx(10 / 11)
+    assert elo_win_prob(1800, 2200) == pytest.approx(1 / 11)
+
+
+@pytest.mark.parametrize("sets_to_win", [2, 3])
+def test_grid_matches_the_exact_chain(sets_to_win: int) -> None:
+    grid = match_win_grid(sets_to_win)
+    for p1, p2 in [(0.64, 0.61), (0.55, 0.70), (0.72, 0.72), (0.80, 0.58)]:
+        assert grid.win_prob(p1, p2) == pytest.approx(
+            _exact(p1, p2, sets_to_win), abs=1e-3
+        )
+        q1, q2 = grid.calibrate(p1, p2, 0.3)
+        assert q1 + q2 == pytest.approx(p1 + p2)
+        assert _exact(q1, q2, sets_to_win) == pytest.approx(0.3, abs=1e-3)
+
+
+def test_full_weight_matches_elo() -> None:
+    model = EloBlend(weight=1.0)
+    fav, dog = model(FAVOURITE, UNDERDOG), model(UNDERDOG, FAVOURITE)
+    assert _exact(fav.point_win, dog.point_win) == pytest.approx(
+        elo_win_prob(2150, 1900), abs=1e-3
+    )
+
+    # Only the rallies move; ace and double fault rates stay the player's own
+    base = adjusted_rally(FAVOURITE, UNDERDOG)
+    assert (fav.first_in, fav.ace, fav.df) == (base.first_in, base.ace, base.df)
+
+
+def test_blend_lies_between_stats_and_elo() -> None:
+    stats = _exact(
+        adjusted_rally(UNDERDOG, FAVOURITE).point_win,
+        adjusted_rally(FAVOURITE, UNDERDOG).point_win,
+    )
+    elo = elo_win_prob(1900, 2150)
+    half = EloBlend(weight=0.5)
+    blended = _exact(
+        half(UNDERDOG, FAVOURITE).point_win, half(FAVOURITE, UNDERDOG).point_win
+    )
+    assert min(stats, elo) < blended < max(stats, elo)
+
+
+def test_falls_back_without_elo() -> None:
+    unrated = PlayerProfile("Unrated", 0.60, 0.72, 0.52, 0.07, 0.04)
+    assert EloBlend(1.0)(FAVOURITE, unrated) == adjusted_rally(FAVOURITE, unrated)
+    assert EloBlend(0.0)(FAVOURITE, UNDERDOG) == adjusted_rally(FAVOURITE, UNDERDOG)
+    with pytest.raises(ValueError):
+        EloBlend(1.5)
+
+
+def test_shift_point_win() -> None:
+    probs = adjusted_rally(FAVOURITE, UNDERDOG)
+    assert shift_point_win(probs, 0.02).point_win == pytest.approx(
+        probs.point_win + 0.02
+    )
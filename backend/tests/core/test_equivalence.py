@@ -0,0 +1,47 @@
+import numpy as np
+
+from app.services.equivalence import (
+    DEFAULT_MARGINS,
+    batch_engine,
+    compare_engines,
+    ks_2samp,
+    profile_grid,
+)
+from app.services.sim_engine import PlayerProfile, TennisMatchSimulator
+
+# Margins for small test samples
+WIDE_MARGINS = {name: 3 * margin for name, margin in DEFAULT_MARGINS.items()}
+
+
+def test_ks_2samp() -> None:
+    rng = np.random.default_rng(0)
+    same = ks_2samp(rng.normal(size=5000), rng.normal(size=5000))
+    shifted = ks_2samp(rng.normal(size=5000), rng.normal(0.1, size=5000))
+    assert same[1] > 0.01
+    assert shifted[1] < 1e-4
+    assert 0 < same[0] < shifted[0] < 1
+
+
+def test_batch_engine_is_equivalent() -> None:
+    report = compare_engines(
+        batch_engine, matchups=profile_grid()[:2], n_sims=2000, margins=WIDE_MARGINS
+    )
+    assert report.passed, report.summary()
+    assert len(report.matchups) == 2
+    assert report.summary().endswith("PASS")
+
+
+def test_biased_engine_is_rejected() -> None:
+    def stronger_p1(p1: PlayerProfile, p2: PlayerProfile, n_sims, sets_to_win, rng):
+        boosted = PlayerProfile(
+            **{**vars(p1), "serve_1_won_pct": p1.serve_1_won_pct + 0.06}
+        )
+        return TennisMatchSimulator(boosted, p2, sets_to_win=sets_to_win).run_batch(
+            n_sims, rng
+        )
+
+    report = compare_engines(
+        stronger_p1, matchups=profile_grid()[:1], n_sims=2000, margins=WIDE_MARGINS
+    )
+    assert not report.passed
+    assert any("win_prob" in failure for failure in report.failures)
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2]
+
+# Loaded on first use only: Celery (triggering a task), mail, Sentry, scrapers,
+# NumPy and the simulators (simulation and pricing routes)
+DEFERRED = (
+    "celery",
+    "kombu",
+    "app.worker",
+    "emails",
+    "jinja2",
+    "sentry_sdk",
+    "playwright",
+    "numpy",
+    "app.services.sim_core",
+)
+
+# Cumulative import time of app.main; generous, the machine varies
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 4000))
+
+
+def _import_times(module: str) -> dict:
+    """Cumulative import time in microseconds of every module a fresh interpreter loads"""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(BACKEND), os.environ.get("PYTHONPATH")])
+        ),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_api_startup_defers_heavy_modules() -> None:
+    times = _import_times("app.main")
+    assert not [name for name in DEFERRED if name in times]
+    assert times["app.main"] / 1000 < BUDGET_MS
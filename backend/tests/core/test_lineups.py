@@ -0,0 +1,115 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.services.lineups import build_slate_points, optimize_lineups, random_field
+from app.services.sim_engine import PlayerProfile
+
+# 16 players with correlated opponent pairs, like a simulated slate
+_rng = np.random.default_rng(0)
+_share = _rng.uniform(0.3, 0.7, size=(3000, 8))
+POINTS = np.empty((3000, 16))
+POINTS[:, 0::2] = 20 + 70 * _share + _rng.normal(0, 5, (3000, 8))
+POINTS[:, 1::2] = (
+    20 + 70 * (1 - _share) * _rng.uniform(0.7, 1.3, 8) + _rng.normal(0, 5, (3000, 8))
+)
+SALARIES = np.array(
+    [
+        9000,
+        8200,
+        7800,
+        7600,
+        7400,
+        7000,
+        6800,
+        6600,
+        6400,
+        6200,
+        6000,
+        5800,
+        5600,
+        5400,
+        5200,
+        5000,
+    ]
+)
+CAP = 28000
+
+
+def _brute_force(objective: str, field: np.ndarray = None) -> list[float]:
+    totals_by_lineup = [
+        POINTS[:, list(c)].sum(axis=1)
+        for c in itertools.combinations(range(16), 4)
+        if SALARIES[list(c)].sum() <= CAP
+    ]
+    if objective == "mean":
+        values = [t.mean() for t in totals_by_lineup]
+    elif objective == "ceiling":
+        values = [np.sort(t)[-300] for t in totals_by_lineup]  # 90th percentile of 3000
+    else:
+        field_best = POINTS[:, field].sum(axis=2).max(axis=1)
+        values = [np.mean(t > field_best) for t in totals_by_lineup]
+    return sorted(values, reverse=True)
+
+
+def test_mean_lineups_are_exact() -> None:
+    lineups = optimize_lineups(
+        POINTS, SALARIES, "mean", top_k=5, salary_cap=CAP, lineup_size=4
+    )
+    assert [lu.score for lu in lineups] == pytest.approx(_brute_force("mean")[:5])
+    for lineup in lineups:
+        assert len(set(lineup.players)) == 4
+        assert lineup.salary == SALARIES[list(lineup.players)].sum() <= CAP
+        assert lineup.mean == pytest.approx(lineup.score)
+
+
+@pytest.mark.parametrize("objective", ["ceiling", "win_prob"])
+def test_pool_search_finds_the_best_lineup(objective: str) -> None:
+    field = random_field(POINTS, SALARIES, 200, CAP, 4, np.random.default_rng(1))
+    lineups = optimize_lineups(
+        POINTS,
+        SALARIES,
+        objective,
+        top_k=3,
+        salary_cap=CAP,
+        lineup_size=4,
+        field=field,
+        rng=np.random.default_rng(2),
+    )
+    assert lineups[0].score == pytest.approx(_brute_force(objective, field)[0])
+    assert lineups[0].score >= lineups[-1].score
+    assert lineups[0].win_prob is not None
+
+
+def test_infeasible_slate() -> None:
+    assert (
+        optimize_lineups(POINTS, SALARIES, "mean", salary_cap=10000, lineup_size=4)
+        == []
+    )
+    with pytest.raises(ValueError):
+        optimize_lineups(POINTS, SALARIES[:-1])
+
+
+def test_random_field_gives_up_on_a_tight_cap() -> None:
+    # Exactly one 6-player lineup of 30 fits: random draws essentially never find it
+    points = np.ones((10, 30))
+    salaries = np.r_[np.full(6, 5000), np.full(24, 5001)]
+    with pytest.raises(ValueError, match="too tight"):
+        random_field(
+            points,
+            salaries,
+            10,
+            salary_cap=30000,
+            lineup_size=6,
+            rng=np.random.default_rng(0),
+        )
+
+
+def test_slate_points_share_matches() -> None:
+    a = PlayerProfile("A", 0.62, 0.75, 0.53, 0.08, 0.03, 0.38)
+    b = PlayerProfile("B", 0.60, 0.72, 0.50, 0.05, 0.04, 0.36)
+    points = build_slate_points([(a, b)], n_sims=2000, rng=np.random.default_rng(4))
+    assert points.shape == (2000, 2)
+    # One player's good day is the opponent's bad day
+    assert np.corrcoef(points[:, 0], points[:, 1])[0, 1] < -0.5
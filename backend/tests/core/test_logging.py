@@ -0,0 +1,70 @@
+import io
+import logging
+import random
+
+import pytest
+import structlog
+
+from app.core import logging as app_logging
+from app.core.config import settings
+from app.core.logging import SampleEvents, setup_logging
+
+
+@pytest.fixture
+def restore_logging():
+    # Loggers already used elsewhere cached the current processor list: put
+    # that same list back, not an equivalent one, or capture_logs misses them
+    config = structlog.get_config()
+    handler = app_logging._handler
+    yield
+    app_logging._stop_listener()
+    logging.getLogger().removeHandler(app_logging._handler)
+    logging.getLogger().addHandler(handler)
+    app_logging._handler = handler
+    structlog.configure(**config)
+
+
+@pytest.fixture
+def hot_path_logging(monkeypatch, restore_logging):
+    monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", {"Tick": 0.0})
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    setup_logging(hot_path=True)
+    stream = io.StringIO()
+    app_logging._listener.handlers[0].setStream(stream)
+    return stream
+
+
+def test_sample_events_keeps_a_fraction() -> None:
+    sample = SampleEvents({"Tick": 0.25}, rng=random.Random(0))
+    kept = 0
+    for _ in range(4000):
+        try:
+            event = sample(None, "info", {"event": "Tick"})
+        except structlog.DropEvent:
+            continue
+        kept += 1
+        assert event["sample_rate"] == 0.25
+    assert 800 < kept < 1200
+    assert sample(None, "info", {"event": "Other"}) == {"event": "Other"}
+
+
+def test_hot_path_renders_on_listener_thread(hot_path_logging) -> None:
+    logger = structlog.get_logger("sims")
+    # Below the level: returns before any processor
+    assert logger.debug("Skipped", n=1) is None
+    logger.info("Tick")
+    logger.info("Sim Complete", match_id="m1")
+    app_logging._stop_listener()
+
+    lines = hot_path_logging.getvalue().splitlines()
+    assert len(lines) == 1
+    assert '"event": "Sim Complete"' in lines[0]
+    assert '"match_id": "m1"' in lines[0]
+    assert '"level": "info"' in lines[0]
+
+
+def test_setup_logging_replaces_its_handler(restore_logging) -> None:
+    root = logging.getLogger()
+    setup_logging()
+    setup_logging()
+    assert sum(handler is app_logging._handler for handler in root.handlers) == 1
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.services.matchups import head_to_head, solve_matchups, stack_serve_probs
+from app.services.sim_core import ServeProbs, simulate_batch
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+from app.services.win_prob import live_table
+
+BIG_SERVER = ServeProbs(first_in=0.62, ace=0.15, won_1st=0.72, df=0.08, won_2nd=0.52)
+GRINDER = ServeProbs(first_in=0.66, ace=0.05, won_1st=0.66, df=0.10, won_2nd=0.50)
+
+
+@pytest.mark.parametrize("sets_to_win", [2, 3])
+def test_solver_matches_exact_win_prob(sets_to_win: int) -> None:
+    sol = solve_matchups(
+        stack_serve_probs([BIG_SERVER, GRINDER]),
+        stack_serve_probs([GRINDER, BIG_SERVER]),
+        sets_to_win,
+    )
+    assert sol.p1_win[0] == pytest.approx(
+        live_table(BIG_SERVER.point_win, GRINDER.point_win, sets_to_win).pre_match
+    )
+    assert sol.p1_win[1] == pytest.approx(
+        live_table(GRINDER.point_win, BIG_SERVER.point_win, sets_to_win).pre_match
+    )
+
+
+def test_solver_matches_batched_stats() -> None:
+    n = 40000
+    tally = simulate_batch(BIG_SERVER, GRINDER, n, rng=np.random.default_rng(3))
+    won = tally.winner == 0
+    sol = solve_matchups(stack_serve_probs([BIG_SERVER]), stack_serve_probs([GRINDER]))
+
+    for idx, cond in ((0, won), (1, won)):
+        expected = sol.player_stats(idx, won=(idx == 0))
+        for key in ("games_won", "aces", "double_faults", "breaks", "sets_lost"):
+            simulated = tally.player_stats(idx)[key][cond]
+            se = simulated.std() / np.sqrt(cond.sum())
+            assert abs(simulated.mean() - expected[key][0]) < 4 * se + 1e-9
+
+    straight = (tally.sets_won[1][won] == 0).mean()
+    assert straight == pytest.approx(sol.straight_sets[0, 0], abs=0.015)
+
+    # Poisson bonuses keep expected DK points within a fraction of a point
+    calc = DKScoringCalculator()
+    p1_points, _ = tally.fantasy_points(calc.score)
+    assert calc.expected_score(sol.player_stats(0, won=True))[0] == pytest.approx(
+        p1_points[won].mean(), abs=0.5
+    )
+
+
+def test_head_to_head_is_symmetric_and_memoized() -> None:
+    ab, ba = head_to_head([(BIG_SERVER, GRINDER), (GRINDER, BIG_SERVER)])
+    assert ab[0] == pytest.approx(1 - ba[0])
+    # (a won, a lost, b won, b lost) swap sides with the pair
+    assert ab[1:] == pytest.approx(np.concatenate([ba[3:], ba[1:3]]))
+    assert np.array_equal(head_to_head([(BIG_SERVER, GRINDER)])[0], ab)
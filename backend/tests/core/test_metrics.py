@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import textwrap
+import urllib.request
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.metrics import n_sims_bucket, register_cache
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_n_sims_bucket() -> None:
+    assert n_sims_bucket(1) == "1000"
+    assert n_sims_bucket(1000) == "1000"
+    assert n_sims_bucket(1001) == "10000"
+    assert n_sims_bucket(100000) == "100000"
+    assert n_sims_bucket(100001) == "+Inf"
+
+
+def test_ad_hoc_request_is_counted_once(client: TestClient) -> None:
+    sims_before = _sample("sim_matches_total", {"source": "ad_hoc"})
+    requests_before = _sample(
+        "ad_hoc_request_duration_seconds_count", {"n_sims": "1000"}
+    )
+
+    payload = {
+        "player1_name": "Jannik Sinner",
+        "player2_name": "Carlos Alcaraz",
+        "n_sims": 20,
+    }
+    assert (
+        client.post(
+            f"{settings.API_V1_STR}/simulation/ad-hoc", json=payload
+        ).status_code
+        == 200
+    )
+
+    assert _sample("sim_matches_total", {"source": "ad_hoc"}) == sims_before + 20
+    assert (
+        _sample("ad_hoc_request_duration_seconds_count", {"n_sims": "1000"})
+        == requests_before + 1
+    )
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'ad_hoc_request_duration_seconds_bucket{le="0.01",n_sims="1000"}'
+        in response.text
+    )
+    assert 'sim_cache_hits_total{cache="head_to_head"}' in response.text
+
+
+def test_cache_stats_read_at_scrape_time() -> None:
+    stats = [3, 1]
+    register_cache("test_cache", lambda: tuple(stats))
+    assert _sample("sim_cache_hits_total", {"cache": "test_cache"}) == 3
+    assert _sample("sim_cache_hit_ratio", {"cache": "test_cache"}) == 0.75
+    stats[1] = 5
+    assert _sample("sim_cache_misses_total", {"cache": "test_cache"}) == 5
+    metrics._caches.pop("test_cache")
+
+
+def test_serve_on_own_port() -> None:
+    server, thread = metrics.serve(port=0)
+    try:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{server.server_port}/metrics", timeout=5
+        ) as response:
+            body = response.read().decode()
+        assert "sim_matches_total" in body
+        assert "celery_task_duration_seconds" in body
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+
+def test_prefork_child_tasks_reach_the_worker_scrape(tmp_path) -> None:
+    # Prefork layout in a fresh interpreter (multiprocess mode is chosen at
+    # import): the parent serves the scrape, a forked child runs the task
+    script = textwrap.dedent("""
+        import multiprocessing, os, uuid
+        from app import worker
+        from app.core import metrics
+
+        worker.start_metrics_server()
+
+        def child():
+            worker.run_tennis_simulation.apply(args=[str(uuid.uuid4())], kwargs={"n_sims": 100})
+            worker.mark_metrics_process_dead(pid=os.getpid())
+
+        process = multiprocessing.get_context("fork").Process(target=child)
+        process.start()
+        process.join()
+        print(metrics.render()[0].decode())
+    """)
+    (tmp_path / "stale.db").write_bytes(b"")
+    env = dict(
+        os.environ,
+        PROMETHEUS_MULTIPROC_DIR=str(tmp_path),
+        WORKER_METRICS_PORT="0",
+        PYTHONPATH=str(Path(metrics.__file__).parents[2]),
+    )
+    scrape = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    ).stdout
+    assert (
+        'celery_task_duration_seconds_count{state="SUCCESS",task="app.worker.run_tennis_simulation"} 1.0'
+        in scrape
+    )
+    assert not (tmp_path / "stale.db").exists()
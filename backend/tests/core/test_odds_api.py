@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+from sqlmodel import Session, delete, select
+
+from app.models.tennis import Match
+from app.services import odds_api
+from app.services.odds_api import (
+    MIN_ACTIVE_MATCHES,
+    count_active_matches,
+    load_active_matches,
+    market_probabilities,
+    update_live_odds,
+)
+
+
+def _clear_matches(db: Session) -> None:
+    db.execute(delete(Match))
+    db.commit()
+
+
+def test_update_live_odds_fills_active_window(db: Session) -> None:
+    _clear_matches(db)
+
+    # Old history must not count towards the active slate
+    db.add(
+        Match(
+            provider_event_id="old-event",
+            player1_name="Jannik Sinner",
+            player2_name="Carlos Alcaraz",
+            start_time=datetime.now() - timedelta(days=30),
+        )
+    )
+    # Nor a match without a provider event, which the refresher never re-quotes
+    db.add(
+        Match(
+            player1_name="Novak Djokovic",
+            player2_name="Daniil Medvedev",
+            start_time=datetime.now() + timedelta(hours=1),
+        )
+    )
+    db.commit()
+
+    result = asyncio.run(update_live_odds(db))
+
+    now = datetime.now()
+    assert len(result["created"]) == MIN_ACTIVE_MATCHES
+    assert count_active_matches(db, now) == MIN_ACTIVE_MATCHES
+    active = load_active_matches(db, now)
+    assert "old-event" not in active
+    assert all(m.provider_event_id for m in active.values())
+    _clear_matches(db)
+
+
+def test_update_live_odds_updates_by_provider_id(db: Session) -> None:
+    _clear_matches(db)
+    asyncio.run(update_live_odds(db))
+
+    result = asyncio.run(update_live_odds(db))
+
+    # Slate is full: nothing new listed, existing rows re-quoted in place
+    assert result["created"] == []
+    assert len(db.exec(select(Match)).all()) == MIN_ACTIVE_MATCHES
+    ids = {m.id for m in db.exec(select(Match)).all()}
+    assert set(result["updated"]) <= ids
+    _clear_matches(db)
+
+
+def test_market_probabilities() -> None:
+    fair, vig = market_probabilities([(-110, -110), (-200, 150)])
+    assert abs(fair[0] - 0.5) < 1e-9
+    assert abs(vig[0] - (2 * 110 / 210 - 1)) < 1e-9
+    assert fair[1] > 0.6
+    assert vig[1] > 0
+
+
+def test_update_live_odds_flags_moved_markets(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _clear_matches(db)
+    start = datetime.now() + timedelta(hours=3)
+    for event_id, p1_odds in [("steady", -110), ("tweak", -110), ("moved", -110)]:
+        db.add(
+            Match(
+                provider_event_id=event_id,
+                player1_name="Jannik Sinner",
+                player2_name="Carlos Alcaraz",
+                start_time=start,
+                p1_odds=p1_odds,
+                p2_odds=-110,
+                last_simulated_at=datetime.now(),
+            )
+        )
+    db.commit()
+
+    quotes = {"steady": (-110, -110), "tweak": (-111, -110), "moved": (-200, 150)}
+
+    async def fake_feed(known_event_ids: list[str], n_new: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": event_id,
+                "p1_odds": quotes[event_id][0],
+                "p2_odds": quotes[event_id][1],
+            }
+            for event_id in known_event_ids
+        ] + await original_feed([], n_new)
+
+    original_feed = odds_api.fetch_odds_events
+    monkeypatch.setattr(odds_api, "fetch_odds_events", fake_feed)
+
+    result = asyncio.run(update_live_odds(db))
+
+    by_event = {m.provider_event_id: m for m in db.exec(select(Match)).all()}
+    assert set(result["updated"]) == {by_event["tweak"].id, by_event["moved"].id}
+    # New listings are always simulated; a 1c price tweak is not
+    assert by_event["moved"].id in result["resimulate"]
+    assert by_event["tweak"].id not in result["resimulate"]
+    assert by_event["steady"].id not in result["resimulate"]
+    assert set(result["created"]) <= set(result["resimulate"])
+    assert by_event["moved"].market_vig > 0
+    _clear_matches(db)
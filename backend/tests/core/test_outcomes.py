@@ -0,0 +1,171 @@
+import fnmatch
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlmodel import Session
+
+from app.models.tennis import Match
+from app.services import outcomes
+from app.services.fantasy_scoring import calculate_fantasy_points
+from app.services.outcomes import (
+    OUTCOME_DTYPE,
+    FileOutcomeStore,
+    RedisOutcomeStore,
+    matchup_key,
+    outcome_matrix,
+    points_correlation,
+    tally_from_outcomes,
+)
+from app.services.sim_core import ServeProbs, simulate_batch
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+from app.services.warm_cache import publish_stats_version
+from app.worker import run_tennis_simulation_batch
+
+BIG_SERVER = ServeProbs(first_in=0.62, ace=0.15, won_1st=0.72, df=0.08, won_2nd=0.52)
+GRINDER = ServeProbs(first_in=0.66, ace=0.05, won_1st=0.66, df=0.10, won_2nd=0.50)
+
+
+class DictRedis:
+    """Just the calls RedisOutcomeStore makes"""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[bytes, int]] = {}
+
+    def set(self, key: str, value: bytes, ex: int) -> None:
+        self.data[key] = (value, ex)
+
+    def get(self, key: str):
+        return self.data[key][0] if key in self.data else None
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match: str, count: int):
+        return [key for key in self.data if fnmatch.fnmatch(key, match)]
+
+
+def _matrix(n: int = 1000) -> tuple:
+    tally = simulate_batch(BIG_SERVER, GRINDER, n, rng=np.random.default_rng(0))
+    points = DKScoringCalculator().score
+    return tally, outcome_matrix(tally, tally.fantasy_points(points))
+
+
+def test_matrix_round_trips_the_tally() -> None:
+    tally, matrix = _matrix()
+    assert matrix.dtype == OUTCOME_DTYPE
+    assert matrix.nbytes == 1000 * OUTCOME_DTYPE.itemsize
+
+    # Rescoring the stored stats gives back the stored points
+    calc = DKScoringCalculator()
+    restored = tally_from_outcomes(matrix)
+    assert np.array_equal(restored.winner, tally.winner)
+    np.testing.assert_allclose(
+        np.column_stack(restored.fantasy_points(calc.score)),
+        matrix["fantasy_points"],
+        rtol=1e-6,
+    )
+
+    # Opponents' points move against each other
+    assert points_correlation(matrix) < -0.5
+
+
+def test_file_store_memory_maps(tmp_path: Path) -> None:
+    _, matrix = _matrix()
+    store = FileOutcomeStore(str(tmp_path / "outcomes"))
+    key = matchup_key("A", "B", "Hard", 2)
+    assert store.load(key) is None
+
+    store.save(key, matrix)
+    loaded = store.load(key)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, matrix)
+    assert list((tmp_path / "outcomes").iterdir()) == [
+        tmp_path / "outcomes" / f"{key}.npy"
+    ]
+
+
+def test_redis_store_round_trip() -> None:
+    _, matrix = _matrix(50)
+    client = DictRedis()
+    store = RedisOutcomeStore(client, ttl_seconds=60)
+    store.save("k", matrix)
+    assert np.array_equal(store.load("k"), matrix)
+    assert client.data[RedisOutcomeStore.PREFIX + "k"][1] == 60
+    assert store.load("missing") is None
+
+    store.save("other", matrix)
+    store.delete("k")
+    assert store.load("k") is None
+    client.data["unrelated"] = (b"", 0)
+    assert store.clear() == 1
+    assert list(client.data) == ["unrelated"]
+
+
+def test_matchup_key() -> None:
+    assert matchup_key("A", "B", "Hard", 2) == matchup_key("A", "B", "hard", 2)
+    assert matchup_key("A", "B", "Hard", 2) != matchup_key("B", "A", "Hard", 2)
+    assert matchup_key("A", "B", "Hard", 2) != matchup_key(
+        "A", "B", "Hard", 2, variant="live"
+    )
+
+
+def test_fantasy_points_score_arrays() -> None:
+    stats = {
+        "match_win": np.array([1, 0]),
+        "sets": np.array([2, 1]),
+        "games": np.array([13, 10]),
+        "aces": np.array([10, 0]),
+        "dfs": np.array([0, 3]),
+    }
+    scalar = [
+        calculate_fantasy_points({k: int(v[i]) for k, v in stats.items()})
+        for i in range(2)
+    ]
+    assert calculate_fantasy_points(stats) == pytest.approx(scalar)
+
+
+def test_new_stats_version_drops_stored_outcomes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _, matrix = _matrix(100)
+    store = FileOutcomeStore(str(tmp_path))
+    monkeypatch.setattr(outcomes, "get_outcome_store", lambda: store)
+    key = matchup_key("Jannik Sinner", "Carlos Alcaraz", "hard", 2)
+    store.save(key, matrix)
+
+    publish_stats_version()
+    assert store.load_sims(key, 100) is None
+
+
+def test_resimulation_replaces_or_drops_outcomes(
+    db: Session, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = FileOutcomeStore(str(tmp_path))
+    monkeypatch.setattr(outcomes, "get_outcome_store", lambda: store)
+    match = Match(
+        player1_name="Jannik Sinner",
+        player2_name="Carlos Alcaraz",
+        start_time=datetime.now(),
+    )
+    db.add(match)
+    db.commit()
+    key = matchup_key(match.player1_name, match.player2_name, match.surface, 2)
+    stale = np.zeros(500, dtype=OUTCOME_DTYPE)
+
+    # An odds-refresh re-simulation overwrites the stale worlds...
+    store.save(key, stale)
+    run_tennis_simulation_batch([str(match.id)], n_sims=100)
+    fresh = store.load_sims(key, 100)
+    assert fresh is not None and len(store.load(key)) == 100
+    assert fresh["fantasy_points"].any()
+
+    # ...or, when it does not persist its own, drops them
+    store.save(key, stale)
+    run_tennis_simulation_batch([str(match.id)], n_sims=100, persist_outcomes=False)
+    assert store.load(key) is None
+
+    db.delete(match)
+    db.commit()
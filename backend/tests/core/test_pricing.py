@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from app.services.pricing import (
+    american_to_decimal,
+    devig,
+    implied_probabilities,
+    kelly_stakes,
+    slate_edges,
+)
+
+P1_ODDS = np.array([-110, -200, 150, -400])
+P2_ODDS = np.array([-110, 170, -180, 300])
+
+
+def test_american_to_decimal() -> None:
+    dec = american_to_decimal(np.array([-200, 100, 150]))
+    assert np.allclose(dec, [1.5, 2.0, 2.5])
+    assert np.allclose(implied_probabilities(np.array([-200, 100])), [2 / 3, 0.5])
+
+
+@pytest.mark.parametrize("method", ["multiplicative", "additive", "power"])
+def test_devig_sums_to_one(method: str) -> None:
+    q1 = implied_probabilities(P1_ODDS)
+    q2 = implied_probabilities(P2_ODDS)
+    p1, p2 = devig(q1, q2, method)  # type: ignore[arg-type]
+    assert np.allclose(p1 + p2, 1.0)
+    assert np.all(p1 < q1)
+    # Favourite stays the favourite
+    assert np.array_equal(p1 > 0.5, q1 > q2)
+
+
+def test_devig_power_shades_longshots_more() -> None:
+    q1 = implied_probabilities(np.array([-400]))
+    q2 = implied_probabilities(np.array([300]))
+    mult, _ = devig(q1, q2, "multiplicative")
+    power, _ = devig(q1, q2, "power")
+    assert power[0] > mult[0]
+
+
+def test_devig_unknown_method() -> None:
+    with pytest.raises(ValueError):
+        devig(np.array([0.5]), np.array([0.5]), "nope")  # type: ignore[arg-type]
+
+
+def test_kelly_stakes() -> None:
+    # Even money, 60% -> 20% of bankroll
+    stakes = kelly_stakes(np.array([0.6, 0.4, np.nan]), np.array([2.0, 2.0, 2.0]), 0.5)
+    assert stakes[0] == pytest.approx(0.1)
+    assert stakes[1] == 0.0
+    assert np.isnan(stakes[2])
+
+
+def test_slate_edges() -> None:
+    sim_p1 = np.array([0.55, 0.5, np.nan, 0.8])
+    edges = slate_edges(P1_ODDS, P2_ODDS, sim_p1)
+    assert edges["p1_edge"][0] == pytest.approx(0.05)
+    assert edges["p2_edge"][0] == pytest.approx(-0.05)
+    assert edges["p1_kelly"][0] > 0
+    assert edges["p2_kelly"][0] == 0.0
+    assert np.isnan(edges["p1_edge"][2])
+    assert np.all(edges["vig"] > 0)
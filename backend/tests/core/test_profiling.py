@@ -0,0 +1,79 @@
+import pstats
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session
+from structlog.testing import capture_logs
+
+from app.core import profiling
+from app.core.profiling import PhaseTimer, profiled
+from app.models.tennis import Match
+from app.worker import run_tennis_simulation
+
+
+def test_phase_timer_logs_spans() -> None:
+    timer = PhaseTimer()
+    with capture_logs() as logs:
+        with timer.phase("load"):
+            pass
+        with timer.phase("simulate"):
+            sum(range(10000))
+        with timer.phase("load"):
+            pass
+    assert list(timer.timings_ms) == ["load", "simulate"]
+    assert [log["phase"] for log in logs] == ["load", "simulate", "load"]
+    assert all(log["duration_ms"] >= 0 for log in logs)
+    assert timer.total_ms >= sum(timer.timings_ms.values())
+
+
+def test_profiled_is_off_by_default(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(profiling.settings, "PROFILE_DIR", str(tmp_path))
+    with profiled(None, "off"):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cprofile_is_saved(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(profiling.settings, "PROFILE_DIR", str(tmp_path))
+    with capture_logs() as logs, profiled("cprofile", "unit"):
+        sorted(range(1000), key=lambda x: -x)
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("unit-") and path.suffix == ".prof"
+    assert logs[-1]["path"] == str(path)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_simulation_task_reports_phases(
+    db: Session, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(profiling.settings, "PROFILE_DIR", str(tmp_path))
+    match = Match(
+        player1_name="Jannik Sinner",
+        player2_name="Carlos Alcaraz",
+        start_time=datetime.now(),
+    )
+    db.add(match)
+    db.commit()
+
+    with capture_logs() as logs:
+        result = run_tennis_simulation(
+            str(match.id), n_sims=200, persist_outcomes=False, profile="cprofile"
+        )
+    assert 0 <= result["p1_win_pct"] <= 1
+
+    (complete,) = (log for log in logs if log["event"] == "Sim Complete")
+    assert set(complete["timings_ms"]) == {
+        "db_load",
+        "profiles",
+        "simulate",
+        "scoring",
+        "commit",
+    }
+    assert complete["total_ms"] >= sum(complete["timings_ms"].values())
+    assert len(list(tmp_path.glob(f"run_tennis_simulation-{match.id}-*.prof"))) == 1
+
+    db.delete(match)
+    db.commit()
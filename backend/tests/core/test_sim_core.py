@@ -0,0 +1,193 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.services.sim_core import (
+    ACE,
+    SERVER_WIN,
+    MatchCore,
+    ServeProbs,
+    adjusted_rally,
+    raw_serve_won,
+    simulate_batch,
+    tiebreak_over,
+    tiebreak_server,
+    tiebreak_table,
+)
+from app.services.sim_engine import PlayerProfile, TennisMatchSimulator
+from app.services.sim_types import MatchState
+from app.services.sims.engine import Player
+from app.services.sims.scoring.dk_calculator import DKScoringCalculator
+from app.services.sims.simulation.match_simulator import DKMatchSimulator
+from app.services.win_prob import live_table
+
+BIG_SERVER = ServeProbs(first_in=0.62, ace=0.15, won_1st=0.72, df=0.08, won_2nd=0.52)
+GRINDER = ServeProbs(first_in=0.66, ace=0.05, won_1st=0.66, df=0.10, won_2nd=0.50)
+
+DK_P1 = Player("Big Server", *BIG_SERVER)
+DK_P2 = Player("Grinder", *GRINDER)
+
+
+def test_point_models() -> None:
+    server = PlayerProfile(
+        "S",
+        serve_1_in_pct=0.6,
+        serve_1_won_pct=0.75,
+        serve_2_won_pct=0.55,
+        ace_pct=0.09,
+        df_pct=0.04,
+        return_won_pct=0.35,
+    )
+    returner = PlayerProfile("R", 0.6, 0.7, 0.5, 0.05, 0.03, return_won_pct=0.40)
+    probs = adjusted_rally(server, returner)
+    assert probs.ace == pytest.approx(0.09 / 0.6)
+    assert probs.df == pytest.approx(0.04 / 0.4)
+    assert probs.won_1st == pytest.approx((0.75 + 0.60) / 2)
+
+    assert raw_serve_won(DK_P1, DK_P2) == BIG_SERVER
+
+
+def test_tiebreak_is_played_point_by_point() -> None:
+    random.seed(8)
+    log: list[tuple[int, int]] = []
+    core = MatchCore(
+        BIG_SERVER, GRINDER, on_point=lambda srv, outcome: log.append((srv, outcome))
+    )
+    for _ in range(20):
+        log.clear()
+        winner = core.play_tiebreak(first_server_idx=1)
+
+        score = [0, 0]
+        for i, (srv, outcome) in enumerate(log):
+            # Rotation: p2 serves the first point, then two each
+            assert srv == tiebreak_server(i, 1)
+            assert not tiebreak_over(*score)
+            score[srv if outcome in (ACE, SERVER_WIN) else 1 - srv] += 1
+        assert tiebreak_over(*score)
+        assert winner == (0 if score[0] > score[1] else 1)
+
+
+def test_tiebreak_table_matches_simulation() -> None:
+    table = tiebreak_table(BIG_SERVER, GRINDER)
+    assert table is tiebreak_table(BIG_SERVER, GRINDER)
+    # Who serves first does not change the tiebreak win probability
+    assert table.p1_win[0] == pytest.approx(table.p1_win[1])
+
+    random.seed(13)
+    core = MatchCore(BIG_SERVER, GRINDER)
+    n = 4000
+    wins = aces = 0
+    for _ in range(n):
+        core.tally.aces = [0, 0]
+        if core.play_tiebreak(first_server_idx=0) == 0:
+            wins += 1
+            aces += core.tally.aces[0]
+
+    p = table.p1_win[0]
+    assert abs(wins / n - p) < 4 * np.sqrt(p * (1 - p) / n)
+    assert aces / wins == pytest.approx(table.events_if_p1_wins[0][0, 0], rel=0.1)
+
+
+def test_batch_tally_is_consistent() -> None:
+    tally = simulate_batch(
+        BIG_SERVER, GRINDER, 500, sets_to_win=3, rng=np.random.default_rng(0)
+    )
+    assert np.all(tally.sets_won.max(axis=0) == 3)
+    assert np.all(tally.sets_won[tally.winner, np.arange(500)] == 3)
+    assert np.all((tally.sets_played >= 3) & (tally.sets_played <= 5))
+    assert np.array_equal(tally.games_won[0], tally.games_lost[1])
+    assert np.all(tally.clean_sets <= tally.sets_won)
+
+
+def test_scalar_and_batch_cores_agree() -> None:
+    random.seed(21)
+    n = 3000
+    core = MatchCore(BIG_SERVER, GRINDER)
+    calc = DKScoringCalculator()
+    scalar = [core.play_match() for _ in range(n)]
+    scalar_points = np.array([t.fantasy_points(calc.score)[0] for t in scalar])
+    scalar_win = np.mean([t.winner == 0 for t in scalar])
+
+    batch = simulate_batch(BIG_SERVER, GRINDER, n, rng=np.random.default_rng(21))
+    batch_points, _ = batch.fantasy_points(calc.score)
+    batch_win = np.mean(batch.winner == 0)
+
+    se = scalar_points.std() * np.sqrt(2 / n)
+    assert abs(batch_points.mean() - scalar_points.mean()) < 4 * se
+    assert abs(batch_win - scalar_win) < 4 * np.sqrt(0.5 / n)
+    # Both agree with the exact pre-match probability
+    exact = live_table(BIG_SERVER.point_win, GRINDER.point_win, 2).pre_match
+    assert abs(batch_win - exact) < 4 * np.sqrt(0.25 / n)
+
+
+def test_both_engines_share_the_core() -> None:
+    # Same point model and the same random stream: identical matches
+    tennis = TennisMatchSimulator(DK_P1, DK_P2, point_model=raw_serve_won)
+    dk = DKMatchSimulator("BEST_OF_3")
+    for seed in range(5):
+        random.seed(seed)
+        a = tennis.simulate_match()
+        random.seed(seed)
+        b = dk.simulate_dk_match(DK_P1, DK_P2)
+        assert a.winner == b.winner
+        assert a.p1_stats["aces"] == b.player1_aces
+        assert a.p2_stats["dfs"] == b.player2_double_faults
+        assert a.p1_stats["games"] == b.player1_games_won
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        MatchState(
+            p1_sets=1,
+            p1_games=5,
+            p2_games=2,
+            p1_points=2,
+            p2_points=3,
+            server=1,
+            p1_prior_games=6,
+            p2_prior_games=3,
+            p1_aces=7,
+            p2_dfs=2,
+        ),
+        MatchState(p1_games=6, p2_games=6, p1_points=5, p2_points=6, server=0),
+        MatchState(
+            p1_sets=1,
+            p2_sets=1,
+            p1_games=6,
+            p2_games=6,
+            p1_points=3,
+            p2_points=1,
+            server=1,
+        ),
+    ],
+)
+def test_batch_resumes_from_a_match_state(state: MatchState) -> None:
+    n = 4000
+    batch = simulate_batch(
+        BIG_SERVER, GRINDER, n, rng=np.random.default_rng(5), start_state=state
+    )
+    assert np.all(batch.sets_won.max(axis=0) == 2)
+    assert np.all(batch.sets_won >= [[state.p1_sets], [state.p2_sets]])
+    assert np.all(batch.aces >= [[state.p1_aces], [state.p2_aces]])
+    assert np.all(batch.games_won[0] >= state.p1_prior_games + state.p1_games)
+
+    # Same win probability as the exact live table, and the scalar core's stats
+    exact = live_table(BIG_SERVER.point_win, GRINDER.point_win, 2).win_prob(state)
+    assert (
+        abs(np.mean(batch.winner == 0) - exact)
+        < 4 * np.sqrt(exact * (1 - exact) / n) + 1e-9
+    )
+    random.seed(5)
+    core = MatchCore(BIG_SERVER, GRINDER)
+    scalar = [core.play_match(state) for _ in range(n)]
+    scalar_aces = np.array([t.aces[0] for t in scalar])
+    assert abs(
+        batch.aces[0].mean() - scalar_aces.mean()
+    ) < 4 * scalar_aces.std() * np.sqrt(2 / n)
+
+
+def test_batch_rejects_a_finished_match() -> None:
+    with pytest.raises(ValueError, match="already over"):
+        simulate_batch(BIG_SERVER, GRINDER, 10, start_state=MatchState(p2_sets=2))
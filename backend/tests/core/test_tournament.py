@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from app.services.sim_engine import PlayerProfile
+from app.services.tournament import round_labels, simulate_tournament
+from app.services.win_prob import live_table_for
+
+
+def _field(size: int) -> list[PlayerProfile]:
+    # Strongest first, fading serve and return
+    return [
+        PlayerProfile(
+            f"P{i}",
+            serve_1_in_pct=0.62,
+            serve_1_won_pct=0.78 - 0.004 * i,
+            serve_2_won_pct=0.56 - 0.003 * i,
+            ace_pct=0.10 - 0.001 * i,
+            df_pct=0.03,
+            return_won_pct=0.40 - 0.003 * i,
+        )
+        for i in range(size)
+    ]
+
+
+def test_round_labels() -> None:
+    assert round_labels(32) == ["R32", "R16", "QF", "SF", "F", "W"]
+    assert len(round_labels(128)) == 8
+
+
+def test_reach_probabilities_are_consistent() -> None:
+    draw = _field(32)
+    result = simulate_tournament(draw, n_sims=4000, rng=np.random.default_rng(0))
+    # Every round has exactly as many players as slots
+    assert result.reach.sum(axis=0) == pytest.approx([32, 16, 8, 4, 2, 1])
+    assert np.all(np.diff(result.reach, axis=1) <= 0)
+    assert result.reach[:, -1].argmax() == 0
+
+    # First round is a single head-to-head
+    p = live_table_for(draw[0], draw[1]).pre_match
+    p_other_first = 1 - live_table_for(draw[1], draw[0]).pre_match
+    assert result.reach[0, 1] == pytest.approx((p + p_other_first) / 2, abs=0.03)
+
+    # Everyone plays at least one match, winners play more
+    assert np.all(result.expected_points > 0)
+    assert result.expected_points[0] > result.expected_points[31]
+
+
+def test_byes_advance() -> None:
+    draw = _field(32)
+    draw[1] = None
+    result = simulate_tournament(draw, n_sims=500, rng=np.random.default_rng(1))
+    assert result.names[1] is None
+    assert result.reach[0, 1] == 1.0
+    assert result.reach[1, 1] == 0.0
+    assert result.expected_points[1] == 0.0
+
+
+def test_draw_size_must_be_power_of_two() -> None:
+    with pytest.raises(ValueError):
+        simulate_tournament(_field(24), n_sims=10)
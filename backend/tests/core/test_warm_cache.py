@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import numpy as np
+from sqlmodel import Session
+
+from app.models.tennis import Match
+from app.services import warm_cache as warm_cache_module
+from app.services.warm_cache import (
+    WarmCache,
+    apply_stats_version,
+    publish_stats_version,
+    warm_cache,
+)
+from app.worker import run_tennis_simulation, warm_worker_cache
+
+
+def test_profiles_and_simulators_are_built_once() -> None:
+    cache = WarmCache()
+    sim = cache.simulator("Jannik Sinner", "Carlos Alcaraz", "Hard")
+    assert sim is cache.simulator("Jannik Sinner", "Carlos Alcaraz", "hard")
+    assert cache.profile("Jannik Sinner", "HARD") is sim.p1
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    # Missing players are remembered as well
+    assert cache.simulator("Nobody", "Carlos Alcaraz") is None
+    assert cache.simulator("Nobody", "Carlos Alcaraz") is None
+    assert cache.misses == 5
+
+    # A cached simulator keeps no state between batches
+    first = sim.run_batch(200, np.random.default_rng(0))
+    second = sim.run_batch(200, np.random.default_rng(0))
+    assert np.array_equal(first.winner, second.winner)
+
+
+def test_stats_version_invalidates() -> None:
+    cache = WarmCache()
+    cache.warm(
+        [
+            ("Jannik Sinner", "Carlos Alcaraz", "clay"),
+            ("Novak Djokovic", "Daniil Medvedev", "grass"),
+        ]
+    )
+    assert len(cache) == 2
+
+    apply_stats_version(cache, "v1")
+    assert len(cache) == 0 and cache.version == "v1"
+    cache.warm([("Jannik Sinner", "Carlos Alcaraz", "clay")])
+    apply_stats_version(cache, "v1")
+    assert len(cache) == 1
+
+    # No Redis in SQLite mode: publishing drops this process's cache only
+    assert warm_cache_module.listen_for_stats_versions(cache) is None
+    warm_cache.warm([("Jannik Sinner", "Carlos Alcaraz", "clay")])
+    version = publish_stats_version()
+    assert len(warm_cache) == 0 and warm_cache.version == version
+
+
+def test_worker_warms_and_reuses_matchups(db: Session) -> None:
+    match = Match(
+        player1_name="Jannik Sinner",
+        player2_name="Carlos Alcaraz",
+        start_time=datetime.now(),
+    )
+    db.add(match)
+    db.commit()
+
+    warm_cache.invalidate()
+    warm_worker_cache()
+    assert ("Jannik Sinner", "Carlos Alcaraz", "hard", 2) in warm_cache._matchups
+
+    misses = warm_cache.misses
+    for _ in range(2):
+        result = run_tennis_simulation(
+            str(match.id), n_sims=100, persist_outcomes=False
+        )
+        assert 0 <= result["p1_win_pct"] <= 1
+    assert warm_cache.misses == misses
+
+    db.delete(match)
+    db.commit()
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from app.services.sim_engine import PlayerProfile, ScoreState, TennisMatchSimulator
+from app.services.win_prob import (
+    LiveWinProbTable,
+    live_table,
+    live_table_for,
+    serve_point_win_prob,
+    tiebreak_server,
+)
+
+P1_PROFILE = PlayerProfile("Strong Server", 0.70, 0.80, 0.60, 0.10, 0.02, 0.30)
+P2_PROFILE = PlayerProfile("Weak Server", 0.50, 0.50, 0.40, 0.01, 0.10, 0.20)
+
+
+def test_serve_point_win_prob_matches_simulation() -> None:
+    random.seed(7)
+    sim = TennisMatchSimulator(P1_PROFILE, P2_PROFILE)
+    n = 20000
+    won = sum(
+        sim.simulate_point(P1_PROFILE, P2_PROFILE) in ("ace", "server_win")
+        for _ in range(n)
+    )
+    assert abs(won / n - serve_point_win_prob(P1_PROFILE, P2_PROFILE)) < 0.015
+
+
+def test_tiebreak_server_rotation() -> None:
+    assert [tiebreak_server(k, 0) for k in range(7)] == [0, 1, 1, 0, 0, 1, 1]
+
+
+def test_symmetric_matchup_is_a_coin_flip() -> None:
+    table = LiveWinProbTable(0.62, 0.62, sets_to_win=2)
+    assert table.pre_match == pytest.approx(0.5)
+    assert table.win_prob(ScoreState(1, 1, 6, 6, 0, 0, 1)) == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("sets_to_win", [2, 3])
+def test_table_matches_monte_carlo(sets_to_win: int) -> None:
+    random.seed(11)
+    table = live_table_for(P1_PROFILE, P2_PROFILE, sets_to_win)
+    sim = TennisMatchSimulator(P1_PROFILE, P2_PROFILE, sets_to_win=sets_to_win)
+    n = 3000
+    wins = sum(r.winner == P1_PROFILE.name for r in sim.run(n)) / n
+    assert abs(wins - table.pre_match) < 0.03
+
+
+def test_live_states() -> None:
+    table = LiveWinProbTable(0.65, 0.60, sets_to_win=2)
+    # Serving for the match at 40-0 is close to certain, the mirror close to lost
+    assert table.win_prob(ScoreState(1, 0, 5, 4, 3, 0, 0)) > 0.99
+    assert table.win_prob(ScoreState(0, 1, 4, 5, 0, 3, 1)) < 0.01
+    # A break up beats level on serve
+    assert table.win_prob(ScoreState(0, 0, 3, 1, 0, 0, 0)) > table.win_prob(
+        ScoreState(0, 0, 2, 2, 0, 0, 0)
+    )
+    # Long deuce and long tiebreaks collapse to the equivalent states
+    assert table.win_prob(ScoreState(0, 0, 2, 2, 7, 7, 0)) == table.win_prob(
+        ScoreState(0, 0, 2, 2, 3, 3, 0)
+    )
+    assert table.win_prob(ScoreState(0, 0, 6, 6, 11, 10, 1)) == table.win_prob(
+        ScoreState(0, 0, 6, 6, 7, 6, 1)
+    )
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        ScoreState(2, 0, 0, 0, 0, 0, 0),
+        ScoreState(0, 0, 6, 3, 0, 0, 0),
+        ScoreState(0, 0, 1, 1, 5, 2, 0),
+        ScoreState(0, 0, 6, 6, 9, 7, 0),
+        ScoreState(0, 0, 0, 0, 0, 0, 2),
+    ],
+)
+def test_invalid_states(state: ScoreState) -> None:
+    with pytest.raises(ValueError):
+        LiveWinProbTable(0.65, 0.60).win_prob(state)
+
+
+def test_tables_are_cached_per_matchup() -> None:
+    assert live_table(0.64, 0.61, 3) is live_table(0.64, 0.61, 3)
@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, col, delete, select
+from structlog.testing import capture_logs
+
+from app import worker
+from app.core.db import engine
+from app.models.tennis import Match
+from app.worker import run_odds_fetch, run_tennis_simulation_batch
+
+
+def _add_matches(db: Session, pairs) -> list[Match]:
+    matches = [
+        Match(player1_name=p1, player2_name=p2, start_time=datetime.now())
+        for p1, p2 in pairs
+    ]
+    db.add_all(matches)
+    db.commit()
+    return matches
+
+
+def _run_counting_statements(match_ids: list[str]):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        results = run_tennis_simulation_batch(
+            match_ids, n_sims=100, persist_outcomes=False
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return results, statements
+
+
+def test_batch_round_trips_do_not_grow_with_matches(db: Session) -> None:
+    small = _add_matches(db, [("Jannik Sinner", "Carlos Alcaraz")] * 2)
+    large = _add_matches(
+        db,
+        [("Jannik Sinner", "Carlos Alcaraz"), ("Novak Djokovic", "Daniil Medvedev")]
+        * 3,
+    )
+
+    _, small_statements = _run_counting_statements([str(m.id) for m in small])
+    results, large_statements = _run_counting_statements([str(m.id) for m in large])
+    assert small_statements == large_statements == ["SELECT", "UPDATE"]
+    assert all(0 <= result["p1_win_pct"] <= 1 for result in results.values())
+
+    db.expire_all()
+    assert all(
+        m.sim_win_prob_p1 is not None and m.last_simulated_at is not None for m in large
+    )
+
+    db.execute(delete(Match).where(col(Match.id).in_([m.id for m in small + large])))
+    db.commit()
+
+
+def test_batch_reports_failures_per_match(db: Session) -> None:
+    simulated, unknown = _add_matches(
+        db, [("Jannik Sinner", "Carlos Alcaraz"), ("Nobody", "Carlos Alcaraz")]
+    )
+    missing = str(uuid.uuid4())
+
+    results = run_tennis_simulation_batch(
+        [str(simulated.id), str(unknown.id), missing],
+        n_sims=100,
+        persist_outcomes=False,
+    )
+    assert 0 <= results[str(simulated.id)]["p1_win_pct"] <= 1
+    assert results[str(unknown.id)] == "Missing Player Stats"
+    assert results[missing] == "Match not found"
+
+    db.expire_all()
+    rows = {
+        m.id: m
+        for m in db.exec(
+            select(Match).where(col(Match.id).in_([simulated.id, unknown.id]))
+        )
+    }
+    assert rows[simulated.id].sim_win_prob_p1 is not None
+    assert rows[unknown.id].sim_win_prob_p1 is None
+
+    db.execute(delete(Match).where(col(Match.id).in_([simulated.id, unknown.id])))
+    db.commit()
+
+
+def test_enqueue_failure_is_not_reported_as_a_fetch_failure(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def refreshed(session):
+        return {"resimulate": [uuid.uuid4()]}
+
+    def broker_down(match_ids):
+        raise ConnectionError("broker unreachable")
+
+    monkeypatch.setattr(worker, "update_live_odds", refreshed)
+    monkeypatch.setattr(run_tennis_simulation_batch, "delay", broker_down)
+    with capture_logs() as logs:
+        run_odds_fetch()
+    events = [entry["event"] for entry in logs]
+    assert "Odds fetch task completed" in events
+    assert "Re-simulation enqueue failed" in events
+    assert "Odds fetch failed" not in events